@@ -1,5 +1,7 @@
 import random
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 class ADnDRules:
     # Class hit dice
@@ -79,6 +81,25 @@ class ADnDRules:
         'Goblin': ['Paladin']
     }
 
+    # XP needed to reach level 2 by class (doubles every level after)
+    BASE_XP = {
+        'Fighter': 2000,
+        'Paladin': 2250,
+        'Ranger': 2250,
+        'Cleric': 1500,
+        'Druid': 2000,
+        'Magic-User': 2500,
+        'Illusionist': 2500,
+        'Thief': 1250,
+        'Bard': 2000
+    }
+
+    # Order of the saving throw columns in the precomputed tables
+    SAVE_CATEGORIES = ('Death', 'Wands', 'Paralysis', 'Breath', 'Spells')
+
+    # Highest level covered by the precomputed tables
+    MAX_LEVEL = 30
+
     @staticmethod
     def roll_ability_scores(method: str = '3d6') -> Dict[str, int]:
         """Roll ability scores using specified method"""
@@ -109,30 +130,47 @@ class ADnDRules:
         return all(abilities[ability] >= score for ability, score in requirements.items())
 
     @staticmethod
-    def calculate_hit_points(character_class: str, level: int, con_modifier: int) -> int:
+    def calculate_hit_points(character_class: str, level: int, con_modifier: int, rng=random) -> int:
         """Calculate hit points based on class, level, and CON modifier"""
         hit_dice = ADnDRules.HIT_DICE.get(character_class, 6)
         hp = 0
         
         # First level
-        hp += random.randint(1, hit_dice) + con_modifier
+        hp += rng.randint(1, hit_dice) + con_modifier
         
         # Additional levels
         for _ in range(level - 1):
-            hp += max(1, random.randint(1, hit_dice) + con_modifier)
+            hp += max(1, rng.randint(1, hit_dice) + con_modifier)
         
         return max(1, hp)
 
     @staticmethod
     def calculate_thac0(character_class: str, level: int) -> int:
         """Calculate THAC0 based on class and level"""
+        class_id = ADnDRules.CLASS_IDS.get(character_class)
+        if class_id is not None and isinstance(level, int) and 1 <= level <= ADnDRules.MAX_LEVEL:
+            return ADnDRules._THAC0_ROWS[class_id][level - 1]
+        return ADnDRules._thac0_formula(level)
+
+    @staticmethod
+    def calculate_saving_throws(character_class: str, level: int) -> Dict[str, int]:
+        """Calculate saving throws based on class and level"""
+        class_id = ADnDRules.CLASS_IDS.get(character_class)
+        if class_id is not None and isinstance(level, int) and 1 <= level <= ADnDRules.MAX_LEVEL:
+            # Rows are tuples, so every caller gets its own fresh dict
+            return dict(zip(ADnDRules.SAVE_CATEGORIES, ADnDRules._SAVE_ROWS[class_id][level - 1]))
+        return ADnDRules._saving_throws_formula(character_class, level)
+
+    @staticmethod
+    def _thac0_formula(level: int) -> int:
+        """THAC0 progression used to build the rule tables"""
         base_thac0 = 20
         level_bonus = (level - 1) // 3
         return base_thac0 - level_bonus
 
     @staticmethod
-    def calculate_saving_throws(character_class: str, level: int) -> Dict[str, int]:
-        """Calculate saving throws based on class and level"""
+    def _saving_throws_formula(character_class: str, level: int) -> Dict[str, int]:
+        """Saving throw progression used to build the rule tables"""
         base_saves = ADnDRules.SAVING_THROWS.get(character_class, {}).copy()
         level_bonus = (level - 1) // 3
         
@@ -142,9 +180,14 @@ class ADnDRules:
         return base_saves
 
     @staticmethod
-    def resolve_attack(attacker_thac0: int, defender_ac: int) -> bool:
+    def _xp_formula(character_class: str, level: int) -> int:
+        """XP progression used to build the rule tables"""
+        return ADnDRules.BASE_XP.get(character_class, 2000) * (2 ** (level - 1))
+
+    @staticmethod
+    def resolve_attack(attacker_thac0: int, defender_ac: int, rng=random) -> bool:
         """Resolve an attack using THAC0 system"""
-        attack_roll = random.randint(1, 20)
+        attack_roll = rng.randint(1, 20)
         return attack_roll >= attacker_thac0 - defender_ac
 
     @staticmethod
@@ -154,36 +197,91 @@ class ADnDRules:
         damage = sum(random.randint(1, dice_type) for _ in range(num_dice))
         return max(1, damage + strength_modifier)
 
+    @staticmethod
+    def roll_dice(dice: str, rng=random) -> int:
+        """Roll a dice expression such as '1d8', '4d8+1' or '2d4-1'"""
+        dice = dice.replace(' ', '')
+        bonus = 0
+        for sign in ('+', '-'):
+            if sign in dice:
+                dice, modifier = dice.split(sign, 1)
+                bonus = int(modifier) if sign == '+' else -int(modifier)
+                break
+        num_dice, dice_type = map(int, dice.split('d'))
+        return sum(rng.randint(1, dice_type) for _ in range(num_dice)) + bonus
+
+    @staticmethod
+    def calculate_monster_thac0(hit_dice: str) -> int:
+        """Approximate monster THAC0 from its hit dice (e.g. '4d8+1' is 4 HD)"""
+        try:
+            num_dice = int(hit_dice.split('d')[0])
+        except (AttributeError, ValueError):
+            num_dice = 1
+        return max(7, 20 - num_dice)
+
     @staticmethod
     def get_ability_modifier(score: int) -> int:
         """Get ability score modifier"""
         return (score - 10) // 2
 
     @staticmethod
-    def check_morale(morale_score: int) -> bool:
+    def check_morale(morale_score: int, rng=random) -> bool:
         """Check if a monster passes its morale check"""
-        roll = random.randint(1, 20)
+        roll = rng.randint(1, 20)
         return roll <= morale_score
 
     @staticmethod
     def calculate_xp_for_level(character_class: str, level: int) -> int:
         """Calculate XP required for next level"""
-        # Basic XP progression (simplified)
-        base_xp = {
-            'Fighter': 2000,
-            'Paladin': 2250,
-            'Ranger': 2250,
-            'Cleric': 1500,
-            'Druid': 2000,
-            'Magic-User': 2500,
-            'Illusionist': 2500,
-            'Thief': 1250,
-            'Bard': 2000
-        }
-        return base_xp.get(character_class, 2000) * (2 ** (level - 1))
+        class_id = ADnDRules.CLASS_IDS.get(character_class)
+        if class_id is not None and isinstance(level, int) and 1 <= level <= ADnDRules.MAX_LEVEL:
+            return ADnDRules._XP_ROWS[class_id][level - 1]
+        return ADnDRules._xp_formula(character_class, level)
 
     @staticmethod
-    def calculate_starting_gold(character_class: str) -> int:
+    def get_class_id(character_class: str) -> int:
+        """Get the row index of a class in the rule tables"""
+        if character_class not in ADnDRules.CLASS_IDS:
+            raise ValueError(f"Unknown character class: {character_class}")
+        return ADnDRules.CLASS_IDS[character_class]
+
+    @staticmethod
+    def _table_index(class_ids: Sequence[int], levels: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Validate vectorized lookup arguments and convert them to table indices"""
+        class_ids = np.asarray(class_ids, dtype=np.intp)
+        levels = np.asarray(levels, dtype=np.intp)
+        if class_ids.size and (class_ids.min() < 0 or class_ids.max() >= len(ADnDRules.CLASS_NAMES)):
+            raise ValueError("Class id out of range")
+        if levels.size and (levels.min() < 1 or levels.max() > ADnDRules.MAX_LEVEL):
+            raise ValueError(f"Level must be between 1 and {ADnDRules.MAX_LEVEL}")
+        return class_ids, levels - 1
+
+    @staticmethod
+    def thac0_array(class_ids: Sequence[int], levels: Sequence[int]) -> np.ndarray:
+        """Vectorized THAC0 lookup for arrays of class ids and levels"""
+        class_ids, columns = ADnDRules._table_index(class_ids, levels)
+        return ADnDRules.THAC0_TABLE[class_ids, columns]
+
+    @staticmethod
+    def saving_throws_array(class_ids: Sequence[int], levels: Sequence[int]) -> np.ndarray:
+        """Vectorized saving throw lookup, one column per SAVE_CATEGORIES entry"""
+        class_ids, columns = ADnDRules._table_index(class_ids, levels)
+        return ADnDRules.SAVE_TABLE[class_ids, columns]
+
+    @staticmethod
+    def xp_for_level_array(class_ids: Sequence[int], levels: Sequence[int]) -> np.ndarray:
+        """Vectorized XP threshold lookup for arrays of class ids and levels"""
+        class_ids, columns = ADnDRules._table_index(class_ids, levels)
+        return ADnDRules.XP_TABLE[class_ids, columns]
+
+    @staticmethod
+    def hit_dice_array(class_ids: Sequence[int], levels: Sequence[int]) -> np.ndarray:
+        """Vectorized lookup of (number of dice, die size) for hit points"""
+        class_ids, columns = ADnDRules._table_index(class_ids, levels)
+        return ADnDRules.HIT_DICE_TABLE[class_ids, columns]
+
+    @staticmethod
+    def calculate_starting_gold(character_class: str, rng=random) -> int:
         """Calculate starting gold based on character class"""
         # Starting gold rules by class
         gold_rules = {
@@ -209,5 +307,39 @@ class ADnDRules:
         num_dice, sides = map(int, rules['dice'].split('d'))
         
         # Roll the dice and apply multiplier
-        roll = sum(random.randint(1, sides) for _ in range(num_dice))
-        return roll * rules['multiplier']
\ No newline at end of file
+        roll = sum(rng.randint(1, sides) for _ in range(num_dice))
+        return roll * rules['multiplier']
+
+
+def _build_rule_tables() -> None:
+    """Precompute the class-by-level rule tables once at import time"""
+    class_names = tuple(ADnDRules.HIT_DICE)
+    levels = range(1, ADnDRules.MAX_LEVEL + 1)
+
+    thac0 = [[ADnDRules._thac0_formula(level) for level in levels] for _ in class_names]
+    saves = [
+        [tuple(ADnDRules._saving_throws_formula(name, level)[save] for save in ADnDRules.SAVE_CATEGORIES)
+         for level in levels]
+        for name in class_names
+    ]
+    xp = [[ADnDRules._xp_formula(name, level) for level in levels] for name in class_names]
+    hit_dice = [[(level, ADnDRules.HIT_DICE[name]) for level in levels] for name in class_names]
+
+    ADnDRules.CLASS_NAMES = class_names
+    ADnDRules.CLASS_IDS = {name: class_id for class_id, name in enumerate(class_names)}
+
+    # Tuples of plain ints for scalar lookups (JSON friendly, immutable)
+    ADnDRules._THAC0_ROWS = tuple(tuple(row) for row in thac0)
+    ADnDRules._SAVE_ROWS = tuple(tuple(row) for row in saves)
+    ADnDRules._XP_ROWS = tuple(tuple(row) for row in xp)
+
+    # Read-only arrays for vectorized lookups
+    ADnDRules.THAC0_TABLE = np.array(thac0, dtype=np.int16)
+    ADnDRules.SAVE_TABLE = np.array(saves, dtype=np.int16)
+    ADnDRules.XP_TABLE = np.array(xp, dtype=np.int64)
+    ADnDRules.HIT_DICE_TABLE = np.array(hit_dice, dtype=np.int16)
+    for table in (ADnDRules.THAC0_TABLE, ADnDRules.SAVE_TABLE, ADnDRules.XP_TABLE, ADnDRules.HIT_DICE_TABLE):
+        table.setflags(write=False)
+
+
+_build_rule_tables()
@@ -1,19 +1,50 @@
-from flask import Flask, request, jsonify, render_template
+import time
+from flask import Flask, request, jsonify, render_template, g
 from flask_cors import CORS
-from backend.game_state import GameState
 from backend.adnd_rules import ADnDRules
-from backend.dungeon_generator import DungeonGenerator
-from backend.pathfinding import find_path
+from backend.character import Character
+from backend.monsters import templates_json
+from backend.spell_index import DEFAULT_LIMIT, spell_index
+from backend import metrics
+from backend.game_session import GameSession
 import os
 import random
-from backend.spell_utils import generate_illusionist_spells, generate_magic_user_spells
 
 app = Flask(__name__, 
             static_folder='../static',
             template_folder='../templates')
 CORS(app)  # Enable CORS for all routes
-game_state = GameState()
-dungeon_generator = DungeonGenerator()
+
+# The web UI plays a single session; the routes below wrap its methods
+game_session = GameSession()
+game_state = game_session.game_state
+dungeon_generator = game_session.dungeon_generator
+party_generator = game_session.party_generator
+
+# Maximum number of parties returned by /api/party/generate-bulk
+MAX_BULK_PARTIES = 1000
+
+@app.before_request
+def start_request_timer():
+    if metrics.ENABLED:
+        g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        endpoint = request.endpoint or 'unknown'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - start,
+                        endpoint=endpoint, method=request.method)
+        if response.content_length is not None:
+            metrics.inc('http_response_bytes_total', response.content_length, endpoint=endpoint)
+    return response
+
+@app.route('/api/debug/metrics', methods=['GET'])
+def get_metrics():
+    if not metrics.ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return metrics.render_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
 
 @app.route('/')
 def index():
@@ -22,19 +53,7 @@ def index():
 @app.route('/api/game/new', methods=['POST'])
 def new_game():
     try:
-        # Reset game state
-        game_state.party = []
-        game_state.current_level = 1
-        game_state.in_combat = False
-        game_state.combat = None
-        
-        # Generate new dungeon
-        game_state.dungeon = dungeon_generator.generate()
-        
-        # Initialize empty party positions
-        for character in game_state.party:
-            character['position'] = {'x': 0, 'y': 0}
-        
+        game_session.new_game()
         return jsonify({'success': True})
     except Exception as e:
         print(f"Error in new_game: {str(e)}")  # Add logging
@@ -49,163 +68,164 @@ def create_character():
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    # Create character object
-    character = {
-        'name': data['name'],
-        'race': data['race'],
-        'characterClass': data['characterClass'],
-        'level': 1,
-        'experience': 0,
-        'abilities': data['abilities'],
-        'hitPoints': ADnDRules.calculate_hit_points(
-            data['characterClass'],
-            1,
-            ADnDRules.get_ability_modifier(data['abilities']['CON'])
-        ),
-        'maxHitPoints': ADnDRules.calculate_hit_points(
-            data['characterClass'],
-            1,
-            ADnDRules.get_ability_modifier(data['abilities']['CON'])
-        ),
-        'armorClass': 10,
-        'thac0': ADnDRules.calculate_thac0(data['characterClass'], 1),
-        'savingThrows': ADnDRules.calculate_saving_throws(data['characterClass'], 1),
-        'inventory': [],
-        'equipment': {
-            'weapon': None,
-            'armor': None,
-            'shield': None,
-            'helmet': None
-        },
-        'spells': {},
-        'spellSlots': {},
-        'gold': ADnDRules.calculate_starting_gold(data['characterClass']),
-        'silver': 0,
-        'copper': 0,
-        'position': {'x': 0, 'y': 0}
-    }
-    
-    # Generate starting spells for illusionists
-    if data['characterClass'] == 'Illusionist':
-        print("Generating spells for Illusionist...")  # Debug log
-        character['spells'] = generate_illusionist_spells()
-        print(f"Generated spells: {character['spells']}")  # Debug log
-        character['spellSlots'] = {'1': 1}  # Starting spell slots for level 1
-        print(f"Set spell slots: {character['spellSlots']}")  # Debug log
-    # Generate starting spells for magic users
-    elif data['characterClass'] == 'Magic-User':
-        print("Generating spells for Magic-User...")  # Debug log
-        character['spells'] = generate_magic_user_spells()
-        print(f"Generated spells: {character['spells']}")  # Debug log
-        character['spellSlots'] = {'1': 1}  # Starting spell slots for level 1
-        print(f"Set spell slots: {character['spellSlots']}")  # Debug log
+    try:
+        character = Character.create(data['name'], data['race'], data['characterClass'], data['abilities'])
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return jsonify({'error': 'Invalid abilities'}), 400
     
     # Add character to party
     if game_state.add_character(character):
-        print(f"Added character to party: {character}")  # Debug log
-        return jsonify(character)
+        return jsonify(character.to_json())
     else:
         return jsonify({'error': 'Party is full'}), 400
 
 @app.route('/api/game/state', methods=['GET'])
 def get_game_state():
-    return jsonify(game_state.to_dict())
+    # Unchanged since the client's copy: skip building the state altogether
+    etag = game_state.etag()
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        # The full state supersedes any pending tile changes
+        game_state.take_dirty()
+        response = jsonify(game_state.to_dict())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/game/view', methods=['GET'])
+def get_game_view():
+    """Prerendered map rows; x, y, width and height crop it to a viewport"""
+    if not game_state.dungeon:
+        return jsonify({'error': 'No dungeon'}), 400
+    try:
+        viewport = {key: int(request.args[key]) for key in ('x', 'y', 'width', 'height')
+                    if key in request.args}
+    except ValueError:
+        return jsonify({'error': 'Viewport bounds must be integers'}), 400
+    return jsonify(game_session.view(**viewport))
 
 @app.route('/api/game/move', methods=['POST'])
 def move_party():
-    data = request.json
+    data = request.json or {}
     direction = data.get('direction')
+    directions = data.get('directions')
     
-    if not direction:
+    if not direction and not directions:
         return jsonify({'error': 'Missing direction'}), 400
+    if directions is not None and not isinstance(directions, list):
+        return jsonify({'error': 'directions must be a list'}), 400
     
-    # Get party position (assuming first character's position)
-    if not game_state.party:
-        return jsonify({'error': 'No party members'}), 400
-    
-    # Get leader's current position
-    leader = game_state.party[0]
-    current_x = leader['position']['x']
-    current_y = leader['position']['y']
+    base_version = game_state.version
+    try:
+        if directions is not None:
+            # A batch of queued moves, applied in order
+            result = game_session.move_batch(directions)
+        else:
+            result = game_session.move(direction)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Calculate new position for leader
-    new_x, new_y = current_x, current_y
-    if direction == 'north':
-        new_y -= 1
-    elif direction == 'south':
-        new_y += 1
-    elif direction == 'east':
-        new_x += 1
-    elif direction == 'west':
-        new_x -= 1
+    return _movement_response(result, data, base_version)
+
+@app.route('/api/game/travel', methods=['POST'])
+def travel():
+    data = request.json or {}
+    try:
+        x, y = int(data['x']), int(data['y'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'Destination x and y must be integers'}), 400
     
-    # Check if new position is valid
-    if not dungeon_generator.is_valid_position(new_x, new_y):
-        return jsonify({'success': False, 'message': 'Cannot move there'})
+    base_version = game_state.version
+    try:
+        result = game_session.travel(x, y)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Store previous positions for following characters
-    previous_positions = []
+    return _movement_response(result, data, base_version)
+
+@app.route('/api/game/explore', methods=['POST'])
+def explore():
+    data = request.json or {}
+    base_version = game_state.version
+    try:
+        result = game_session.explore()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Move each character in sequence
-    for i, character in enumerate(game_state.party):
-        if i == 0:
-            # Move leader to new position
-            character['position']['x'] = new_x
-            character['position']['y'] = new_y
-            previous_positions.append((new_x, new_y))
+    return _movement_response(result, data, base_version)
+
+def _movement_response(result, data, base_version):
+    """Attach the map changes of a move, travel or explore to its result.
+
+    baseVersion is the state version the changes apply to; a client whose
+    copy is at another version has missed changes and should refetch the
+    full state.
+    """
+    result['baseVersion'] = base_version
+    result['version'] = game_state.version
+    if result['success']:
+        if data.get('delta'):
+            # Only the changed tiles; the client repaints just those cells
+            result['tiles'] = game_session.take_tile_changes()
+            result['party'] = game_state.party_json()
         else:
-            # For following characters, find path to previous character's old position
-            prev_char = game_state.party[i-1]
-            target_x, target_y = previous_positions[-1]
-            
-            # Find path using A* pathfinding
-            path = find_path(
-                (character['position']['x'], character['position']['y']),
-                (target_x, target_y),
-                game_state.dungeon,
-                dungeon_generator.width,
-                dungeon_generator.height
-            )
-            
-            if path and len(path) > 1:
-                # Move to next position in path
-                next_x, next_y = path[1]  # path[0] is current position
-                character['position']['x'] = next_x
-                character['position']['y'] = next_y
-                previous_positions.append((next_x, next_y))
-            else:
-                # If no path found, stay in place
-                previous_positions.append((character['position']['x'], character['position']['y']))
-    
-    # Reveal area around party leader
-    dungeon_generator.reveal_area(new_x, new_y)
+            game_state.take_dirty()
+            result['gameState'] = game_state.to_dict()
+    return jsonify(result)
+
+@app.route('/api/game/stairs', methods=['POST'])
+def use_stairs():
+    try:
+        result = game_session.use_stairs()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Check for special tiles at leader's position
-    tile = game_state.dungeon[new_y][new_x]
-    message = None
+    result['gameState'] = game_state.to_dict()
+    return jsonify(result)
+
+@app.route('/api/game/combat', methods=['POST'])
+def combat_action():
+    data = request.json or {}
+    action = str(data.get('action', '')).strip().lower()
     
-    if tile.get('monster_data'):
-        monster = tile['monster_data']
-        message = f"You encounter a {monster['name']}!"
-    elif tile['char'] == '$':
-        message = "You found treasure!"
-    elif tile['char'] == '<':
-        message = "You found stairs leading up!"
-    elif tile['char'] == '>':
-        message = "You found stairs leading down!"
-    elif tile['char'] == '+':
-        message = "You found a door!"
-    elif tile['char'] == '~':
-        message = "You found water!"
-    elif tile['char'] == '^':
-        message = "You found a trap!"
-    elif tile['char'] == 'i':
-        message = "You found an item!"
+    base_version = game_state.version
+    try:
+        if action == 'start':
+            result = game_session.start_combat()
+        else:
+            result = game_session.combat_action(action, data.get('target'), data.get('segments', 5))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
+    result['message'] = ' '.join(result['messages'])
+    result['party'] = game_state.party_json()
+    result['tiles'] = game_session.take_tile_changes()
+    result['baseVersion'] = base_version
+    result['version'] = game_state.version
+    return jsonify(result)
+
+@app.route('/api/monsters', methods=['GET'])
+def get_monster_templates():
+    """Monster templates by id; tiles only carry each monster's id, hit points and status"""
+    return jsonify(templates_json())
+
+@app.route('/api/spells/search', methods=['GET'])
+def search_spells():
+    """Spells matching every given filter: q (words in the name or description), prefix (of a name),
+    class, level and component (repeatable or comma separated); descriptions only with descriptions=true"""
+    try:
+        level = int(request.args['level']) if 'level' in request.args else None
+        limit = max(0, int(request.args.get('limit', DEFAULT_LIMIT)))
+    except ValueError:
+        return jsonify({'error': 'level and limit must be integers'}), 400
+    components = [part for value in request.args.getlist('component') for part in value.split(',') if part.strip()]
+    spells = spell_index().search(text=request.args.get('q'), prefix=request.args.get('prefix'),
+                                  spell_class=request.args.get('class'), level=level, components=components)
+    descriptions = request.args.get('descriptions', 'false').lower() == 'true'
     return jsonify({
-        'success': True,
-        'gameState': game_state.to_dict(),
-        'message': message
+        'total': len(spells),
+        'spells': [spell.to_json(descriptions) for spell in spells[:limit]]
     })
 
 @app.route('/api/game/save', methods=['POST'])
@@ -213,7 +233,7 @@ def save_game():
     data = request.json
     slot_name = data.get('slot_name', 'autosave')
     
-    if game_state.save_game(slot_name):
+    if game_session.save(slot_name):
         return jsonify({'success': True})
     else:
         return jsonify({'error': 'Failed to save game'}), 500
@@ -222,136 +242,130 @@ def save_game():
 def load_game():
     slot_name = request.args.get('slot_name', 'autosave')
     
-    if game_state.load_game(slot_name):
+    if game_session.load(slot_name):
         return jsonify(game_state.to_dict())
     else:
         return jsonify({'error': 'Failed to load game'}), 500
 
-@app.route('/api/rules/ability-modifier', methods=['POST'])
-def get_ability_modifier():
-    data = request.json
+# Maximum number of queries accepted by /api/rules/batch
+MAX_RULE_BATCH_SIZE = 500
+
+def _rule_ability_modifier(data):
     score = data.get('score')
     if score is None:
-        return jsonify({'error': 'Missing ability score'}), 400
-    return jsonify({'modifier': ADnDRules.get_ability_modifier(score)})
+        raise ValueError('Missing ability score')
+    if not isinstance(score, int) or isinstance(score, bool):
+        raise ValueError('Ability score must be an integer')
+    return {'modifier': ADnDRules.get_ability_modifier(score)}
 
-@app.route('/api/rules/xp-for-level', methods=['POST'])
-def get_xp_for_level():
-    data = request.json
+def _class_and_level(data):
+    """The query's character class and level, checked against the rule tables"""
     character_class = data.get('characterClass')
     level = data.get('level')
     if not character_class or level is None:
-        return jsonify({'error': 'Missing character class or level'}), 400
-    return jsonify({'xp': ADnDRules.calculate_xp_for_level(character_class, level)})
+        raise ValueError('Missing character class or level')
+    if character_class not in ADnDRules.CLASS_IDS:
+        raise ValueError(f'Unknown character class: {character_class}')
+    if not isinstance(level, int) or isinstance(level, bool) or not 1 <= level <= ADnDRules.MAX_LEVEL:
+        raise ValueError(f'Level must be an integer between 1 and {ADnDRules.MAX_LEVEL}')
+    return character_class, level
+
+def _rule_xp_for_level(data):
+    return {'xp': ADnDRules.calculate_xp_for_level(*_class_and_level(data))}
+
+def _rule_saving_throws(data):
+    return ADnDRules.calculate_saving_throws(*_class_and_level(data))
+
+def _rule_thac0(data):
+    return {'thac0': ADnDRules.calculate_thac0(*_class_and_level(data))}
+
+# Rule query handlers by query type, shared by the single and batch endpoints
+RULE_QUERIES = {
+    'ability-modifier': _rule_ability_modifier,
+    'xp-for-level': _rule_xp_for_level,
+    'saving-throws': _rule_saving_throws,
+    'thac0': _rule_thac0
+}
+
+def _answer_rule_query(query_type, data):
+    """Run a single rule query, returning (payload, status code)"""
+    try:
+        return RULE_QUERIES[query_type](data), 200
+    except (ValueError, TypeError) as e:
+        return {'error': str(e)}, 400
+
+@app.route('/api/rules/ability-modifier', methods=['POST'])
+def get_ability_modifier():
+    payload, status = _answer_rule_query('ability-modifier', request.json)
+    return jsonify(payload), status
+
+@app.route('/api/rules/xp-for-level', methods=['POST'])
+def get_xp_for_level():
+    payload, status = _answer_rule_query('xp-for-level', request.json)
+    return jsonify(payload), status
 
 @app.route('/api/rules/saving-throws', methods=['POST'])
 def get_saving_throws():
-    data = request.json
-    character_class = data.get('characterClass')
-    level = data.get('level')
-    if not character_class or level is None:
-        return jsonify({'error': 'Missing character class or level'}), 400
-    return jsonify(ADnDRules.calculate_saving_throws(character_class, level))
+    payload, status = _answer_rule_query('saving-throws', request.json)
+    return jsonify(payload), status
+
+@app.route('/api/rules/batch', methods=['POST'])
+def get_rules_batch():
+    """Answer many rule queries in one request.
+
+    Expects {"queries": [{"type": "xp-for-level", "characterClass": ..., "level": ...}, ...]}
+    and returns {"results": [...]} in the same order. A bad query gets an
+    {"error": ...} entry in its slot instead of failing the whole batch.
+    """
+    data = request.json or {}
+    queries = data.get('queries')
+    if not isinstance(queries, list):
+        return jsonify({'error': 'Missing queries list'}), 400
+    if len(queries) > MAX_RULE_BATCH_SIZE:
+        return jsonify({'error': f'Too many queries (max {MAX_RULE_BATCH_SIZE})'}), 400
+    
+    results = []
+    for query in queries:
+        if not isinstance(query, dict) or query.get('type') not in RULE_QUERIES:
+            results.append({'error': 'Unknown query type'})
+            continue
+        payload, _ = _answer_rule_query(query['type'], query)
+        results.append(payload)
+    
+    return jsonify({'results': results})
 
 @app.route('/api/party/generate', methods=['POST'])
 def generate_party():
     """Generate a full party of 4 characters with random class/race combinations"""
     try:
-        # Clear existing party
-        game_state.party = []
-        
-        # Define available classes and races
-        available_classes = [
-            'Fighter', 'Magic-User', 'Cleric', 'Thief', 'Ranger',
-            'Paladin', 'Druid', 'Illusionist', 'Bard'
-        ]
-        
-        available_races = [
-            'Human', 'Elf', 'Dwarf', 'Halfling', 'Gnome',
-            'Half-Orc', 'Half-Elf', 'Lizardfolk', 'Tabaxi', 'Goblin'
-        ]
-        
-        # Generate each character
-        for i in range(4):
-            # Randomly select class and race
-            character_class = random.choice(available_classes)
-            race = random.choice(available_races)
-            
-            # Keep trying until we get a valid combination
-            while True:
-                # Roll abilities
-                abilities = ADnDRules.roll_ability_scores()
-                
-                # Apply racial modifiers
-                abilities = ADnDRules.apply_racial_modifiers(abilities, race)
-                
-                # Check if this combination is valid
-                if ADnDRules.check_class_requirements(abilities, character_class, race):
-                    break
-                
-                # If not valid, try a different race
-                race = random.choice(available_races)
-            
-            # Calculate character stats
-            con_modifier = ADnDRules.get_ability_modifier(abilities['CON'])
-            hit_points = ADnDRules.calculate_hit_points(character_class, 1, con_modifier)
-            thac0 = ADnDRules.calculate_thac0(character_class, 1)
-            saving_throws = ADnDRules.calculate_saving_throws(character_class, 1)
-            
-            # Create character
-            character = {
-                'name': f"{character_class} {i+1}",
-                'race': race,
-                'characterClass': character_class,
-                'level': 1,
-                'experience': 0,
-                'abilities': abilities,
-                'hitPoints': hit_points,
-                'maxHitPoints': hit_points,
-                'armorClass': 10,
-                'thac0': thac0,
-                'savingThrows': saving_throws,
-                'inventory': [],
-                'equipment': {
-                    'weapon': None,
-                    'armor': None,
-                    'shield': None,
-                    'helmet': None
-                },
-                'gold': ADnDRules.calculate_starting_gold(character_class),
-                'silver': 0,
-                'copper': 0,
-                'spells': {},
-                'spellSlots': {},
-                'position': {'x': 0, 'y': 0}
-            }
-            
-            # Generate starting spells for illusionists
-            if character_class == 'Illusionist':
-                character['spells'] = generate_illusionist_spells()
-                character['spellSlots'] = {'1': 1}  # Starting spell slots for level 1
-            # Generate starting spells for magic users
-            elif character_class == 'Magic-User':
-                character['spells'] = generate_magic_user_spells()
-                character['spellSlots'] = {'1': 1}  # Starting spell slots for level 1
-            
-            game_state.add_character(character)
-        
-        # Generate a new dungeon if one doesn't exist
-        if not game_state.dungeon:
-            game_state.dungeon = dungeon_generator.generate()
-        
-        # Place party members in the dungeon
-        if not dungeon_generator.place_party(game_state.party):
-            return jsonify({'error': 'Failed to place party in dungeon'}), 500
-        
+        party = game_session.generate_party(4)
         return jsonify({
             'status': 'success',
-            'party': game_state.party
+            'party': [character.to_json() for character in party]
         })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 500
     except Exception as e:
         print(f"Error generating party: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/party/generate-bulk', methods=['POST'])
+def generate_parties():
+    """Generate many parties without touching the current game"""
+    data = request.json or {}
+    count = data.get('count', 1)
+    size = data.get('size', 4)
+    if not isinstance(count, int) or not 1 <= count <= MAX_BULK_PARTIES:
+        return jsonify({'error': f'count must be between 1 and {MAX_BULK_PARTIES}'}), 400
+    if not isinstance(size, int) or not 1 <= size <= 4:
+        return jsonify({'error': 'size must be between 1 and 4'}), 400
+    
+    parties = party_generator.generate_parties(
+        count, size,
+        with_spells=data.get('withSpells', False),
+        unique_names=data.get('uniqueNames', False)
+    )
+    return jsonify({'parties': [[character.to_json() for character in party] for party in parties]})
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000) 
\ No newline at end of file
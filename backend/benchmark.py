@@ -0,0 +1,228 @@
+"""Performance benchmarks with regression thresholds.
+
+Times the hot paths (dungeon generation, pathfinding, state serialization,
+save/load and a full /api/game/move round trip), records ops/sec and
+p50/p99 latency, and compares p50 against a JSON baseline:
+
+    python -m backend.benchmark                 # compare against the baseline
+    python -m backend.benchmark --update        # record a new baseline
+    python -m backend.benchmark --threshold 0.5 --only generate_80x48
+
+The first run (no baseline file yet) records one. Exits with status 1 when
+any benchmark's p50 is slower than baseline * (1 + threshold).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.dungeon_generator import DungeonGenerator
+from backend.encounters import encounter_table
+from backend.game_session import GameSession
+from backend.pathfinding import find_path, find_path_hierarchical
+from backend.treasure import treasure_engine
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'benchmarks', 'baseline.json')
+
+# Allowed slowdown of p50 latency relative to the baseline (0.25 = 25%)
+DEFAULT_THRESHOLD = 0.25
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 1) -> Dict[str, float]:
+    """Run fn repeatedly and summarize its latency"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    total = sum(timings)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / total if total else float('inf'),
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'p99_ms': timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+    }
+
+def _floor_in(generator: DungeonGenerator, room) -> Tuple[int, int]:
+    for y in range(room.y, room.y + room.height):
+        for x in range(room.x, room.x + room.width):
+            if generator.dungeon[y][x]['char'] == '.':
+                return x, y
+    return room.center()
+
+def _far_apart_floor(generator: DungeonGenerator) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Floor tiles in the first and last room: the longest path the generator lays out.
+    Without rooms, the first and last floor tiles of the map."""
+    if not generator.rooms:
+        floor = [(x, y) for y, row in enumerate(generator.dungeon) for x, cell in enumerate(row) if cell['char'] == '.']
+        return floor[0], floor[-1]
+    return _floor_in(generator, generator.rooms[0]), _floor_in(generator, generator.rooms[-1])
+
+def _sealed_floor(generator: DungeonGenerator) -> Tuple[int, int]:
+    """Turn a wall cell surrounded by walls into floor: a region of its own no path can reach"""
+    dungeon = generator.dungeon
+    for y in range(1, generator.height - 1):
+        for x in range(1, generator.width - 1):
+            if all(dungeon[y + dy][x + dx]['char'] == '#' for dy in (-1, 0, 1) for dx in (-1, 0, 1)):
+                dungeon[y][x] = generator.TILES['floor'].copy()
+                generator.tile_changed(x, y)
+                return x, y
+    raise RuntimeError('No solid rock to carve a sealed cell from')
+
+def _start_game(session: GameSession) -> None:
+    """New game with a placed party, regenerating levels the party does not fit on"""
+    for _ in range(10):
+        session.new_game()
+        try:
+            session.generate_party(with_spells=False)
+            return
+        except ValueError:
+            continue
+    raise RuntimeError('Could not place the party in any generated level')
+
+def _benchmarks(iterations: int) -> Dict[str, Tuple[Callable[[], object], int]]:
+    """Name -> (callable, iterations) for every benchmark"""
+    random.seed(1234)
+    benchmarks = {}
+
+    for width, height in ((80, 48), (160, 96), (200, 200)):
+        generator = DungeonGenerator(width, height)
+        rooms = max(12, width * height // 400)
+        benchmarks[f'generate_{width}x{height}'] = (
+            lambda generator=generator, rooms=rooms: generator.generate(rooms, rooms + 8),
+            max(1, iterations // 4)
+        )
+
+    for layout in ('bsp', 'caves', 'drunkard'):
+        benchmarks[f'generate_{layout}_80x48'] = (
+            lambda generator=DungeonGenerator(), layout=layout: generator.generate(layout=layout),
+            max(1, iterations // 4)
+        )
+
+    generator = DungeonGenerator()
+    generator.generate()
+    start, end = _far_apart_floor(generator)
+    benchmarks['find_path_long'] = (
+        lambda: find_path(start, end, generator.dungeon, generator.width, generator.height,
+                          generator.connectivity),
+        iterations
+    )
+    big = DungeonGenerator(200, 200)
+    big.generate(100, 108)
+    big_start, big_end = _far_apart_floor(big)
+    benchmarks['find_path_200x200'] = (
+        lambda: find_path(big_start, big_end, big.dungeon, big.width, big.height, big.connectivity),
+        max(1, iterations // 4)
+    )
+    benchmarks['find_path_hierarchical_200x200'] = (
+        lambda: find_path_hierarchical(big_start, big_end, big.dungeon, big.width, big.height,
+                                       big.path_graph, big.connectivity),
+        max(1, iterations // 4)
+    )
+    # Without the connectivity index an unreachable goal floods the whole region around the start
+    pocket = _sealed_floor(generator)
+    benchmarks['find_path_unreachable'] = (
+        lambda: find_path(start, pocket, generator.dungeon, generator.width, generator.height),
+        max(1, iterations // 4)
+    )
+    benchmarks['find_path_unreachable_indexed'] = (
+        lambda: find_path(start, pocket, generator.dungeon, generator.width, generator.height,
+                          generator.connectivity),
+        iterations
+    )
+
+    session = GameSession(seed=1234, save_dir=tempfile.mkdtemp(prefix='adnd-bench-'))
+    _start_game(session)
+    table = encounter_table(5)
+    benchmarks['encounter_draw_many_10000'] = (lambda: table.draw_many(10000), iterations)
+    engine = treasure_engine()
+    benchmarks['treasure_roll_many_10000'] = (lambda: engine.roll_many('H', 10000), iterations)
+    benchmarks['game_state_to_dict'] = (session.game_state.to_dict, iterations)
+
+    def save_and_load():
+        session.game_state.save_game('benchmark')
+        session.game_state.load_game('benchmark')
+    benchmarks['save_load'] = (save_and_load, max(1, iterations // 4))
+
+    from backend import app as app_module
+    _start_game(app_module.game_session)
+    client = app_module.app.test_client()
+    directions = ['east', 'west']
+
+    def move_round_trip():
+        directions.reverse()
+        client.post('/api/game/move', json={'direction': directions[0]})
+    benchmarks['api_game_move'] = (move_round_trip, iterations)
+
+    return benchmarks
+
+def run_benchmarks(iterations: int = 40, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Run the suite (or the named subset) and return results by benchmark name"""
+    results = {}
+    benchmarks = _benchmarks(iterations)
+    for name, (fn, count) in benchmarks.items():
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, count)
+    return results
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Return a description of every benchmark whose p50 regressed past the threshold"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name]['p50_ms'] * (1 + threshold)
+        if result['p50_ms'] > limit:
+            regressions.append(f"{name}: p50 {result['p50_ms']:.3f}ms > {limit:.3f}ms "
+                               f"(baseline {baseline[name]['p50_ms']:.3f}ms)")
+    return regressions
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_baseline(path: str, results: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run performance benchmarks')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--iterations', type=int, default=40)
+    parser.add_argument('--only', nargs='*')
+    parser.add_argument('--update', action='store_true', help='record the results as the new baseline')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.iterations, args.only)
+    for name, result in results.items():
+        print(f"{name:24} {result['ops_per_sec']:10.1f} ops/s  "
+              f"p50 {result['p50_ms']:8.3f}ms  p99 {result['p99_ms']:8.3f}ms")
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None or args.update:
+        merged = dict(baseline or {})
+        merged.update(results)
+        save_baseline(args.baseline, merged)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import random
+from array import array
+from typing import Dict, List, Optional, Union
+
+from backend.adnd_rules import ADnDRules
+from backend.spell_utils import generate_illusionist_spells, generate_magic_user_spells
+
+ABILITIES = ('STR', 'INT', 'WIS', 'DEX', 'CON', 'CHA')
+
+# Layout version of Character.to_save lists; saves without one hold to_json dicts
+SAVE_VERSION = 1
+
+# Classes that start with a spellbook and one first level slot
+_STARTING_SPELLS = {
+    'Illusionist': generate_illusionist_spells,
+    'Magic-User': generate_magic_user_spells
+}
+
+# JSON key -> attribute, for the fields stored as they are
+_FIELDS = {
+    'name': 'name',
+    'race': 'race',
+    'characterClass': 'character_class',
+    'level': 'level',
+    'experience': 'experience',
+    'hitPoints': 'hit_points',
+    'maxHitPoints': 'max_hit_points',
+    'armorClass': 'armor_class',
+    'thac0': 'thac0',
+    'inventory': 'inventory',
+    'equipment': 'equipment',
+    'gold': 'gold',
+    'silver': 'silver',
+    'copper': 'copper',
+    'spells': 'spells',
+    'spellSlots': 'spell_slots',
+    'position': 'position'
+}
+
+def _empty_equipment() -> Dict:
+    return {'weapon': None, 'armor': None, 'shield': None, 'helmet': None}
+
+class Character:
+    """A party member.
+
+    Ability scores and saving throws are kept as small byte arrays in the
+    order of ABILITIES and ADnDRules.SAVE_CATEGORIES; ability_scores() and
+    saving_throw_scores() give them as dicts. to_json uses the client's
+    camelCase keys.
+    """
+    __slots__ = ('name', 'race', 'character_class', 'level', 'experience', 'abilities', 'hit_points',
+                 'max_hit_points', 'armor_class', 'thac0', 'saving_throws', 'inventory', 'equipment',
+                 'gold', 'silver', 'copper', 'spells', 'spell_slots', 'position')
+
+    def __init__(self, name: str, race: str, character_class: str, abilities: Dict[str, int],
+                 hit_points: int = 0, max_hit_points: Optional[int] = None, level: int = 1,
+                 experience: int = 0, armor_class: int = 10, thac0: int = 20,
+                 saving_throws: Optional[Dict[str, int]] = None, gold: int = 0):
+        self.name = name
+        self.race = race
+        self.character_class = character_class
+        self.level = level
+        self.experience = experience
+        self.abilities = array('b', (abilities.get(ability, 0) for ability in ABILITIES))
+        self.hit_points = hit_points
+        self.max_hit_points = hit_points if max_hit_points is None else max_hit_points
+        self.armor_class = armor_class
+        self.thac0 = thac0
+        self.saving_throws = array('b', ((saving_throws or {}).get(save, 0) for save in ADnDRules.SAVE_CATEGORIES))
+        self.inventory: List = []
+        self.equipment = _empty_equipment()
+        self.gold = gold
+        self.silver = 0
+        self.copper = 0
+        self.spells: Dict = {}
+        self.spell_slots: Dict = {}
+        self.position = {'x': 0, 'y': 0}
+
+    @classmethod
+    def create(cls, name: str, race: str, character_class: str, abilities: Dict[str, int],
+               with_spells: bool = True, rng=random) -> 'Character':
+        """A new level 1 character with rolled hit points and gold and, for casters, starting spells"""
+        hit_points = ADnDRules.calculate_hit_points(
+            character_class, 1, ADnDRules.get_ability_modifier(abilities['CON']), rng)
+        character = cls(
+            name, race, character_class, abilities, hit_points,
+            thac0=ADnDRules.calculate_thac0(character_class, 1),
+            saving_throws=ADnDRules.calculate_saving_throws(character_class, 1),
+            gold=ADnDRules.calculate_starting_gold(character_class, rng)
+        )
+        if with_spells and character_class in _STARTING_SPELLS:
+            character.spells = _STARTING_SPELLS[character_class](rng)
+            character.spell_slots = {'1': 1}  # Starting spell slots for level 1
+        return character
+
+    def ability_scores(self) -> Dict[str, int]:
+        return dict(zip(ABILITIES, self.abilities))
+
+    def saving_throw_scores(self) -> Dict[str, int]:
+        return dict(zip(ADnDRules.SAVE_CATEGORIES, self.saving_throws))
+
+    def to_json(self) -> Dict:
+        """The character as sent to clients"""
+        return {
+            'name': self.name,
+            'race': self.race,
+            'characterClass': self.character_class,
+            'level': self.level,
+            'experience': self.experience,
+            'abilities': self.ability_scores(),
+            'hitPoints': self.hit_points,
+            'maxHitPoints': self.max_hit_points,
+            'armorClass': self.armor_class,
+            'thac0': self.thac0,
+            'savingThrows': self.saving_throw_scores(),
+            'inventory': self.inventory,
+            'equipment': self.equipment,
+            'gold': self.gold,
+            'silver': self.silver,
+            'copper': self.copper,
+            'spells': self.spells,
+            'spellSlots': self.spell_slots,
+            'position': self.position
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'Character':
+        """Rebuild a character from to_json output (or an old party dict); missing fields get defaults"""
+        character = cls(data.get('name', ''), data.get('race', ''), data.get('characterClass', ''),
+                        data.get('abilities', {}), saving_throws=data.get('savingThrows'))
+        for key, value in data.items():
+            if key in _FIELDS:
+                setattr(character, _FIELDS[key], value)
+        if 'hitPoints' in data and 'maxHitPoints' not in data:
+            character.max_hit_points = character.hit_points
+        return character
+
+    def to_save(self) -> List:
+        """Compact positional encoding for save files, led by SAVE_VERSION"""
+        return [SAVE_VERSION, self.name, self.race, self.character_class, self.level, self.experience,
+                list(self.abilities), self.hit_points, self.max_hit_points, self.armor_class, self.thac0,
+                list(self.saving_throws), self.inventory, self.equipment, self.gold, self.silver,
+                self.copper, self.spells, self.spell_slots, self.position['x'], self.position['y']]
+
+    @classmethod
+    def from_save(cls, data: Union[List, Dict]) -> 'Character':
+        """Decode to_save output; dicts from saves made before the encoding existed are accepted too"""
+        if isinstance(data, dict):
+            return cls.from_json(data)
+        if not data or data[0] != SAVE_VERSION:
+            raise ValueError(f'Unsupported character save version: {data[0] if data else None}')
+        (_, name, race, character_class, level, experience, abilities, hit_points, max_hit_points,
+         armor_class, thac0, saving_throws, inventory, equipment, gold, silver, copper, spells,
+         spell_slots, x, y) = data
+        character = cls(name, race, character_class, {}, hit_points, max_hit_points, level, experience,
+                        armor_class, thac0, gold=gold)
+        character.abilities = array('b', abilities)
+        character.saving_throws = array('b', saving_throws)
+        character.inventory = inventory
+        character.equipment = equipment
+        character.silver = silver
+        character.copper = copper
+        character.spells = spells
+        character.spell_slots = spell_slots
+        character.position = {'x': x, 'y': y}
+        return character
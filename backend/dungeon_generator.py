@@ -1,46 +1,102 @@
 import random
-import json
-import os
-from typing import List, Tuple, Dict
-from backend.pathfinding import find_path
-
-class Room:
-    def __init__(self, x: int, y: int, width: int, height: int):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.connected = False
-
-    def center(self) -> Tuple[int, int]:
-        return (self.x + self.width // 2, self.y + self.height // 2)
-
-    def intersects(self, other: 'Room', padding: int = 1) -> bool:
-        return (self.x - padding <= other.x + other.width and
-                self.x + self.width + padding >= other.x and
-                self.y - padding <= other.y + other.height and
-                self.y + self.height + padding >= other.y)
+import time
+from typing import Callable, List, Optional, Tuple, Dict
+
+import numpy as np
+
+from collections import OrderedDict
+
+from backend import layouts
+from backend.character import Character
+from backend.encounters import encounter_table
+from backend.floor_index import FloorIndex
+from backend.layouts import Room
+from backend.monsters import load_templates, spawn, template_of
+from backend.pathfinding import BLOCKING_CHARS, ConnectivityIndex, PathGraph, distance_map, passable_mask
+from backend.treasure import treasure_engine
+from backend import metrics
+
+# Terrain codes of the generation grid, indexing TILE_NAMES
+TILE_NAMES = ('wall', 'floor', 'door', 'stairs_up', 'stairs_down', 'treasure', 'item', 'fog', 'water', 'trap')
+WALL, FLOOR, DOOR, STAIRS_UP, STAIRS_DOWN, TREASURE, ITEM, FOG, WATER, TRAP = range(len(TILE_NAMES))
+MONSTER = 255  # cell held by a monster; its tile comes from the monster definition
+
+# Stages that lay out each kind of level, in order
+LAYOUT_STAGES = {
+    'rooms': ('rooms', 'corridors', 'doors'),
+    'bsp': ('bsp', 'doors'),
+    'caves': ('caves',),
+    'drunkard': ('drunkard',)
+}
+
+# Stages every level goes through after its layout
+FEATURE_STAGES = ('floor', 'stairs', 'monsters', 'water', 'traps', 'fog', 'treasure', 'connectivity', 'paths')
+
+# Treasure type of hoards whose owner has none the engine knows (e.g. 'Special')
+DEFAULT_TREASURE_TYPE = 'C'
+
+# Seeded layouts kept for reuse by each generator
+LAYOUT_CACHE_SIZE = 32
+
+def layout_for_depth(depth: int) -> str:
+    """Layout used for a dungeon level: rooms near the surface, then BSP, drunkard's tunnels and caves"""
+    if depth <= 2:
+        return 'rooms'
+    return ('caves', 'bsp', 'drunkard')[depth % 3]
+
+def _neighbor(mask: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """mask shifted so each cell holds the value of its (dx, dy) neighbor; off-map neighbors are False"""
+    shifted = np.zeros_like(mask)
+    height, width = mask.shape
+    shifted[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)] = \
+        mask[max(0, dy):height - max(0, -dy), max(0, dx):width - max(0, -dx)]
+    return shifted
 
 class DungeonGenerator:
-    def __init__(self, width: int = 80, height: int = 48):
+    def __init__(self, width: int = 80, height: int = 48, rng=random, np_rng=np.random):
         self.width = width
         self.height = height
         self.rooms: List[Room] = []
         self.corridors: List[Tuple[int, int]] = []
         self.dungeon: List[List[Dict]] = []
+        self.terrain = np.full((height, width), WALL, dtype=np.uint8)
+        self.monster_cells: Dict[Tuple[int, int], Dict] = {}
+        self.connectivity = ConnectivityIndex(self.dungeon)
+        # Abstract graph for long-range (hierarchical) pathfinding
+        self.path_graph = PathGraph(self.dungeon)
+        # Free floor cells, shared by all placement code
+        self.floor_index = FloorIndex()
+        self.layout = 'rooms'
+        self.depth = 1
+        # Random sources; generate(seed=...) swaps in private seeded ones for that level
+        self.default_rng, self.default_np_rng = rng, np_rng
+        self.rng, self.np_rng = rng, np_rng
+
+        # Stage name -> callable; replace an entry to swap a stage out
+        self.stages: Dict[str, Callable[[], None]] = {
+            'init': self._init_grid,
+            'rooms': self._add_rooms,
+            'corridors': self._connect_rooms,
+            'doors': self._add_doors,
+            'bsp': lambda: self._run_layout(layouts.bsp(self.terrain, self.rng)),
+            'caves': lambda: self._run_layout(layouts.caves(self.terrain, self.np_rng)),
+            'drunkard': lambda: self._run_layout(layouts.drunkard(self.terrain, self.rng)),
+            'floor': self._index_floor,
+            'stairs': self._add_stairs,
+            'monsters': self._add_monsters_and_treasure,
+            'water': self._add_water_features,
+            'traps': self._add_traps,
+            'fog': self._add_fog_of_war,
+            'treasure': self._stock_treasure,
+            'connectivity': self._index_connectivity,
+            'paths': lambda: self.path_graph.rebuild(self.dungeon, self.connectivity.passable)
+        }
+        # Seconds each stage took in the last generate()
+        self.stage_timings: Dict[str, float] = {}
+        self._layout_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
         
-        # Load monster definitions
-        try:
-            # Get the absolute path to the project root
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            monsters_path = os.path.join(project_root, 'data', 'monsters.json')
-            
-            with open(monsters_path, 'r') as f:
-                self.monsters = json.load(f)['monsters']
-                print(f"Loaded {len(self.monsters)} monsters successfully")
-        except Exception as e:
-            print(f"Error loading monsters.json: {str(e)}")
-            self.monsters = []  # Initialize with empty list if loading fails
+        # Monster templates, shared by every generator and never modified
+        self.monsters = list(load_templates().values())
         
         # Tile definitions
         self.TILES = {
@@ -69,51 +125,98 @@ class DungeonGenerator:
             'Bard': '#00ffff'        # Cyan
         }
 
-    def generate(self, min_rooms: int = 12, max_rooms: int = 20) -> List[List[Dict]]:
-        """Generate a new dungeon level"""
-        # Initialize empty map with walls
-        self.dungeon = [[self.TILES['wall'].copy() for _ in range(self.width)] for _ in range(self.height)]
+    def generate(self, min_rooms: int = 12, max_rooms: int = 20, depth: int = 1,
+                 layout: Optional[str] = None, seed: Optional[int] = None) -> List[List[Dict]]:
+        """Generate a new dungeon level.
+
+        Runs the layout stages for the level's layout (by default the one
+        chosen for its depth) followed by the feature stages. Rooms,
+        corridors and features are laid out on a grid of terrain codes with
+        array operations; the tile dicts are built once at the end. With a
+        seed the level is reproducible and its layout is cached.
+        """
+        self.depth = depth
+        self.layout = layout or layout_for_depth(depth)
+        if self.layout not in LAYOUT_STAGES:
+            raise ValueError(f"Unknown layout: {self.layout}")
+        self.min_rooms, self.max_rooms = min_rooms, max_rooms
+        if seed is None:
+            self.rng, self.np_rng = self.default_rng, self.default_np_rng
+        else:
+            self.rng, self.np_rng = random.Random(seed), np.random.RandomState(seed % 2**32)
+        self.stage_timings = {}
+
+        key = (seed, self.layout, self.width, self.height, min_rooms, max_rooms)
+        cached = self._layout_cache.get(key) if seed is not None else None
+        if cached is not None:
+            self._layout_cache.move_to_end(key)
+            self._restore_layout(cached)
+        else:
+            self._run_stages(('init',) + LAYOUT_STAGES[self.layout])
+            if seed is not None:
+                self._layout_cache[key] = self._snapshot_layout()
+                while len(self._layout_cache) > LAYOUT_CACHE_SIZE:
+                    self._layout_cache.popitem(last=False)
+
+        self._run_stages(FEATURE_STAGES)
+        return self.dungeon
+
+    def _run_stages(self, names) -> None:
+        for name in names:
+            start = time.perf_counter()
+            with metrics.timer('dungeon_generation_phase_seconds', phase=name):
+                self.stages[name]()
+            self.stage_timings[name] = time.perf_counter() - start
+
+    def _snapshot_layout(self) -> tuple:
+        """Everything the feature stages depend on, including the random state"""
+        rooms = [(room.x, room.y, room.width, room.height) for room in self.rooms]
+        return (self.terrain.copy(), rooms, list(self.corridors),
+                self.rng.getstate(), self.np_rng.get_state())
+
+    def _restore_layout(self, snapshot: tuple) -> None:
+        terrain, rooms, corridors, rng_state, np_state = snapshot
+        self.terrain = terrain.copy()
+        self.monster_cells = {}
+        self.rooms = [Room(*bounds) for bounds in rooms]
+        self.corridors = list(corridors)
+        self.rng.setstate(rng_state)
+        self.np_rng.set_state(np_state)
+
+    def _init_grid(self) -> None:
+        """Initialize empty map with walls"""
+        self.terrain = np.full((self.height, self.width), WALL, dtype=np.uint8)
+        self.monster_cells = {}
         self.rooms = []
         self.corridors = []
 
-        # Generate rooms
-        num_rooms = random.randint(min_rooms, max_rooms)
+    def _add_rooms(self) -> None:
+        """Scatter non-overlapping rooms"""
+        num_rooms = self.rng.randint(self.min_rooms, self.max_rooms)
         for _ in range(num_rooms):
             self._try_add_room()
 
-        # Connect rooms with corridors
-        self._connect_rooms()
-
-        # Add doors
-        self._add_doors()
-
-        # Add stairs
-        self._add_stairs()
-
-        # Add monsters and treasure
-        self._add_monsters_and_treasure()
+    def _run_layout(self, rooms: List[Room]) -> None:
+        self.rooms = rooms
 
-        # Add water features
-        self._add_water_features()
+    def _index_floor(self) -> None:
+        """Index the floor cells the layout left free for stairs and features"""
+        self.floor_index = FloorIndex.from_mask(self.terrain == FLOOR, self.rooms)
 
-        # Add traps
-        self._add_traps()
-
-        # Add fog of war
-        self._add_fog_of_war()
-
-        return self.dungeon
+    def _index_connectivity(self) -> None:
+        """Index which tiles can reach which"""
+        self.connectivity.rebuild(self.dungeon, (self.terrain != WALL) & (self.terrain != WATER))
 
     def _try_add_room(self, max_attempts: int = 100) -> bool:
         """Try to add a room to the dungeon"""
         for _ in range(max_attempts):
             # Random room dimensions
-            width = random.randint(5, 12)
-            height = random.randint(5, 8)
+            width = self.rng.randint(5, 12)
+            height = self.rng.randint(5, 8)
             
             # Random position
-            x = random.randint(1, self.width - width - 1)
-            y = random.randint(1, self.height - height - 1)
+            x = self.rng.randint(1, self.width - width - 1)
+            y = self.rng.randint(1, self.height - height - 1)
             
             new_room = Room(x, y, width, height)
             
@@ -127,10 +230,7 @@ class DungeonGenerator:
 
     def _carve_room(self, room: Room) -> None:
         """Carve out a room in the dungeon"""
-        for y in range(room.y, room.y + room.height):
-            for x in range(room.x, room.x + room.width):
-                if 0 <= y < self.height and 0 <= x < self.width:
-                    self.dungeon[y][x] = self.TILES['floor'].copy()
+        self.terrain[max(0, room.y):room.y + room.height, max(0, room.x):room.x + room.width] = FLOOR
 
     def _connect_rooms(self) -> None:
         """Connect rooms with corridors"""
@@ -141,210 +241,229 @@ class DungeonGenerator:
 
     def _carve_corridor(self, start: Tuple[int, int], end: Tuple[int, int]) -> None:
         """Carve a corridor between two points"""
-        x1, y1 = start
-        x2, y2 = end
-
         # Randomly decide whether to go horizontal or vertical first
-        if random.random() < 0.5:
-            # Horizontal then vertical
-            for x in range(min(x1, x2), max(x1, x2) + 1):
-                self.dungeon[y1][x] = self.TILES['floor'].copy()
-            for y in range(min(y1, y2), max(y1, y2) + 1):
-                self.dungeon[y][x2] = self.TILES['floor'].copy()
-        else:
-            # Vertical then horizontal
-            for y in range(min(y1, y2), max(y1, y2) + 1):
-                self.dungeon[y][x1] = self.TILES['floor'].copy()
-            for x in range(min(x1, x2), max(x1, x2) + 1):
-                self.dungeon[y2][x] = self.TILES['floor'].copy()
+        layouts.carve_corridor(self.terrain, start, end, self.rng.random() < 0.5)
+
+    def _room_mask(self, inset: int = 0) -> np.ndarray:
+        """Cells inside any room, shrunk by inset cells on each side"""
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        for room in self.rooms:
+            mask[room.y + inset:room.y + room.height - inset, room.x + inset:room.x + room.width - inset] = True
+        return mask
+
+    def _door_candidates(self) -> np.ndarray:
+        """Corridor cells in the wall ring around a room, with wall on two opposite sides"""
+        rooms = self._room_mask()
+        ring = (_neighbor(rooms, 0, 1) | _neighbor(rooms, 0, -1) |
+                _neighbor(rooms, 1, 0) | _neighbor(rooms, -1, 0)) & ~rooms
+        floor = self.terrain == FLOOR
+        wall = self.terrain == WALL
+        walled_ns = _neighbor(wall, 0, -1) & _neighbor(wall, 0, 1) & _neighbor(floor, 1, 0) & _neighbor(floor, -1, 0)
+        walled_ew = _neighbor(wall, -1, 0) & _neighbor(wall, 1, 0) & _neighbor(floor, 0, 1) & _neighbor(floor, 0, -1)
+        return ring & floor & (walled_ns | walled_ew)
 
     def _add_doors(self) -> None:
         """Add doors to room entrances"""
-        for room in self.rooms:
-            # Check each wall for potential door placement
-            for x in range(room.x, room.x + room.width):
-                for y in range(room.y, room.y + room.height):
-                    if self._is_valid_door_position(x, y):
-                        if random.random() < 0.3:  # 30% chance to place a door
-                            self.dungeon[y][x] = self.TILES['door'].copy()
-
-    def _is_valid_door_position(self, x: int, y: int) -> bool:
-        """Check if a position is valid for a door"""
-        if not (0 <= x < self.width and 0 <= y < self.height):
-            return False
-        
-        # Check if position is a wall
-        if self.dungeon[y][x]['char'] != '#':
-            return False
-        
-        # Check if adjacent to floor
-        floor_count = 0
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < self.width and 0 <= ny < self.height and 
-                self.dungeon[ny][nx]['char'] == '.'):
-                floor_count += 1
-        
-        return floor_count == 2  # Door should connect exactly two floor tiles
+        candidates = self._door_candidates()
+        # 30% chance to place a door in each doorway
+        self.terrain[candidates & (self.np_rng.random(candidates.shape) < 0.3)] = DOOR
+
+    def _room_floor_cell(self, room: Room) -> Optional[Tuple[int, int]]:
+        """The floor cell of a room closest to its center (rooms of open layouts are not all floor)"""
+        cx, cy = room.center()
+        if self.terrain[cy, cx] == FLOOR:
+            return cx, cy
+        ys, xs = np.nonzero(self.terrain[room.y:room.y + room.height, room.x:room.x + room.width] == FLOOR)
+        if not len(xs):
+            return None
+        closest = np.argmin(np.abs(xs + room.x - cx) + np.abs(ys + room.y - cy))
+        return int(xs[closest]) + room.x, int(ys[closest]) + room.y
 
     def _add_stairs(self) -> None:
         """Add up and down stairs to the dungeon"""
         # Add up stairs in first room
         if self.rooms:
-            x, y = self.rooms[0].center()
-            self.dungeon[y][x] = self.TILES['stairs_up'].copy()
+            cell = self._room_floor_cell(self.rooms[0])
+            if cell:
+                self.terrain[cell[1], cell[0]] = STAIRS_UP
+                self.floor_index.remove(*cell)
 
         # Add down stairs in last room
         if self.rooms:
-            x, y = self.rooms[-1].center()
-            self.dungeon[y][x] = self.TILES['stairs_down'].copy()
+            cell = self._room_floor_cell(self.rooms[-1])
+            if cell:
+                self.terrain[cell[1], cell[0]] = STAIRS_DOWN
+                self.floor_index.remove(*cell)
+
+    def _place_feature(self, code: int, rooms: range, chance: float) -> None:
+        """Put a feature on a random free floor cell of each room picked with the given chance"""
+        for room in np.flatnonzero(self.np_rng.random(len(rooms)) < chance):
+            cell = self.floor_index.sample_room(rooms[room], self.rng)
+            if cell:
+                self.terrain[cell[1], cell[0]] = code
+                self.floor_index.remove(*cell)
 
     def _add_monsters_and_treasure(self) -> None:
         """Add monsters and treasure to the dungeon"""
+        inner_rooms = range(1, len(self.rooms) - 1)  # Skip first and last rooms (stairs)
         if not self.monsters:
             print("Warning: No monsters available to place")
-            return
-            
-        for room in self.rooms[1:-1]:  # Skip first and last rooms (stairs)
-            # 50% chance to add a monster
-            if random.random() < 0.5:
-                # Try up to 10 times to find a valid position
-                for _ in range(10):
-                    x = random.randint(room.x + 1, room.x + room.width - 2)
-                    y = random.randint(room.y + 1, room.y + room.height - 2)
-                    if self.dungeon[y][x]['char'] == '.':
-                        try:
-                            monster = random.choice(self.monsters)
-                            # Ensure monster has required fields
-                            if 'display_char' not in monster:
-                                monster['display_char'] = monster['name'][0].upper()
-                            if 'color' not in monster:
-                                monster['color'] = '#ff0000'  # Default to red
-                                
-                            self.dungeon[y][x] = {
-                                'char': monster['display_char'],
-                                'color': monster['color'],
-                                'walkable': False,
-                                'visible': True,
-                                'monster_data': monster
-                            }
-                            print(f"Placed monster {monster['name']} at ({x}, {y})")
-                            break
-                        except Exception as e:
-                            print(f"Error placing monster: {str(e)}")
-                            continue
-
-            # 30% chance to add treasure
-            if random.random() < 0.3:
-                # Try up to 10 times to find a valid position
-                for _ in range(10):
-                    x = random.randint(room.x + 1, room.x + room.width - 2)
-                    y = random.randint(room.y + 1, room.y + room.height - 2)
-                    if self.dungeon[y][x]['char'] == '.':
-                        self.dungeon[y][x] = self.TILES['treasure'].copy()
-                        break
+        else:
+            cells = []
+            for room in inner_rooms:
+                # 50% chance to add a monster
+                if self.rng.random() >= 0.5:
+                    continue
+                cell = self.floor_index.sample_room(room, self.rng)
+                if cell is not None:
+                    self.floor_index.remove(*cell)
+                    cells.append(cell)
+
+            # Monsters suited to the depth, drawn for the whole level at once
+            for (x, y), monster in zip(cells, encounter_table(self.depth).draw_many(len(cells), self.np_rng)):
+                self.terrain[y, x] = MONSTER
+                self.monster_cells[(x, y)] = spawn(monster, self.rng)
+
+        # 30% chance to add treasure to each room
+        self._place_feature(TREASURE, inner_rooms, 0.3)
 
     def _add_water_features(self) -> None:
         """Add water features to the dungeon"""
-        for room in self.rooms:
-            if random.random() < 0.2:  # 20% chance for water in a room
-                water_x = random.randint(room.x + 1, room.x + room.width - 2)
-                water_y = random.randint(room.y + 1, room.y + room.height - 2)
-                self.dungeon[water_y][water_x] = self.TILES['water'].copy()
+        self._place_feature(WATER, range(len(self.rooms)), 0.2)  # 20% chance for water in a room
 
     def _add_traps(self) -> None:
         """Add traps to the dungeon"""
-        for room in self.rooms[1:-1]:  # Skip first and last rooms
-            if random.random() < 0.3:  # 30% chance for trap in a room
-                trap_x = random.randint(room.x + 1, room.x + room.width - 2)
-                trap_y = random.randint(room.y + 1, room.y + room.height - 2)
-                if self.dungeon[trap_y][trap_x]['char'] == '.':
-                    self.dungeon[trap_y][trap_x] = self.TILES['trap'].copy()
+        self._place_feature(TRAP, range(1, len(self.rooms) - 1), 0.3)  # Skip first and last rooms
 
     def _add_fog_of_war(self) -> None:
-        """Add fog of war to the dungeon"""
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.dungeon[y][x]['char'] == '#':
-                    continue
-                self.dungeon[y][x]['visible'] = False
+        """Add fog of war and build the tiles"""
+        self.dungeon = self._build_tiles(self._fog_mask())
+        self.floor_index.dungeon = self.dungeon
+
+    def _stock_treasure(self) -> None:
+        """Fill each treasure tile with a hoard of the treasure type of a monster native to the depth"""
+        ys, xs = np.nonzero(self.terrain == TREASURE)
+        if not len(xs):
+            return
+        engine = treasure_engine()
+        owners = encounter_table(self.depth).draw_many(len(xs), self.np_rng)
+        types = [owner.get('treasure_type') for owner in owners]
+        types = [kind if kind in engine.types else DEFAULT_TREASURE_TYPE for kind in types]
+        types += [DEFAULT_TREASURE_TYPE] * (len(xs) - len(types))
+        for x, y, hoard in zip(xs.tolist(), ys.tolist(), engine.roll_hoards(types, self.np_rng)):
+            self.dungeon[y][x]['treasure'] = hoard
+
+    def _fog_mask(self) -> np.ndarray:
+        """Cells hidden until explored: everything but walls"""
+        return self.terrain != WALL
+
+    def _build_tiles(self, hidden: np.ndarray) -> List[List[Dict]]:
+        """Turn the terrain grid into the tile dicts the game works with"""
+        prototypes = [self.TILES[name] for name in TILE_NAMES]
+        dungeon = [[dict(prototypes[code], visible=not fog) if code != MONSTER else None
+                    for code, fog in zip(codes, fogs)]
+                   for codes, fogs in zip(self.terrain.tolist(), hidden.tolist())]
+        for (x, y), monster in self.monster_cells.items():
+            template = template_of(monster)
+            dungeon[y][x] = {
+                'char': template['display_char'],
+                'color': template['color'],
+                'walkable': False,
+                'visible': not hidden[y, x],
+                'monster_data': monster
+            }
+        return dungeon
 
-    def reveal_area(self, x: int, y: int, radius: int = 5) -> None:
-        """Reveal an area around a point"""
+    def reveal_area(self, x: int, y: int, radius: int = 5) -> List[Tuple[int, int]]:
+        """Reveal an area around a point; returns the positions that were newly revealed"""
+        revealed = []
         for dy in range(-radius, radius + 1):
             for dx in range(-radius, radius + 1):
                 nx, ny = x + dx, y + dy
                 if (0 <= nx < self.width and 0 <= ny < self.height and
                     dx*dx + dy*dy <= radius*radius):
-                    self.dungeon[ny][nx]['visible'] = True
-
-    def get_empty_position(self) -> Tuple[int, int]:
-        """Get a random empty position in the dungeon"""
-        while True:
-            x = random.randint(1, self.width - 2)
-            y = random.randint(1, self.height - 2)
-            if self.dungeon[y][x]['char'] == '.':
-                return (x, y)
+                    cell = self.dungeon[ny][nx]
+                    if not cell['visible']:
+                        cell['visible'] = True
+                        revealed.append((nx, ny))
+        return revealed
+
+    def get_empty_position(self, connected_to: Tuple[int, int] = None) -> Tuple[int, int]:
+        """Get a random empty position in the dungeon, optionally one reachable from connected_to"""
+        if connected_to is None:
+            position = self.floor_index.sample(self.rng)
+        else:
+            # Only tiles in the component of connected_to qualify
+            xs, ys = self.floor_index.positions()
+            reachable = np.zeros(len(xs), dtype=bool)
+            for dx, dy in ((0, 0), (0, 1), (1, 0), (0, -1), (-1, 0)):
+                component = self.connectivity.component(connected_to[0] + dx, connected_to[1] + dy)
+                if component >= 0:
+                    reachable |= self.connectivity.labels[ys, xs] == component
+            choices = np.flatnonzero(reachable)
+            position = None
+            if len(choices):
+                pick = choices[int(self.rng.random() * len(choices))]
+                position = (int(xs[pick]), int(ys[pick]))
+        if position is None:
+            raise ValueError('No empty position in the dungeon')
+        return position
 
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if a position is valid for movement"""
         return (0 <= x < self.width and
                 0 <= y < self.height and
-                self.dungeon[y][x]['char'] != '#')
+                self.dungeon[y][x]['char'] not in BLOCKING_CHARS)
 
-    def place_party(self, party: List[Dict]) -> bool:
-        """Place the party members in the dungeon using A* pathfinding"""
+    def place_party(self, party: List[Character]) -> bool:
+        """Place the party on the left side of the dungeon, where it can reach the stairs down"""
         if not party:
             return False
-            
-        # Find a suitable starting position on the left side
-        start_x = 1
-        start_y = self.height // 2
-        
-        # Find the first valid floor tile
-        while start_x < self.width // 4:  # Look in the left quarter of the map
-            if self.dungeon[start_y][start_x]['char'] == '.':
-                break
-            start_x += 1
-        else:
+
+        stairs = next(((x, y) for y, row in enumerate(self.dungeon)
+                       for x, cell in enumerate(row) if cell['char'] == '>'), None)
+
+        xs, ys = self.floor_index.positions()
+        if stairs is not None:
+            reachable = self.connectivity.labels[ys, xs] == self.connectivity.component(*stairs)
+            xs, ys = xs[reachable], ys[reachable]
+        if not len(xs):
             return False  # No valid starting position found
-            
-        # Place the first character (party leader)
-        party[0]['position'] = {'x': start_x, 'y': start_y}
-        self.dungeon[start_y][start_x] = {
-            'char': '@',
-            'color': self.CLASS_COLORS.get(party[0]['characterClass'], '#ffffff'),
-            'walkable': True,
-            'visible': True
-        }
-        
-        # Place remaining party members using A* pathfinding
-        for i in range(1, len(party)):
-            # Calculate target position (one step behind the previous character)
-            prev_char = party[i-1]
-            target_x = prev_char['position']['x']
-            target_y = prev_char['position']['y']
-            
-            # Find a path to the target position
-            path = find_path(
-                (start_x, start_y),
-                (target_x, target_y),
-                self.dungeon,
-                self.width,
-                self.height
-            )
-            
-            if not path:
-                continue  # Skip if no path found
-                
-            # Place character at the last position in the path
-            pos_x, pos_y = path[-1]
-            party[i]['position'] = {'x': pos_x, 'y': pos_y}
-            self.dungeon[pos_y][pos_x] = {
-                'char': '@',
-                'color': self.CLASS_COLORS.get(party[i]['characterClass'], '#ffffff'),
-                'walkable': True,
-                'visible': True
-            }
-            
-        return True 
\ No newline at end of file
+
+        # Prefer the middle row of the left quarter, then any floor tile from the left
+        preferred = (ys == self.height // 2) & (xs < self.width // 4)
+        first = np.lexsort((ys, xs, ~preferred))[0]
+        self.place_party_near(party, int(xs[first]), int(ys[first]))
+        return True
+
+    def place_party_near(self, party: List[Character], x: int, y: int) -> None:
+        """Put the leader on (x, y) and the others on the closest reachable floor tiles"""
+        distances = distance_map(passable_mask(self.dungeon), [(x, y)], max_distance=10)
+        ys, xs = np.nonzero(distances <= 10)
+        order = np.argsort(distances[ys, xs], kind='stable')
+        spots = [(int(xs[i]), int(ys[i])) for i in order
+                 if (xs[i], ys[i]) in self.floor_index and (xs[i], ys[i]) != (x, y)]
+        for index, character in enumerate(party):
+            px, py = (x, y) if index == 0 or index > len(spots) else spots[index - 1]
+            character.position = {'x': px, 'y': py}
+
+    def set_dungeon(self, dungeon: List[List[Dict]]) -> None:
+        """Use an existing dungeon (a loaded or revisited level) instead of generating one"""
+        self.dungeon = dungeon
+        if dungeon:
+            self.height = len(dungeon)
+            self.width = len(dungeon[0])
+        # Rooms are only known for a level laid out here, not for tiles handed in
+        self.rooms = []
+        self.connectivity.rebuild(dungeon)
+        self.path_graph.rebuild(dungeon, self.connectivity.passable)
+        self.floor_index = FloorIndex.from_dungeon(dungeon)
+
+    def tile_changed(self, x: int, y: int) -> None:
+        """Keep the connectivity, path graph and free-floor indexes in step with a changed tile"""
+        if self.connectivity.dungeon is self.dungeon:
+            self.connectivity.update(x, y)
+        if self.path_graph.dungeon is self.dungeon:
+            self.path_graph.update(x, y)
+        if self.floor_index.dungeon is self.dungeon:
+            self.floor_index.refresh(x, y)
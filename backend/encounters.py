@@ -0,0 +1,119 @@
+"""Depth-weighted random encounter tables.
+
+Each table weights the monster templates for one dungeon depth and is
+compiled into a Walker alias table, so a draw costs one random index and
+one comparison however large the bestiary is. Tables are cached per depth.
+"""
+import math
+import random
+from functools import lru_cache
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.monsters import load_templates
+
+# Spread (in hit dice) of the bell curve around a level's target hit dice, at depth 1
+BASE_SPREAD = 1.5
+
+# Extra spread per level of depth, so deep levels mix in weaker and stronger monsters
+SPREAD_PER_DEPTH = 0.25
+
+# Encounter tables kept in the cache
+CACHED_TABLES = 64
+
+class AliasTable:
+    """Walker's alias method: O(n) to build, O(1) per draw from a discrete distribution"""
+
+    def __init__(self, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=np.float64)
+        if not len(weights) or weights.sum() <= 0:
+            raise ValueError('Alias table needs at least one positive weight')
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        prob = np.ones(n)
+        alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            prob[low] = scaled[low]
+            alias[low] = high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+
+        self.prob = prob
+        self.alias = alias
+        # Plain lists are faster than numpy scalars for single draws
+        self._prob = prob.tolist()
+        self._alias = alias.tolist()
+
+    def __len__(self) -> int:
+        return len(self._prob)
+
+    def draw(self, rng=random) -> int:
+        column = int(rng.random() * len(self._prob))
+        return column if rng.random() < self._prob[column] else self._alias[column]
+
+    def draw_many(self, count: int, np_rng=np.random) -> np.ndarray:
+        """count independent draws as an index array"""
+        columns = np_rng.randint(0, len(self._prob), size=count)
+        return np.where(np_rng.random_sample(count) < self.prob[columns], columns, self.alias[columns])
+
+def hit_dice_count(hit_dice: str) -> int:
+    """Number of hit dice in an expression such as '4d8+1'"""
+    try:
+        return int(hit_dice.split('d')[0])
+    except (AttributeError, ValueError):
+        return 1
+
+def encounter_weights(templates: Sequence[Mapping], depth: int) -> List[float]:
+    """Relative frequency of each template on a level.
+
+    A bell curve over hit dice centered on the depth; among monsters with
+    the same hit dice, those worth more experience are proportionally rarer.
+    """
+    spread = BASE_SPREAD + SPREAD_PER_DEPTH * (depth - 1)
+    dice = [hit_dice_count(template['hit_dice']) for template in templates]
+    least_xp = {}
+    for count, template in zip(dice, templates):
+        least_xp[count] = min(least_xp.get(count, math.inf), max(1, template.get('xp', 1)))
+    return [math.exp(-((count - depth) ** 2) / (2 * spread ** 2)) * least_xp[count] / max(1, template.get('xp', 1))
+            for count, template in zip(dice, templates)]
+
+class EncounterTable:
+    """Monster templates for one depth (optionally only some monster types) with their alias table"""
+
+    def __init__(self, depth: int, types: Optional[Tuple[str, ...]] = None,
+                 templates: Optional[Sequence[Mapping]] = None):
+        if templates is None:
+            templates = list(load_templates().values())
+        if types is not None:
+            templates = [template for template in templates if template.get('type') in types]
+        self.depth = depth
+        self.templates = list(templates)
+        self.weights = encounter_weights(self.templates, depth) if self.templates else []
+        self.alias = AliasTable(self.weights) if self.templates else None
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def draw(self, rng=random) -> Optional[Mapping]:
+        """One monster template, or None if the table is empty"""
+        if self.alias is None:
+            return None
+        return self.templates[self.alias.draw(rng)]
+
+    def draw_many(self, count: int, np_rng=np.random) -> List[Mapping]:
+        """count monster templates at once, e.g. for a whole level or a simulation"""
+        if self.alias is None or count <= 0:
+            return []
+        return [self.templates[i] for i in self.alias.draw_many(count, np_rng).tolist()]
+
+@lru_cache(maxsize=CACHED_TABLES)
+def _encounter_table(depth: int, types: Optional[Tuple[str, ...]]) -> EncounterTable:
+    return EncounterTable(depth, types)
+
+def encounter_table(depth: int, types: Optional[Sequence[str]] = None) -> EncounterTable:
+    """The cached encounter table for a depth (and optionally a set of monster types)"""
+    return _encounter_table(max(1, depth), tuple(sorted(types)) if types is not None else None)
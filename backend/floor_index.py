@@ -0,0 +1,120 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+class _CellSet:
+    """Cells (flat indices) in a swap-remove array with a position map"""
+    __slots__ = ('cells', 'slots')
+
+    def __init__(self):
+        self.cells: List[int] = []
+        self.slots: Dict[int, int] = {}
+
+    def add(self, cell: int) -> None:
+        if cell not in self.slots:
+            self.slots[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell: int) -> None:
+        slot = self.slots.pop(cell, None)
+        if slot is None:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[slot] = last
+            self.slots[last] = slot
+
+    def sample(self, rng) -> Optional[int]:
+        if not self.cells:
+            return None
+        return self.cells[int(rng.random() * len(self.cells))]
+
+class FloorIndex:
+    """Free floor cells of a level with O(1) add, remove and uniform sampling.
+
+    Cells can also be sampled per room: a cell inside a room's interior is
+    kept in that room's set as well as the level-wide one. Sampling never
+    probes, so it always terminates, and returns None when nothing is free.
+    """
+
+    def __init__(self, width: int = 0, height: int = 0, rooms=()):
+        self.width = width
+        self.height = height
+        self.dungeon = None
+        self._all = _CellSet()
+        self._rooms = [_CellSet() for _ in rooms]
+        self._room_of = np.full((height, width), -1, dtype=np.int32)
+        # Placement stays off room walls, like the generator always has
+        for index, room in enumerate(rooms):
+            self._room_of[room.y + 1:room.y + room.height - 1, room.x + 1:room.x + room.width - 1] = index
+
+    @classmethod
+    def from_mask(cls, free: np.ndarray, rooms=()) -> 'FloorIndex':
+        """Index every True cell of a (height, width) mask"""
+        height, width = free.shape
+        index = cls(width, height, rooms)
+        for cell in np.flatnonzero(free).tolist():
+            index._add(cell)
+        return index
+
+    @classmethod
+    def from_dungeon(cls, dungeon: List[List[Dict]], rooms=()) -> 'FloorIndex':
+        """Index the free floor tiles of a tile grid"""
+        if not dungeon:
+            return cls()
+        index = cls.from_mask(np.array([[is_free(cell) for cell in row] for row in dungeon], dtype=bool), rooms)
+        index.dungeon = dungeon
+        return index
+
+    def __len__(self) -> int:
+        return len(self._all.cells)
+
+    def __contains__(self, position: Tuple[int, int]) -> bool:
+        x, y = position
+        return y * self.width + x in self._all.slots
+
+    def _add(self, cell: int) -> None:
+        self._all.add(cell)
+        room = self._room_of.flat[cell]
+        if room >= 0:
+            self._rooms[room].add(cell)
+
+    def add(self, x: int, y: int) -> None:
+        self._add(y * self.width + x)
+
+    def remove(self, x: int, y: int) -> None:
+        """Mark a cell as taken (no-op if it was not free)"""
+        cell = y * self.width + x
+        self._all.discard(cell)
+        room = self._room_of[y, x]
+        if room >= 0:
+            self._rooms[room].discard(cell)
+
+    def refresh(self, x: int, y: int) -> None:
+        """Re-check one tile of the indexed dungeon after it changed"""
+        if is_free(self.dungeon[y][x]):
+            self.add(x, y)
+        else:
+            self.remove(x, y)
+
+    def _position(self, cell: Optional[int]) -> Optional[Tuple[int, int]]:
+        return None if cell is None else (cell % self.width, cell // self.width)
+
+    def sample(self, rng) -> Optional[Tuple[int, int]]:
+        """A uniformly random free cell, or None"""
+        return self._position(self._all.sample(rng))
+
+    def sample_room(self, room: int, rng) -> Optional[Tuple[int, int]]:
+        """A uniformly random free cell inside a room (by its index in the generator's room list), or None"""
+        if not 0 <= room < len(self._rooms):
+            return None
+        return self._position(self._rooms[room].sample(rng))
+
+    def positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All free cells as (xs, ys) arrays"""
+        cells = np.array(self._all.cells, dtype=np.intp)
+        return cells % self.width, cells // self.width
+
+def is_free(cell: Dict) -> bool:
+    """A floor tile nothing stands on"""
+    return cell['char'] == '.' and not cell.get('monster_data')
@@ -1,92 +1,288 @@
+import heapq
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-class Character:
-    def __init__(self, name: str, race: str, character_class: str):
+from backend.adnd_rules import ADnDRules
+from backend.character import ABILITIES, Character
+from backend.monsters import template_of
+
+# Position of Strength in Character.abilities
+STR = ABILITIES.index('STR')
+
+# Segments in one combat round; actions are scheduled on this time scale
+ROUND_SEGMENTS = 10
+
+# Speed factor of unarmed fighters, monsters and weapons without one; an attack at this speed takes a round
+DEFAULT_SPEED = 5
+
+class Combatant:
+    """Compact per-combatant record used by the combat engine"""
+    __slots__ = ('id', 'name', 'side', 'hp', 'max_hp', 'armor_class', 'thac0',
+                 'damage', 'damage_bonus', 'morale', 'xp', 'ref', 'status', 'speed')
+
+    def __init__(self, id: int, name: str, side: str, hp: int, max_hp: int, armor_class: int,
+                 thac0: int, damage: str, damage_bonus: int = 0, morale: int = 12,
+                 xp: int = 0, ref=None, status: str = 'active', speed: int = DEFAULT_SPEED):
+        self.id = id
         self.name = name
-        self.race = race
-        self.character_class = character_class
-        self.level = 1
-        self.experience = 0
-        self.abilities = {
-            'STR': 0, 'INT': 0, 'WIS': 0,
-            'DEX': 0, 'CON': 0, 'CHA': 0
-        }
-        self.hit_points = 0
-        self.max_hit_points = 0
-        self.armor_class = 10
-        self.thac0 = 20
-        self.saving_throws = {
-            'Death': 0, 'Wands': 0, 'Paralysis': 0,
-            'Breath': 0, 'Spells': 0
-        }
-        self.inventory = []
-        self.equipment = {
-            'weapon': None,
-            'armor': None,
-            'shield': None,
-            'helmet': None
-        }
-        self.spells = []
-        self.spell_slots = {}
-
-    def roll_ability_scores(self, method: str = '3d6') -> None:
-        """Roll ability scores using specified method (3d6 or point-buy)"""
-        if method == '3d6':
-            for ability in self.abilities:
-                self.abilities[ability] = sum(random.randint(1, 6) for _ in range(3))
-        # TODO: Implement point-buy system
-
-    def calculate_hit_points(self) -> None:
-        """Calculate hit points based on class and CON modifier"""
-        hit_dice = {
-            'Fighter': 10, 'Paladin': 10, 'Ranger': 10,
-            'Cleric': 8, 'Druid': 8,
-            'Magic-User': 4, 'Illusionist': 4,
-            'Thief': 6, 'Bard': 6
-        }
-        con_mod = (self.abilities['CON'] - 10) // 2
-        self.max_hit_points = random.randint(1, hit_dice[self.character_class]) + con_mod
-        self.hit_points = self.max_hit_points
-
-    def calculate_thac0(self) -> None:
-        """Calculate THAC0 based on class and level"""
-        base_thac0 = {
-            'Fighter': 20, 'Paladin': 20, 'Ranger': 20,
-            'Cleric': 20, 'Druid': 20,
-            'Magic-User': 20, 'Illusionist': 20,
-            'Thief': 20, 'Bard': 20
-        }
-        level_bonus = (self.level - 1) // 3
-        self.thac0 = base_thac0[self.character_class] - level_bonus
+        self.side = side  # 'party' or 'monster'
+        self.hp = hp
+        self.max_hp = max_hp
+        self.armor_class = armor_class
+        self.thac0 = thac0
+        self.damage = damage
+        self.damage_bonus = damage_bonus
+        self.morale = morale
+        self.xp = xp
+        self.ref = ref  # party index or (x, y) position of the monster tile
+        self.status = status  # 'active', 'dead' or 'fled'
+        self.speed = speed  # weapon speed factor; lower attacks sooner
 
-class Combat:
+    @property
+    def active(self) -> bool:
+        return self.status == 'active'
+
+    @classmethod
+    def from_character(cls, id: int, index: int, character: Character) -> 'Combatant':
+        """Build a combat record from a party member"""
+        weapon = character.equipment.get('weapon')
+        return cls(
+            id, character.name, 'party', character.hit_points, character.max_hit_points,
+            character.armor_class, character.thac0,
+            weapon.get('damage', '1d6') if weapon else '1d6',
+            ADnDRules.get_ability_modifier(character.abilities[STR]),
+            ref=index, speed=weapon.get('speed', DEFAULT_SPEED) if weapon else DEFAULT_SPEED
+        )
+
+    @classmethod
+    def from_monster(cls, id: int, position: Tuple[int, int], monster: Dict, rng=random) -> 'Combatant':
+        """Build a combat record from a monster instance (or a full monster definition)"""
+        template = template_of(monster)
+        hp = monster.get('hp') or max(1, ADnDRules.roll_dice(template['hit_dice'], rng))
+        attack = next((attack for attack in template.get('attacks', []) if 'd' in attack.get('damage', '')), {})
+        return cls(
+            id, template['name'], 'monster', hp, hp,
+            template.get('armor_class', 10),
+            ADnDRules.calculate_monster_thac0(template['hit_dice']),
+            attack.get('damage', '1d6'), morale=template.get('morale', 12), xp=template.get('xp', 0),
+            ref=tuple(position), speed=attack.get('speed', DEFAULT_SPEED)
+        )
+
+    def to_list(self) -> List:
+        return [self.id, self.name, self.side, self.hp, self.max_hp, self.armor_class, self.thac0,
+                self.damage, self.damage_bonus, self.morale, self.xp,
+                list(self.ref) if isinstance(self.ref, tuple) else self.ref, self.status, self.speed]
+
+    @classmethod
+    def from_list(cls, data: List) -> 'Combatant':
+        combatant = cls(*data)
+        if isinstance(combatant.ref, list):
+            combatant.ref = tuple(combatant.ref)
+        return combatant
+
+class TurnScheduler:
+    """Heap of (time, sequence, combatant id) giving O(log n) turn advancement.
+
+    Removing or rescheduling a combatant invalidates its old heap entry
+    lazily; stale entries are skipped when they reach the top.
+    """
     def __init__(self):
-        self.initiative = {}
-        self.current_turn = 0
-        self.combatants = []
+        self._heap: List[Tuple[float, int, int]] = []
+        self._entries: Dict[int, int] = {}  # combatant id -> sequence of its live entry
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(self, combatant_id: int, time: float) -> None:
+        """Schedule (or reschedule) a combatant's next turn"""
+        self._sequence += 1
+        self._entries[combatant_id] = self._sequence
+        heapq.heappush(self._heap, (time, self._sequence, combatant_id))
+
+    def remove(self, combatant_id: int) -> None:
+        """Drop a combatant from the turn order"""
+        self._entries.pop(combatant_id, None)
+
+    def pop(self) -> Optional[Tuple[float, int]]:
+        """Pop the next (time, combatant id), or None when nobody is scheduled"""
+        while self._heap:
+            time, sequence, combatant_id = heapq.heappop(self._heap)
+            if self._entries.get(combatant_id) == sequence:
+                del self._entries[combatant_id]
+                return time, combatant_id
+        return None
+
+    def items(self) -> List[List]:
+        """Live (time, combatant id) entries in turn order"""
+        return [[time, combatant_id] for time, sequence, combatant_id in sorted(self._heap)
+                if self._entries.get(combatant_id) == sequence]
+
+class Combat:
+    def __init__(self, rng=random):
+        # Source of every die rolled in this fight
+        self.rng = rng
+        self.combatants: Dict[int, Combatant] = {}
+        self.scheduler = TurnScheduler()
+        self.time = 0.0
+        self.current: Optional[int] = None
+        self.log: List[str] = []
+
+    @property
+    def round(self) -> int:
+        return int(self.time // ROUND_SEGMENTS) + 1
+
+    def add_combatant(self, combatant: Combatant) -> None:
+        self.combatants[combatant.id] = combatant
 
     def roll_initiative(self) -> None:
-        """Roll initiative for all combatants"""
-        for combatant in self.combatants:
-            self.initiative[combatant] = random.randint(1, 6)
-        self.combatants.sort(key=lambda x: self.initiative[x], reverse=True)
+        """Roll initiative for all combatants; a higher d6 acts earlier in the round"""
+        for combatant in self.combatants.values():
+            if combatant.active:
+                self.scheduler.schedule(combatant.id, self.time + 6 - self.rng.randint(1, 6))
+        self.advance()
+
+    def advance(self) -> Optional[Combatant]:
+        """Move to the next combatant in the turn order"""
+        self.current = None
+        while not self.is_over():
+            entry = self.scheduler.pop()
+            if entry is None:
+                break
+            time, combatant_id = entry
+            if self.combatants[combatant_id].active:
+                self.time = time
+                self.current = combatant_id
+                return self.combatants[combatant_id]
+        return None
+
+    def current_combatant(self) -> Optional[Combatant]:
+        return self.combatants.get(self.current) if self.current is not None else None
+
+    def side_active(self, side: str) -> List[Combatant]:
+        return [c for c in self.combatants.values() if c.side == side and c.active]
+
+    def is_over(self) -> bool:
+        return not self.side_active('party') or not self.side_active('monster')
+
+    def _end_turn(self, actor: Combatant, speed: float) -> None:
+        """Reschedule the actor after an action taking `speed` segments"""
+        if actor.active:
+            self.scheduler.schedule(actor.id, self.time + max(1, speed))
+        self.advance()
+
+    def attack_segments(self, combatant: Combatant) -> float:
+        """Segments an attack takes: a round at DEFAULT_SPEED, one more or less per point of speed factor"""
+        return ROUND_SEGMENTS + combatant.speed - DEFAULT_SPEED
+
+    def attack(self, target_id: Optional[int] = None, speed: Optional[float] = None) -> bool:
+        """Current combatant attacks a target (the first active enemy if none is given).
+
+        The attack takes `speed` segments, by default attack_segments of the attacker's weapon.
+        """
+        actor = self.current_combatant()
+        if actor is None:
+            return False
+        enemy_side = 'monster' if actor.side == 'party' else 'party'
+        target = self.combatants.get(target_id) if target_id is not None else None
+        if target is None or target.side != enemy_side or not target.active:
+            enemies = self.side_active(enemy_side)
+            if not enemies:
+                return False
+            target = enemies[0] if actor.side == 'party' else self.rng.choice(enemies)
+
+        if ADnDRules.resolve_attack(actor.thac0, target.armor_class, self.rng):
+            damage = max(1, ADnDRules.roll_dice(actor.damage, self.rng) + actor.damage_bonus)
+            target.hp -= damage
+            self.log.append(f"{actor.name} hits {target.name} for {damage} damage.")
+            if target.hp <= 0:
+                self._remove(target, 'dead')
+                self.log.append(f"{target.name} is slain!")
+            elif target.side == 'monster' and target.hp * 2 < target.max_hp \
+                    and not ADnDRules.check_morale(target.morale, self.rng):
+                self._remove(target, 'fled')
+                self.log.append(f"{target.name} flees!")
+        else:
+            self.log.append(f"{actor.name} misses {target.name}.")
+
+        self._end_turn(actor, self.attack_segments(actor) if speed is None else speed)
+        return True
+
+    def delay(self, segments: float = ROUND_SEGMENTS // 2) -> bool:
+        """Current combatant holds its action and acts again after `segments`"""
+        actor = self.current_combatant()
+        if actor is None:
+            return False
+        self.log.append(f"{actor.name} delays.")
+        self._end_turn(actor, segments)
+        return True
+
+    def flee(self) -> bool:
+        """The party tries to break off combat"""
+        actor = self.current_combatant()
+        if actor is None or actor.side != 'party':
+            return False
+        if self.rng.randint(1, 6) >= 3:
+            for combatant in self.side_active('party'):
+                self._remove(combatant, 'fled')
+            self.log.append("The party flees!")
+            self.current = None
+        else:
+            self.log.append(f"{actor.name} fails to get away.")
+            self._end_turn(actor, ROUND_SEGMENTS)
+        return True
+
+    def run_monsters(self) -> None:
+        """Let monsters act until it is a party member's turn or combat ends"""
+        actor = self.current_combatant()
+        while actor is not None and actor.side == 'monster':
+            self.attack()
+            actor = self.current_combatant()
 
     def resolve_attack(self, attacker: Character, defender: Character) -> bool:
         """Resolve an attack using THAC0 system"""
-        attack_roll = random.randint(1, 20)
+        attack_roll = self.rng.randint(1, 20)
         if attack_roll >= attacker.thac0 - defender.armor_class:
             return True
         return False
 
     def calculate_damage(self, attacker: Character, weapon: Dict) -> int:
         """Calculate damage based on weapon and STR modifier"""
-        str_mod = (attacker.abilities['STR'] - 10) // 2
+        str_mod = (attacker.abilities[STR] - 10) // 2
         damage_dice = weapon['damage_dice']
         num_dice, dice_type = map(int, damage_dice.split('d'))
-        damage = sum(random.randint(1, dice_type) for _ in range(num_dice))
+        damage = sum(self.rng.randint(1, dice_type) for _ in range(num_dice))
         return max(1, damage + str_mod)
 
+    def _remove(self, combatant: Combatant, status: str) -> None:
+        combatant.status = status
+        self.scheduler.remove(combatant.id)
+
+    def drain_log(self) -> List[str]:
+        """Return and clear the messages produced since the last call"""
+        messages, self.log = self.log, []
+        return messages
+
+    def to_dict(self) -> Dict:
+        return {
+            'time': self.time,
+            'round': self.round,
+            'current': self.current,
+            'combatants': [c.to_list() for c in self.combatants.values()],
+            'queue': self.scheduler.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Combat':
+        combat = cls()
+        combat.time = data['time']
+        combat.current = data['current']
+        for entry in data['combatants']:
+            combat.add_combatant(Combatant.from_list(entry))
+        for time, combatant_id in data['queue']:
+            combat.scheduler.schedule(combatant_id, time)
+        return combat
+
 class GameState:
     def __init__(self):
         self.party = []
@@ -0,0 +1,553 @@
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.character import Character
+from backend.dungeon_generator import DungeonGenerator
+from backend.game_engine import Combat, Combatant, ROUND_SEGMENTS
+from backend.game_state import GameState, SAVE_DIR
+from backend.map_view import MapView
+from backend.monster_ai import MonsterAI
+from backend.monsters import monster_name
+from backend.party_generator import PartyGenerator
+from backend.treasure import describe, treasure_engine
+from backend.pathfinding import UNREACHED, distance_map, find_path, find_path_hierarchical, passable_mask
+
+# Monsters within this many tiles of the party leader join a fight
+COMBAT_RADIUS = 5
+
+# Direction name -> (dx, dy)
+DIRECTIONS = {
+    'north': (0, -1),
+    'south': (0, 1),
+    'east': (1, 0),
+    'west': (-1, 0)
+}
+
+# Stairs tile -> change in depth when taken
+STAIRS = {'>': 1, '<': -1}
+
+# Most steps a single travel or explore command takes
+MAX_TRAVEL_STEPS = 200
+
+# Most moves accepted in one batch
+MAX_MOVE_BATCH = 32
+
+# Actions a party member can take on their combat turn
+COMBAT_ACTIONS = ('attack', 'delay', 'flee')
+
+# How far the party sees; matches the radius revealed around the leader
+SIGHT_RADIUS = 5
+
+# Tiles that stop travel when the leader steps on them
+INTERRUPT_TILES = ('$', '^', 'i')
+
+# Messages for special tiles the leader steps on
+TILE_MESSAGES = {
+    '$': "You found treasure!",
+    '<': "You found stairs leading up!",
+    '>': "You found stairs leading down!",
+    '+': "You found a door!",
+    '^': "You found a trap!",
+    'i': "You found an item!"
+}
+
+def _direction(start: tuple, end: tuple) -> str:
+    """Name of the single step from start to the adjacent end"""
+    step = (end[0] - start[0], end[1] - start[1])
+    return next(name for name, delta in DIRECTIONS.items() if delta == step)
+
+class GameSession:
+    """One game: dungeon, party, monsters and combat, playable from Python.
+
+    The Flask routes are thin wrappers around a module-level session; the
+    simulation harness creates as many sessions as it likes. Methods return
+    plain dicts and raise ValueError for requests the game cannot honor.
+    """
+
+    def __init__(self, width: int = 80, height: int = 48, seed: Optional[int] = None, save_dir: str = SAVE_DIR):
+        # The session's own random sources, so a seed makes its games repeatable
+        # without touching the process-wide generators
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.RandomState(None if seed is None else seed % 2**32)
+        self.game_state = GameState(save_dir)
+        self.dungeon_generator = DungeonGenerator(width, height, self.rng, self.np_rng)
+        self.party_generator = PartyGenerator(random.Random(seed) if seed is not None else None)
+        self.monster_ai = MonsterAI(self.rng, self.np_rng)
+        self.map_view = MapView(self.dungeon_generator.CLASS_COLORS)
+
+    def new_game(self) -> None:
+        """Reset the game and generate a fresh dungeon"""
+        game_state = self.game_state
+        game_state.party = []
+        game_state.current_level = 1
+        game_state.in_combat = False
+        game_state.combat = None
+        game_state.dirty_tiles.clear()
+        game_state.levels.clear()
+
+        # Generate new dungeon
+        game_state.dungeon = self.dungeon_generator.generate()
+        game_state.touch()
+
+    def generate_party(self, size: int = 4, with_spells: bool = True) -> List[Character]:
+        """Replace the party with random characters and place them in the dungeon"""
+        self.game_state.party = []
+        for character in self.party_generator.generate_party(size, with_spells):
+            self.game_state.add_character(character)
+
+        # Generate a new dungeon if one doesn't exist
+        if not self.game_state.dungeon:
+            self.game_state.dungeon = self.dungeon_generator.generate()
+
+        # Place party members in the dungeon
+        if not self.dungeon_generator.place_party(self.game_state.party):
+            raise ValueError('Failed to place party in dungeon')
+        leader = self.game_state.party[0].position
+        self._mark_changed(self.dungeon_generator.reveal_area(leader['x'], leader['y']))
+        return self.game_state.party
+
+    def move(self, direction: str) -> Dict:
+        """Move the party one step; the rest of the party follows the leader"""
+        game_state = self.game_state
+        dungeon_generator = self.dungeon_generator
+        if game_state.combat is not None:
+            raise ValueError('In combat')
+        if not game_state.party:
+            raise ValueError('No party members')
+
+        if direction not in DIRECTIONS:
+            raise ValueError(f'Unknown direction: {direction}')
+
+        # Calculate new position for leader
+        leader = game_state.party[0]
+        dx, dy = DIRECTIONS[direction]
+        new_x, new_y = leader.position['x'] + dx, leader.position['y'] + dy
+
+        # Check if new position is valid
+        if not dungeon_generator.is_valid_position(new_x, new_y):
+            return {'success': False, 'message': 'Cannot move there'}
+
+        # Store previous positions for following characters
+        previous_positions = []
+
+        # Move each character in sequence
+        for i, character in enumerate(game_state.party):
+            if i == 0:
+                # Move leader to new position
+                character.position['x'] = new_x
+                character.position['y'] = new_y
+                previous_positions.append((new_x, new_y))
+            else:
+                # For following characters, find path to previous character's old position
+                target_x, target_y = previous_positions[-1]
+
+                # Find path using A* pathfinding
+                path = find_path(
+                    (character.position['x'], character.position['y']),
+                    (target_x, target_y),
+                    game_state.dungeon,
+                    dungeon_generator.width,
+                    dungeon_generator.height,
+                    dungeon_generator.connectivity
+                )
+
+                if path and len(path) > 1:
+                    # Move to next position in path
+                    next_x, next_y = path[1]  # path[0] is current position
+                    character.position['x'] = next_x
+                    character.position['y'] = next_y
+                    previous_positions.append((next_x, next_y))
+                else:
+                    # If no path found, stay in place
+                    previous_positions.append((character.position['x'], character.position['y']))
+
+        # Reveal area around party leader
+        game_state.touch()
+        self._mark_changed(dungeon_generator.reveal_area(new_x, new_y))
+
+        # Check for special tiles at leader's position
+        tile = game_state.dungeon[new_y][new_x]
+        encounter = bool(tile.get('monster_data'))
+        treasure = None
+        if encounter:
+            message = f"You encounter a {monster_name(tile['monster_data'])}!"
+        elif tile['char'] == '$' and 'treasure' in tile:
+            treasure = tile['treasure']
+            self._collect_treasure(leader, treasure)
+            self._clear_tile(new_x, new_y)
+            message = f"You found treasure: {describe(treasure)}!"
+        else:
+            message = TILE_MESSAGES.get(tile['char'])
+
+        # Monster turn: every awake monster reacts to the party's new position
+        for monster_move in self.monster_ai.tick(game_state.dungeon, self.party_positions()):
+            self._mark_changed((monster_move['from'], monster_move['to']), replaced=True)
+        if not encounter:
+            for dx, dy in DIRECTIONS.values():
+                if dungeon_generator.is_valid_position(new_x + dx, new_y + dy):
+                    neighbor = game_state.dungeon[new_y + dy][new_x + dx]
+                    if neighbor.get('monster_data'):
+                        message = f"A {monster_name(neighbor['monster_data'])} closes in!"
+                        encounter = True
+                        break
+
+        result = {'success': True, 'message': message, 'encounter': encounter}
+        if treasure is not None:
+            result['treasure'] = treasure
+        return result
+
+    def _collect_treasure(self, character: Character, hoard: Dict) -> None:
+        """Give a hoard to a party member: coins to their purse, the rest to their inventory"""
+        coins = hoard['coins']
+        # 2 ep and 1/5 pp are worth a gold piece; an odd electrum piece is 10 sp
+        character.copper += coins.get('cp', 0)
+        character.silver += coins.get('sp', 0) + coins.get('ep', 0) % 2 * 10
+        character.gold += coins.get('gp', 0) + coins.get('ep', 0) // 2 + coins.get('pp', 0) * 5
+        for name in ('gems', 'jewelry'):
+            if hoard[name]['count']:
+                character.inventory.append({'name': name.capitalize(), 'type': name, **hoard[name]})
+        engine = treasure_engine()
+        for name in hoard['items']:
+            item = engine.item(name)
+            if item is not None:
+                character.inventory.append(dict(item))
+
+    def _clear_tile(self, x: int, y: int) -> None:
+        """Turn a tile into bare floor, keeping whether it has been seen"""
+        dungeon = self.game_state.dungeon
+        floor = self.dungeon_generator.TILES['floor'].copy()
+        floor['visible'] = dungeon[y][x]['visible']
+        dungeon[y][x] = floor
+        self._mark_changed(((x, y),), replaced=True)
+
+    def move_batch(self, directions: List[str]) -> Dict:
+        """Make several moves in order, stopping at the first one that fails or meets a monster"""
+        if not directions:
+            raise ValueError('No directions')
+        if len(directions) > MAX_MOVE_BATCH:
+            raise ValueError(f'At most {MAX_MOVE_BATCH} moves per batch')
+        unknown = [direction for direction in directions if direction not in DIRECTIONS]
+        if unknown:
+            raise ValueError(f'Unknown direction: {unknown[0]}')
+
+        steps = []
+        for direction in directions:
+            result = self.move(direction)
+            result.setdefault('encounter', False)
+            steps.append(dict(result, direction=direction))
+            if not result['success'] or result['encounter']:
+                break
+        return {
+            'success': any(step['success'] for step in steps),
+            'message': steps[-1]['message'],
+            'encounter': steps[-1]['encounter'],
+            'steps': steps
+        }
+
+    def travel(self, x: int, y: int, max_steps: int = MAX_TRAVEL_STEPS) -> Dict:
+        """Walk the party toward (x, y), one move at a time, until it arrives or something interrupts"""
+        game_state = self.game_state
+        dungeon_generator = self.dungeon_generator
+        self._check_can_walk()
+        if not dungeon_generator.is_valid_position(x, y):
+            raise ValueError('Invalid destination')
+
+        leader = game_state.party[0].position
+        start = (leader['x'], leader['y'])
+        if game_state.dungeon is dungeon_generator.dungeon:
+            path = find_path_hierarchical(start, (x, y), game_state.dungeon, dungeon_generator.width,
+                                          dungeon_generator.height, dungeon_generator.path_graph,
+                                          dungeon_generator.connectivity)
+        else:
+            path = find_path(start, (x, y), game_state.dungeon, dungeon_generator.width, dungeon_generator.height)
+        if not path:
+            return {'success': False, 'message': 'No path there', 'steps': 0, 'stopped': 'blocked',
+                    'encounter': False}
+        if len(path) == 1:
+            return {'success': True, 'message': None, 'steps': 0, 'stopped': 'arrived', 'encounter': False}
+
+        directions = iter([_direction(a, b) for a, b in zip(path, path[1:])])
+        return self._walk(lambda position: next(directions, None), max_steps, 'arrived')
+
+    def explore(self, max_steps: int = MAX_TRAVEL_STEPS) -> Dict:
+        """Walk the party toward the nearest unexplored area until everything reachable is seen or something interrupts"""
+        self._check_can_walk()
+        distances = None
+
+        def next_step(position):
+            nonlocal distances
+            x, y = position
+            if distances is None or distances[y, x] in (0, UNREACHED):
+                distances = self._frontier_distances()
+            if distances[y, x] in (0, UNREACHED):
+                return None
+            return self._downhill(distances, x, y)
+
+        return self._walk(next_step, max_steps, 'explored')
+
+    def _check_can_walk(self) -> None:
+        if self.game_state.combat is not None:
+            raise ValueError('Cannot travel during combat')
+        if not self.game_state.party:
+            raise ValueError('No party members')
+
+    def _walk(self, next_step, max_steps: int, done: str) -> Dict:
+        """Make moves chosen by next_step(leader position) until it returns None or the walk is interrupted"""
+        game_state = self.game_state
+        leader = game_state.party[0].position
+        in_sight = self._monsters_in_sight()
+        result = {'success': True, 'message': None, 'encounter': False}
+        stopped = 'limit'
+        steps = 0
+        while steps < max_steps:
+            direction = next_step((leader['x'], leader['y']))
+            if direction is None:
+                stopped = done
+                break
+            result = self.move(direction)
+            if not result['success']:
+                stopped = 'blocked'
+                break
+            steps += 1
+            if result['encounter']:
+                stopped = 'encounter'
+                break
+            if 'treasure' in result or game_state.dungeon[leader['y']][leader['x']]['char'] in INTERRUPT_TILES:
+                stopped = 'interrupted'
+                break
+            # Monsters move, so sightings are compared by kind rather than position
+            seen = self._monsters_in_sight()
+            new = seen - in_sight
+            in_sight = seen
+            if new:
+                result['message'] = f"You spot a {min(new)}!"
+                stopped = 'interrupted'
+                break
+
+        if stopped == 'explored' and not result['message'] and not steps:
+            result['message'] = 'Nothing left to explore'
+        return {
+            'success': steps > 0 or stopped in ('arrived', 'explored'),
+            'message': result['message'],
+            'encounter': result['encounter'],
+            'steps': steps,
+            'stopped': stopped
+        }
+
+    def _monsters_in_sight(self) -> Counter:
+        """Names of the visible monsters within sight of the party leader, counted"""
+        leader = self.game_state.party[0].position
+        dungeon = self.game_state.dungeon
+        seen = Counter()
+        for y in range(max(0, leader['y'] - SIGHT_RADIUS), min(len(dungeon), leader['y'] + SIGHT_RADIUS + 1)):
+            row = dungeon[y]
+            for x in range(max(0, leader['x'] - SIGHT_RADIUS), min(len(row), leader['x'] + SIGHT_RADIUS + 1)):
+                if row[x]['visible'] and row[x].get('monster_data'):
+                    seen[monster_name(row[x]['monster_data'])] += 1
+        return seen
+
+    def _frontier_distances(self) -> np.ndarray:
+        """Distances through explored, walkable tiles to the nearest one bordering unexplored tiles"""
+        dungeon = self.game_state.dungeon
+        visible = np.array([[cell['visible'] for cell in row] for row in dungeon], dtype=bool)
+        known = visible & passable_mask(dungeon)
+        hidden = np.pad(~visible, 1)
+        frontier = known & (hidden[:-2, 1:-1] | hidden[2:, 1:-1] | hidden[1:-1, :-2] | hidden[1:-1, 2:])
+        ys, xs = np.nonzero(frontier)
+        return distance_map(known, list(zip(xs.tolist(), ys.tolist())))
+
+    def _downhill(self, distances: np.ndarray, x: int, y: int) -> Optional[str]:
+        """Direction of a neighbor closer to the distance map's sources"""
+        for direction, (dx, dy) in DIRECTIONS.items():
+            nx, ny = x + dx, y + dy
+            if (0 <= ny < distances.shape[0] and 0 <= nx < distances.shape[1] and
+                    distances[ny, nx] < distances[y, x] and
+                    not self.game_state.dungeon[ny][nx].get('monster_data')):
+                return direction
+        return None
+
+    def party_positions(self) -> List[tuple]:
+        return [(c.position['x'], c.position['y']) for c in self.game_state.party]
+
+    def _mark_changed(self, positions, replaced: bool = False) -> None:
+        """Record changed cells for client deltas and the cached map view.
+
+        replaced means the tiles themselves changed (not just their
+        visibility), so the generator's indexes need refreshing too.
+        """
+        positions = list(positions)
+        self.game_state.mark_dirty(positions)
+        self.map_view.invalidate(positions)
+        if replaced and self.game_state.dungeon is self.dungeon_generator.dungeon:
+            for x, y in positions:
+                self.dungeon_generator.tile_changed(x, y)
+
+    def view(self, x: int = 0, y: int = 0, width: Optional[int] = None, height: Optional[int] = None) -> Dict:
+        """Prerendered text rows and color runs of the map, optionally cropped to a viewport"""
+        return self.map_view.render(self.game_state.dungeon, self.game_state.party, x, y, width, height)
+
+    def take_tile_changes(self) -> List[Dict]:
+        """Tiles changed since the last call, each with its x and y, for incremental redraws"""
+        dungeon = self.game_state.dungeon
+        return [dict(dungeon[y][x], x=x, y=y) for x, y in self.game_state.take_dirty()]
+
+    def start_combat(self) -> Dict:
+        """Start combat between the party and the monsters near the leader"""
+        game_state = self.game_state
+        if game_state.combat is not None:
+            raise ValueError('Already in combat')
+        if not game_state.party:
+            raise ValueError('No party members')
+
+        leader = game_state.party[0].position
+        combat = Combat(self.rng)
+        for index, character in enumerate(game_state.party):
+            if character.hit_points > 0:
+                combat.add_combatant(Combatant.from_character(len(combat.combatants), index, character))
+
+        width, height = self.dungeon_generator.width, self.dungeon_generator.height
+        for y in range(max(0, leader['y'] - COMBAT_RADIUS), min(height, leader['y'] + COMBAT_RADIUS + 1)):
+            for x in range(max(0, leader['x'] - COMBAT_RADIUS), min(width, leader['x'] + COMBAT_RADIUS + 1)):
+                monster = game_state.dungeon[y][x].get('monster_data')
+                if monster:
+                    combat.add_combatant(Combatant.from_monster(len(combat.combatants), (x, y), monster, self.rng))
+
+        if combat.is_over():
+            raise ValueError('No monsters nearby')
+        combat.roll_initiative()
+        game_state.combat = combat
+        game_state.in_combat = True
+        combat.log.append(f"Combat begins against {len(combat.side_active('monster'))} monster(s)!")
+        return self._finish_combat_step(combat)
+
+    def combat_action(self, action: str, target: Optional[int] = None, segments: int = 5) -> Dict:
+        """Take the current party member's combat action ('attack', 'delay' or 'flee')"""
+        combat = self.game_state.combat
+        if combat is None:
+            raise ValueError('Not in combat')
+        if action not in COMBAT_ACTIONS:
+            raise ValueError(f'Unsupported combat action: {action}')
+        if action == 'delay' and (not isinstance(segments, int) or isinstance(segments, bool)
+                                  or not 1 <= segments <= ROUND_SEGMENTS):
+            raise ValueError(f'Delay segments must be an integer between 1 and {ROUND_SEGMENTS}')
+
+        combat.run_monsters()
+        if action == 'attack':
+            combat.attack(target)
+        elif action == 'delay':
+            combat.delay(segments)
+        else:
+            combat.flee()
+        return self._finish_combat_step(combat)
+
+    def _finish_combat_step(self, combat: Combat) -> Dict:
+        # Monsters act until it is a party member's turn again
+        combat.run_monsters()
+        ended = combat.is_over()
+        self._apply_combat_results(combat)
+        self.game_state.touch()
+        messages = combat.drain_log()
+        if ended:
+            self.game_state.in_combat = False
+            self.game_state.combat = None
+
+        current = combat.current_combatant()
+        return {
+            'messages': messages,
+            'combatEnded': ended,
+            'currentTurn': current.name if current else None,
+            'combat': combat.to_dict()
+        }
+
+    def _apply_combat_results(self, combat: Combat) -> None:
+        """Copy hit points back to the party and clear slain or fled monsters from the map"""
+        game_state = self.game_state
+        experience = 0
+        for combatant in combat.combatants.values():
+            if combatant.side == 'party':
+                game_state.party[combatant.ref].hit_points = max(0, combatant.hp)
+            elif combatant.active:
+                # Survivors keep their wounds for the next fight
+                x, y = combatant.ref
+                monster = game_state.dungeon[y][x].get('monster_data')
+                if monster:
+                    monster['hp'] = max(1, combatant.hp)
+            else:
+                x, y = combatant.ref
+                if game_state.dungeon[y][x].get('monster_data'):
+                    self._clear_tile(x, y)
+                if combatant.status == 'dead':
+                    experience += combatant.xp
+
+        survivors = combat.side_active('party')
+        if combat.is_over() and survivors and experience:
+            share = experience // len(survivors)
+            for combatant in survivors:
+                game_state.party[combatant.ref].experience += share
+            combat.log.append(f"Each survivor gains {share} experience.")
+
+    def use_stairs(self) -> Dict:
+        """Take the stairs under the party leader to the level above or below.
+
+        The level being left is kept in the game's level store; a level
+        visited before is restored from it instead of being regenerated.
+        """
+        game_state = self.game_state
+        if game_state.combat is not None:
+            raise ValueError('Cannot use stairs during combat')
+        if not game_state.party:
+            raise ValueError('No party members')
+
+        leader = game_state.party[0].position
+        step = STAIRS.get(game_state.dungeon[leader['y']][leader['x']]['char'])
+        if step is None:
+            raise ValueError('There are no stairs here')
+        depth = game_state.current_level + step
+        if depth < 1:
+            raise ValueError('These stairs lead out of the dungeon')
+
+        game_state.levels.store(game_state.current_level, game_state.dungeon)
+        dungeon = game_state.levels.fetch(depth)
+        restored = dungeon is not None
+        if restored:
+            self.dungeon_generator.set_dungeon(dungeon)
+        else:
+            dungeon = self.dungeon_generator.generate(depth=depth)
+        game_state.dungeon = dungeon
+        game_state.current_level = depth
+        game_state.dirty_tiles.clear()
+        game_state.touch()
+
+        # Arrive on the matching stairs of the new level
+        x, y = self._find_tile('<' if step > 0 else '>')
+        self.dungeon_generator.place_party_near(game_state.party, x, y)
+        self.dungeon_generator.reveal_area(x, y)
+        return {
+            'success': True,
+            'message': f"You {'descend' if step > 0 else 'climb'} to dungeon level {depth}.",
+            'level': depth,
+            'restored': restored
+        }
+
+    def _find_tile(self, char: str) -> tuple:
+        """Position of the first tile showing char, or of any floor tile"""
+        for y, row in enumerate(self.game_state.dungeon):
+            for x, cell in enumerate(row):
+                if cell['char'] == char:
+                    return x, y
+        return self.dungeon_generator.get_empty_position()
+
+    def save(self, slot_name: str) -> bool:
+        return self.game_state.save_game(slot_name)
+
+    def load(self, slot_name: str) -> bool:
+        """Load a saved game and point the generator at the loaded dungeon"""
+        if not self.game_state.load_game(slot_name):
+            return False
+        self.dungeon_generator.set_dungeon(self.game_state.dungeon)
+        if self.game_state.combat is not None:
+            self.game_state.combat.rng = self.rng
+        return True
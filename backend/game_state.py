@@ -1,22 +1,48 @@
 import json
 import os
-from typing import Dict, List, Optional
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
+from backend.character import Character
+from backend.game_engine import Combat
+from backend.level_store import LevelStore
+from backend import metrics
+
+# Directory save files are written to, relative to the working directory unless absolute
+SAVE_DIR = 'saves'
 
 class GameState:
-    def __init__(self):
-        self.party: List[Dict] = []
+    def __init__(self, save_dir: str = SAVE_DIR):
+        self.save_dir = save_dir
+        self.party: List[Character] = []
         self.current_level: int = 1
         self.dungeon: List[List[str]] = []
+        # Other levels visited this game, by depth
+        self.levels = LevelStore()
         self.in_combat: bool = False
-        self.combat: Optional[Dict] = None
+        self.combat: Optional[Combat] = None
         self.messages: List[str] = []
         self.save_slots: Dict[str, Dict] = {}
+        # Map cells changed since the client last fetched them, as (x, y)
+        self.dirty_tiles: Set[Tuple[int, int]] = set()
+        # Bumped on every change, so clients can tell whether their copy is current;
+        # the epoch tells this state apart from earlier ones (e.g. before a restart)
+        self.version: int = 0
+        self.epoch: str = uuid.uuid4().hex[:8]
+
+    def touch(self) -> None:
+        """Record that the state changed"""
+        self.version += 1
 
-    def add_character(self, character: Dict) -> bool:
+    def etag(self) -> str:
+        """Entity tag of the current state, for HTTP caching"""
+        return f'{self.epoch}-{self.version}'
+
+    def add_character(self, character: Character) -> bool:
         """Add a character to the party"""
         if len(self.party) < 4:
             self.party.append(character)
+            self.touch()
             return True
         return False
 
@@ -24,22 +50,41 @@ class GameState:
         """Remove a character from the party"""
         if 0 <= character_index < len(self.party):
             self.party.pop(character_index)
+            self.touch()
             return True
         return False
 
-    def get_character(self, character_index: int) -> Optional[Dict]:
+    def get_character(self, character_index: int) -> Optional[Character]:
         """Get a character from the party"""
         if 0 <= character_index < len(self.party):
             return self.party[character_index]
         return None
 
     def update_character(self, character_index: int, updates: Dict) -> bool:
-        """Update a character's stats"""
+        """Update a character's stats, given by attribute name"""
         if 0 <= character_index < len(self.party):
-            self.party[character_index].update(updates)
+            character = self.party[character_index]
+            for name, value in updates.items():
+                setattr(character, name, value)
+            self.touch()
             return True
         return False
 
+    def party_json(self) -> List[Dict]:
+        """The party as sent to clients"""
+        return [character.to_json() for character in self.party]
+
+    def mark_dirty(self, positions: Iterable[Tuple[int, int]]) -> None:
+        """Record map cells whose tile changed"""
+        self.dirty_tiles.update(positions)
+        self.touch()
+
+    def take_dirty(self) -> List[Tuple[int, int]]:
+        """Return and forget the cells changed since the last call"""
+        dirty = sorted(self.dirty_tiles, key=lambda p: (p[1], p[0]))
+        self.dirty_tiles.clear()
+        return dirty
+
     def add_message(self, message: str) -> None:
         """Add a message to the game log"""
         timestamp = datetime.now().strftime('%H:%M:%S')
@@ -47,26 +92,30 @@ class GameState:
         # Keep only the last 100 messages
         if len(self.messages) > 100:
             self.messages = self.messages[-100:]
+        self.touch()
 
     def save_game(self, slot_name: str) -> bool:
         """Save the current game state"""
         try:
             save_data = {
-                'party': self.party,
+                'party': [character.to_save() for character in self.party],
                 'current_level': self.current_level,
                 'dungeon': self.dungeon,
+                'levels': self.levels.to_dict(),
                 'in_combat': self.in_combat,
-                'combat': self.combat,
+                'combat': self.combat.to_dict() if self.combat else None,
                 'messages': self.messages,
                 'timestamp': datetime.now().isoformat()
             }
             
             # Create saves directory if it doesn't exist
-            os.makedirs('saves', exist_ok=True)
+            os.makedirs(self.save_dir, exist_ok=True)
             
             # Save to file
-            with open(f'saves/{slot_name}.json', 'w') as f:
-                json.dump(save_data, f, indent=2)
+            data = json.dumps(save_data, indent=2)
+            with open(self._save_path(slot_name), 'w') as f:
+                f.write(data)
+            metrics.inc('save_game_bytes_total', len(data))
             
             # Update save slots
             self.save_slots[slot_name] = {
@@ -79,18 +128,24 @@ class GameState:
             print(f"Error saving game: {e}")
             return False
 
+    def _save_path(self, slot_name: str) -> str:
+        return os.path.join(self.save_dir, f'{slot_name}.json')
+
     def load_game(self, slot_name: str) -> bool:
         """Load a saved game state"""
         try:
-            with open(f'saves/{slot_name}.json', 'r') as f:
+            with open(self._save_path(slot_name), 'r') as f:
                 save_data = json.load(f)
             
-            self.party = save_data['party']
+            self.party = [Character.from_save(character) for character in save_data['party']]
             self.current_level = save_data['current_level']
             self.dungeon = save_data['dungeon']
+            self.levels = LevelStore.from_dict(save_data.get('levels', {}))
             self.in_combat = save_data['in_combat']
-            self.combat = save_data['combat']
+            self.combat = Combat.from_dict(save_data['combat']) if save_data['combat'] else None
             self.messages = save_data['messages']
+            self.dirty_tiles.clear()
+            self.touch()
             
             return True
         except Exception as e:
@@ -101,11 +156,11 @@ class GameState:
         """List all available save slots"""
         self.save_slots = {}
         try:
-            if os.path.exists('saves'):
-                for filename in os.listdir('saves'):
+            if os.path.exists(self.save_dir):
+                for filename in os.listdir(self.save_dir):
                     if filename.endswith('.json'):
                         slot_name = filename[:-5]  # Remove .json extension
-                        with open(f'saves/{filename}', 'r') as f:
+                        with open(os.path.join(self.save_dir, filename), 'r') as f:
                             save_data = json.load(f)
                             self.save_slots[slot_name] = {
                                 'timestamp': save_data['timestamp'],
@@ -119,8 +174,8 @@ class GameState:
     def delete_save(self, slot_name: str) -> bool:
         """Delete a saved game"""
         try:
-            if os.path.exists(f'saves/{slot_name}.json'):
-                os.remove(f'saves/{slot_name}.json')
+            if os.path.exists(self._save_path(slot_name)):
+                os.remove(self._save_path(slot_name))
                 if slot_name in self.save_slots:
                     del self.save_slots[slot_name]
                 return True
@@ -144,22 +199,23 @@ class GameState:
             dungeon_copy.append(row_copy)
 
         return {
-            'party': self.party,
+            'party': self.party_json(),
             'current_level': self.current_level,
             'dungeon': dungeon_copy,
             'in_combat': self.in_combat,
-            'combat': self.combat,
-            'messages': self.messages
+            'combat': self.combat.to_dict() if self.combat else None,
+            'messages': self.messages,
+            'version': self.version
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'GameState':
         """Create game state from dictionary"""
         game_state = cls()
-        game_state.party = data['party']
+        game_state.party = [Character.from_json(character) for character in data['party']]
         game_state.current_level = data['current_level']
         game_state.dungeon = data['dungeon']
         game_state.in_combat = data['in_combat']
-        game_state.combat = data['combat']
+        game_state.combat = Combat.from_dict(data['combat']) if data['combat'] else None
         game_state.messages = data['messages']
         return game_state 
\ No newline at end of file
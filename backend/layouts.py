@@ -0,0 +1,140 @@
+"""Level layout algorithms for the generator pipeline.
+
+Each layout carves floor (1) into a terrain grid of walls (0) and returns
+the rooms it made, in the order the stairs and features should use (the
+first room gets the up stairs, the last the down stairs). All of them run
+in time proportional to the map area.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+from backend.pathfinding import ConnectivityIndex
+
+# Terrain codes, matching the first entries of dungeon_generator.TILE_NAMES
+WALL, FLOOR = 0, 1
+
+class Room:
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.connected = False
+
+    def center(self) -> Tuple[int, int]:
+        return (self.x + self.width // 2, self.y + self.height // 2)
+
+    def intersects(self, other: 'Room', padding: int = 1) -> bool:
+        return (self.x - padding <= other.x + other.width and
+                self.x + self.width + padding >= other.x and
+                self.y - padding <= other.y + other.height and
+                self.y + self.height + padding >= other.y)
+
+def carve_corridor(terrain: np.ndarray, start: Tuple[int, int], end: Tuple[int, int], horizontal_first: bool) -> None:
+    """Carve an L-shaped corridor between two points"""
+    x1, y1 = start
+    x2, y2 = end
+    if horizontal_first:
+        terrain[y1, min(x1, x2):max(x1, x2) + 1] = FLOOR
+        terrain[min(y1, y2):max(y1, y2) + 1, x2] = FLOOR
+    else:
+        terrain[min(y1, y2):max(y1, y2) + 1, x1] = FLOOR
+        terrain[y2, min(x1, x2):max(x1, x2) + 1] = FLOOR
+
+def bsp(terrain: np.ndarray, rng, min_leaf: int = 10) -> List[Room]:
+    """Binary space partitioning: split the map into leaves, put a room in each and join siblings"""
+    height, width = terrain.shape
+    rooms: List[Room] = []
+
+    def split(x, y, w, h):
+        # Returns the room of this subtree that corridors should connect to
+        can_split_x, can_split_y = w >= 2 * min_leaf, h >= 2 * min_leaf
+        if can_split_x or can_split_y:
+            vertical = can_split_x and (not can_split_y or w > h or (w == h and rng.random() < 0.5))
+            if vertical:
+                cut = rng.randint(min_leaf, w - min_leaf)
+                left, right = split(x, y, cut, h), split(x + cut, y, w - cut, h)
+            else:
+                cut = rng.randint(min_leaf, h - min_leaf)
+                left, right = split(x, y, w, cut), split(x, y + cut, w, h - cut)
+            carve_corridor(terrain, left.center(), right.center(), rng.random() < 0.5)
+            return left if rng.random() < 0.5 else right
+
+        room_w = rng.randint(max(3, w // 2), max(3, w - 2))
+        room_h = rng.randint(max(3, h // 2), max(3, h - 2))
+        room = Room(x + rng.randint(1, max(1, w - room_w - 1)), y + rng.randint(1, max(1, h - room_h - 1)),
+                    room_w, room_h)
+        terrain[room.y:room.y + room.height, room.x:room.x + room.width] = FLOOR
+        rooms.append(room)
+        return room
+
+    split(0, 0, width - 1, height - 1)
+    rooms.sort(key=lambda room: room.center())
+    return rooms
+
+def _neighbor_counts(floor: np.ndarray) -> np.ndarray:
+    """Number of floor cells among the 8 neighbors; off-map counts as wall"""
+    padded = np.pad(floor.astype(np.uint8), 1)
+    height, width = floor.shape
+    return sum(padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+               for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy)
+
+def _keep_largest_region(terrain: np.ndarray) -> None:
+    """Wall off every floor region but the largest"""
+    index = ConnectivityIndex([])
+    index.rebuild(None, terrain == FLOOR)
+    labels = index.labels[index.labels >= 0]
+    if len(labels):
+        values, counts = np.unique(labels, return_counts=True)
+        terrain[index.labels != values[counts.argmax()]] = WALL
+
+def sector_rooms(terrain: np.ndarray, sector_width: int = 16, sector_height: int = 12,
+                 min_floor: float = 0.2) -> List[Room]:
+    """Grid sectors with enough floor, left to right, standing in for rooms in open layouts"""
+    height, width = terrain.shape
+    rooms = []
+    for x in range(0, width, sector_width):
+        for y in range(0, height, sector_height):
+            block = terrain[y:y + sector_height, x:x + sector_width]
+            if block.size and (block == FLOOR).mean() >= min_floor:
+                rooms.append(Room(x, y, block.shape[1], block.shape[0]))
+    return rooms
+
+def caves(terrain: np.ndarray, np_rng, fill: float = 0.45, iterations: int = 4) -> List[Room]:
+    """Cellular-automata caves: random fill smoothed by the 4-5 rule, largest cave kept"""
+    height, width = terrain.shape
+    floor = np_rng.random((height, width)) >= fill
+    floor[[0, -1], :] = False
+    floor[:, [0, -1]] = False
+    for _ in range(iterations):
+        walls = 8 - _neighbor_counts(floor)
+        floor = np.where(floor, walls < 5, walls < 4)
+        floor[[0, -1], :] = False
+        floor[:, [0, -1]] = False
+    terrain[floor] = FLOOR
+    _keep_largest_region(terrain)
+    return sector_rooms(terrain)
+
+# Neighbor offsets as (dx, dy)
+_STEPS = ((0, -1), (0, 1), (1, 0), (-1, 0))
+
+def drunkard(terrain: np.ndarray, rng, target: float = 0.35, max_steps_per_cell: int = 4) -> List[Room]:
+    """Drunkard's walk from the middle of the map until enough floor is dug (or the step budget runs out)"""
+    height, width = terrain.shape
+    x, y = width // 2, height // 2
+    wanted = int((width - 2) * (height - 2) * target)
+    # Walk on a flat byte grid; numpy scalar indexing is slow in a loop
+    dug_cells = bytearray(width * height)
+    dug = 0
+    for _ in range(width * height * max_steps_per_cell):
+        if not dug_cells[y * width + x]:
+            dug_cells[y * width + x] = 1
+            dug += 1
+            if dug >= wanted:
+                break
+        dx, dy = _STEPS[rng.randrange(4)]
+        x = min(max(x + dx, 1), width - 2)
+        y = min(max(y + dy, 1), height - 2)
+    terrain[np.frombuffer(bytes(dug_cells), dtype=np.uint8).reshape(height, width) == 1] = FLOOR
+    return sector_rooms(terrain)
@@ -0,0 +1,116 @@
+import base64
+import json
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend import metrics
+
+# Levels other than the current one kept as ready-to-use tile grids
+DEFAULT_LIVE_LEVELS = 2
+
+# Upper bound on the compressed size of all packed levels (bytes)
+DEFAULT_MEMORY_BUDGET = 4 * 1024 * 1024
+
+# Keys every tile has; anything else (monster_data, ...) is packed separately
+_TILE_KEYS = ('char', 'color', 'walkable')
+_CELL_KEYS = frozenset(_TILE_KEYS + ('visible',))
+
+def pack_level(dungeon: List[List[Dict]]) -> bytes:
+    """Compress a level into a palette-indexed tile grid, a visibility bitmap and its entities"""
+    height, width = len(dungeon), len(dungeon[0]) if dungeon else 0
+    palette: Dict[tuple, int] = {}
+    tiles = np.empty((height, width), dtype=np.uint16)
+    visible = np.empty((height, width), dtype=bool)
+    entities = []
+    for y, row in enumerate(dungeon):
+        for x, cell in enumerate(row):
+            key = (cell['char'], cell['color'], cell.get('walkable', True))
+            tiles[y, x] = palette.setdefault(key, len(palette))
+            visible[y, x] = cell['visible']
+            extra = {k: v for k, v in cell.items() if k not in _CELL_KEYS}
+            if extra:
+                entities.append([x, y, extra])
+
+    header = json.dumps({'shape': [height, width], 'palette': list(palette), 'entities': entities}).encode()
+    blob = struct.pack('<I', len(header)) + header + tiles.tobytes() + np.packbits(visible).tobytes()
+    return zlib.compress(blob, 6)
+
+def unpack_level(packed: bytes) -> List[List[Dict]]:
+    """Rebuild the tile grid written by pack_level"""
+    blob = zlib.decompress(packed)
+    header_size = struct.unpack_from('<I', blob)[0]
+    header = json.loads(blob[4:4 + header_size])
+    height, width = header['shape']
+    offset = 4 + header_size
+    tiles = np.frombuffer(blob, dtype=np.uint16, count=height * width, offset=offset).reshape(height, width)
+    visible = np.unpackbits(np.frombuffer(blob, dtype=np.uint8, offset=offset + tiles.nbytes),
+                            count=height * width).reshape(height, width).astype(bool)
+
+    palette = [dict(zip(_TILE_KEYS, entry)) for entry in header['palette']]
+    dungeon = [[dict(palette[index], visible=bool(seen)) for index, seen in zip(tile_row.tolist(), seen_row.tolist())]
+               for tile_row, seen_row in zip(tiles, visible)]
+    for x, y, extra in header['entities']:
+        dungeon[y][x].update(extra)
+    return dungeon
+
+class LevelStore:
+    """Levels the party has left, by depth.
+
+    The most recently left levels stay live; older ones are packed with
+    pack_level. Once the packed levels exceed the memory budget the
+    oldest are dropped and will be regenerated if visited again.
+    """
+
+    def __init__(self, live_levels: int = DEFAULT_LIVE_LEVELS, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        self.live_levels = live_levels
+        self.memory_budget = memory_budget
+        self.live: 'OrderedDict[int, List[List[Dict]]]' = OrderedDict()
+        self.packed: 'OrderedDict[int, bytes]' = OrderedDict()
+
+    def __contains__(self, depth: int) -> bool:
+        return depth in self.live or depth in self.packed
+
+    def clear(self) -> None:
+        self.live.clear()
+        self.packed.clear()
+
+    def packed_bytes(self) -> int:
+        return sum(len(data) for data in self.packed.values())
+
+    def store(self, depth: int, dungeon: List[List[Dict]]) -> None:
+        """Keep a level the party is leaving"""
+        self.packed.pop(depth, None)
+        self.live.pop(depth, None)
+        self.live[depth] = dungeon
+        while len(self.live) > self.live_levels:
+            old_depth, old_dungeon = self.live.popitem(last=False)
+            self.packed[old_depth] = pack_level(old_dungeon)
+        while self.packed and self.packed_bytes() > self.memory_budget:
+            self.packed.popitem(last=False)
+            metrics.inc('levels_evicted_total')
+
+    def fetch(self, depth: int) -> Optional[List[List[Dict]]]:
+        """Take a stored level back out (it becomes the current level), or None if unknown"""
+        if depth in self.live:
+            return self.live.pop(depth)
+        if depth in self.packed:
+            return unpack_level(self.packed.pop(depth))
+        return None
+
+    def to_dict(self) -> Dict[str, str]:
+        """Every stored level packed and base64 encoded, for save files"""
+        levels = {str(depth): base64.b64encode(data).decode('ascii') for depth, data in self.packed.items()}
+        for depth, dungeon in self.live.items():
+            levels[str(depth)] = base64.b64encode(pack_level(dungeon)).decode('ascii')
+        return levels
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> 'LevelStore':
+        store = cls()
+        for depth, encoded in data.items():
+            store.packed[int(depth)] = base64.b64decode(encoded)
+        return store
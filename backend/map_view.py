@@ -0,0 +1,126 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.character import Character
+
+# Color of unexplored cells
+HIDDEN_COLOR = '#000000'
+
+# Party members without a class color
+DEFAULT_PARTY_COLOR = '#ffffff'
+
+def _row_runs(row: List[Dict]) -> Tuple[str, List[List]]:
+    """Render one dungeon row as text plus [color, length] runs"""
+    chars = []
+    runs: List[List] = []
+    for cell in row:
+        if cell['visible']:
+            char, color = cell['char'], cell['color']
+        else:
+            char, color = ' ', HIDDEN_COLOR
+        chars.append(char)
+        if runs and runs[-1][0] == color:
+            runs[-1][1] += 1
+        else:
+            runs.append([color, 1])
+    return ''.join(chars), runs
+
+def _crop_runs(runs: List[List], start: int, end: int) -> List[List]:
+    """The part of a run list covering columns [start, end)"""
+    cropped = []
+    position = 0
+    for color, length in runs:
+        run_start, run_end = max(position, start), min(position + length, end)
+        if run_start < run_end:
+            cropped.append([color, run_end - run_start])
+        position += length
+        if position >= end:
+            break
+    return cropped
+
+def _overlay(text: str, runs: List[List], marks: List[Tuple[int, str, str]]) -> Tuple[str, List[List]]:
+    """Draw single-character marks (x, char, color) over a rendered row"""
+    chars = list(text)
+    colors = [color for color, length in runs for _ in range(length)]
+    for x, char, color in marks:
+        chars[x], colors[x] = char, color
+    merged: List[List] = []
+    for color in colors:
+        if merged and merged[-1][0] == color:
+            merged[-1][1] += 1
+        else:
+            merged.append([color, 1])
+    return ''.join(chars), merged
+
+class MapView:
+    """Cached text rendering of a dungeon level for lightweight clients.
+
+    Each row is kept as a string plus a list of [color, length] runs and is
+    re-rendered only after invalidate() reports one of its cells changed.
+    The party is drawn over the cached rows when the view is served.
+    """
+
+    def __init__(self, class_colors: Optional[Dict[str, str]] = None):
+        self.class_colors = class_colors or {}
+        self._dungeon = None
+        self._rows: List[Optional[str]] = []
+        self._runs: List[Optional[List[List]]] = []
+
+    def reset(self) -> None:
+        """Forget every cached row"""
+        self._dungeon = None
+
+    def invalidate(self, positions: Iterable[Tuple[int, int]]) -> None:
+        """Mark the rows holding these (x, y) cells for re-rendering"""
+        if self._dungeon is None:
+            return
+        for _, y in positions:
+            if 0 <= y < len(self._rows):
+                self._rows[y] = None
+
+    def _sync(self, dungeon: List[List[Dict]]) -> None:
+        if dungeon is not self._dungeon:
+            self._dungeon = dungeon
+            self._rows = [None] * len(dungeon)
+            self._runs = [None] * len(dungeon)
+
+    def row(self, dungeon: List[List[Dict]], y: int) -> Tuple[str, List[List]]:
+        """Cached text and color runs of one row, without the party"""
+        self._sync(dungeon)
+        if self._rows[y] is None:
+            self._rows[y], self._runs[y] = _row_runs(dungeon[y])
+        return self._rows[y], self._runs[y]
+
+    def render(self, dungeon: List[List[Dict]], party: List[Character], x: int = 0, y: int = 0,
+               width: Optional[int] = None, height: Optional[int] = None) -> Dict:
+        """Render the map, or the viewport starting at (x, y), with the party drawn in"""
+        map_height = len(dungeon)
+        map_width = len(dungeon[0]) if dungeon else 0
+        x, y = max(0, min(x, map_width)), max(0, min(y, map_height))
+        right = map_width if width is None else min(map_width, x + max(0, width))
+        bottom = map_height if height is None else min(map_height, y + max(0, height))
+
+        marks: Dict[int, List[Tuple[int, str, str]]] = {}
+        for character in party:
+            px, py = character.position['x'], character.position['y']
+            if x <= px < right and y <= py < bottom:
+                color = self.class_colors.get(character.character_class, DEFAULT_PARTY_COLOR)
+                marks.setdefault(py, []).append((px, '@', color))
+
+        rows, colors = [], []
+        for row_y in range(y, bottom):
+            text, runs = self.row(dungeon, row_y)
+            if row_y in marks:
+                text, runs = _overlay(text, runs, marks[row_y])
+            if x or right < map_width:
+                text, runs = text[x:right], _crop_runs(runs, x, right)
+            rows.append(text)
+            colors.append(runs)
+
+        return {
+            'x': x,
+            'y': y,
+            'width': right - x,
+            'height': bottom - y,
+            'rows': rows,
+            'colors': colors
+        }
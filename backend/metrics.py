@@ -0,0 +1,146 @@
+"""Low-overhead latency histograms and counters, exported in Prometheus text format.
+
+Instrumentation is on unless the ADND_METRICS environment variable is "0".
+When it is off, timer() hands back a shared no-op context manager and
+inc()/observe() return immediately, so instrumented code pays only for a
+flag check.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+ENABLED = os.environ.get('ADND_METRICS', '1') != '0'
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_lock = threading.Lock()
+_histograms: Dict[str, Dict[Tuple, 'Histogram']] = {}
+_counters: Dict[str, Dict[Tuple, float]] = {}
+_help: Dict[str, str] = {}
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class _Timer:
+    __slots__ = ('name', 'labels', 'start')
+
+    def __init__(self, name: str, labels: Tuple):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _observe(self.name, self.labels, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def set_enabled(enabled: bool) -> None:
+    """Turn instrumentation on or off at runtime"""
+    global ENABLED
+    ENABLED = enabled
+
+def describe(name: str, help_text: str) -> None:
+    """Set the HELP line shown for a metric"""
+    _help[name] = help_text
+
+def timer(name: str, **labels):
+    """Context manager that records the elapsed time of its block in a histogram"""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, tuple(sorted(labels.items())))
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record one histogram observation (seconds)"""
+    if ENABLED:
+        _observe(name, tuple(sorted(labels.items())), value)
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    """Add to a counter"""
+    if not ENABLED:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+def _observe(name: str, key: Tuple, value: float) -> None:
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+def reset() -> None:
+    """Drop every recorded value"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+def _format_labels(labels: Tuple, extra: Tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{str(v)}"' for k, v in pairs) + '}'
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+def render_prometheus() -> str:
+    """Render every metric in the Prometheus text exposition format"""
+    lines: List[str] = []
+    with _lock:
+        for name in sorted(_counters):
+            if name in _help:
+                lines.append(f'# HELP {name} {_help[name]}')
+            lines.append(f'# TYPE {name} counter')
+            for labels, value in sorted(_counters[name].items()):
+                lines.append(f'{name}{_format_labels(labels)} {value:g}')
+
+        for name in sorted(_histograms):
+            if name in _help:
+                lines.append(f'# HELP {name} {_help[name]}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, histogram in sorted(_histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels, (("le", _format_bound(bound)),))} {cumulative}')
+                lines.append(f'{name}_bucket{_format_labels(labels, (("le", "+Inf"),))} {histogram.count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+    return '\n'.join(lines) + '\n'
+
+describe('http_request_duration_seconds', 'Latency of Flask routes')
+describe('http_response_bytes_total', 'Bytes sent in response bodies')
+describe('dungeon_generation_phase_seconds', 'Latency of each dungeon generation pass')
+describe('pathfinding_nodes_expanded_total', 'Nodes expanded by A* searches')
+describe('pathfinding_searches_total', 'A* searches run')
+describe('save_game_bytes_total', 'Bytes written to save files')
+describe('levels_evicted_total', 'Packed levels dropped to stay under the level store memory budget')
@@ -0,0 +1,147 @@
+import random
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from backend.adnd_rules import ADnDRules
+from backend.monsters import monster_name, template_of
+from backend.pathfinding import UNREACHED, distance_map, passable_mask
+
+# Monster behaviors
+ASLEEP, CHASE, FLEE, WANDER = 0, 1, 2, 3
+BEHAVIOR_NAMES = ('asleep', 'chase', 'flee', 'wander')
+
+# Monsters this close to the party wake up
+WAKE_RADIUS = 8
+
+# The shared distance map stops here; awake monsters farther away wander
+SIGHT_RADIUS = 16
+
+# Chance that a wandering monster takes a step on a given tick
+WANDER_CHANCE = 0.5
+
+# Neighbor offsets as (dx, dy)
+_STEPS = np.array([[0, -1], [0, 1], [1, 0], [-1, 0]], dtype=np.intp)
+
+class MonsterAI:
+    """Moves every awake monster on a level in one batch per tick.
+
+    Monsters are kept as parallel arrays (position, behavior, morale) and
+    steered by a single distance map from the party, so a tick costs one
+    bounded flood fill plus a few array operations however many monsters
+    there are.
+    """
+
+    def __init__(self, rng=random, np_rng=np.random):
+        self.rng, self.np_rng = rng, np_rng
+        self._dungeon = None
+        self._passable = None
+        self.xs = np.zeros(0, dtype=np.intp)
+        self.ys = np.zeros(0, dtype=np.intp)
+        self.behavior = np.zeros(0, dtype=np.int8)
+        self.morale = np.zeros(0, dtype=np.int16)
+
+    def reset(self) -> None:
+        """Forget the current level; the next tick rescans the dungeon"""
+        self._dungeon = None
+
+    def _scan(self, dungeon: List[List[Dict]]) -> None:
+        """Collect monster positions and the terrain mask for a new level"""
+        monsters = [(x, y, template_of(cell['monster_data']).get('morale', 12),
+                     cell['monster_data'].get('status', BEHAVIOR_NAMES[ASLEEP]))
+                    for y, row in enumerate(dungeon)
+                    for x, cell in enumerate(row)
+                    if cell.get('monster_data')]
+        self._dungeon = dungeon
+        self._passable = passable_mask(dungeon)
+        self.xs = np.array([m[0] for m in monsters], dtype=np.intp)
+        self.ys = np.array([m[1] for m in monsters], dtype=np.intp)
+        # Behavior carries over from the instances, e.g. after a reload or a return to the level
+        self.behavior = np.array([BEHAVIOR_NAMES.index(m[3]) if m[3] in BEHAVIOR_NAMES else ASLEEP
+                                  for m in monsters], dtype=np.int8)
+        self.morale = np.array([m[2] for m in monsters], dtype=np.int16)
+
+    def _sync(self, dungeon: List[List[Dict]]) -> None:
+        """Rescan on a new level and drop monsters that left the map (e.g. slain)"""
+        if dungeon is not self._dungeon:
+            self._scan(dungeon)
+            return
+        present = np.fromiter((bool(dungeon[y][x].get('monster_data')) for x, y in zip(self.xs, self.ys)),
+                              dtype=bool, count=len(self.xs))
+        if not present.all():
+            self.xs, self.ys = self.xs[present], self.ys[present]
+            self.behavior, self.morale = self.behavior[present], self.morale[present]
+
+    def tick(self, dungeon: List[List[Dict]], party_positions: List[Tuple[int, int]]) -> List[Dict]:
+        """Run one monster turn after the party moved; returns the moves made"""
+        self._sync(dungeon)
+        if not len(self.xs) or not party_positions:
+            return []
+
+        distances = distance_map(self._passable, party_positions, SIGHT_RADIUS)
+        here = distances[self.ys, self.xs]
+
+        # Sleeping monsters near the party wake up and check morale once
+        for i in np.flatnonzero((self.behavior == ASLEEP) & (here <= WAKE_RADIUS)):
+            self.behavior[i] = CHASE if ADnDRules.check_morale(int(self.morale[i]), self.rng) else FLEE
+            dungeon[self.ys[i]][self.xs[i]]['monster_data']['status'] = BEHAVIOR_NAMES[self.behavior[i]]
+
+        awake = np.flatnonzero(self.behavior != ASLEEP)
+        if not len(awake):
+            return []
+
+        height, width = self._passable.shape
+        current = here[awake]
+        nx = self.xs[awake, None] + _STEPS[:, 0]
+        ny = self.ys[awake, None] + _STEPS[:, 1]
+        in_bounds = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        nx, ny = np.clip(nx, 0, width - 1), np.clip(ny, 0, height - 1)
+        valid = in_bounds & self._passable[ny, nx]
+        neighbor = distances[ny, nx]
+        rows = np.arange(len(awake))
+
+        # Chase: step to the closest neighbor, never onto the party itself
+        chase_cost = np.where(valid & (neighbor > 0), neighbor, UNREACHED)
+        chase_step = chase_cost.argmin(axis=1)
+        chase_ok = chase_cost[rows, chase_step] < current
+
+        # Flee: step to the farthest reachable neighbor
+        flee_gain = np.where(valid & (neighbor != UNREACHED), neighbor, -1)
+        flee_step = flee_gain.argmax(axis=1)
+        flee_ok = flee_gain[rows, flee_step] > current
+
+        # Wander: random open neighbor, some of the time
+        wander_step = (self.np_rng.random_sample(valid.shape) * valid).argmax(axis=1)
+        wander_ok = valid.any(axis=1) & (self.np_rng.random_sample(len(awake)) < WANDER_CHANCE)
+
+        # Monsters out of sight of the party just wander
+        mode = np.where(current == UNREACHED, WANDER, self.behavior[awake])
+        step = np.select([mode == CHASE, mode == FLEE], [chase_step, flee_step], wander_step)
+        moving = np.select([mode == CHASE, mode == FLEE], [chase_ok, flee_ok], wander_ok)
+
+        party = set(party_positions)
+        moves = []
+        for i in np.flatnonzero(moving):
+            index = awake[i]
+            x, y = int(self.xs[index]), int(self.ys[index])
+            tx, ty = int(nx[i, step[i]]), int(ny[i, step[i]])
+            # Earlier movers may have claimed the target this tick
+            if dungeon[ty][tx]['char'] != '.' or (tx, ty) in party:
+                continue
+            self._move(dungeon, x, y, tx, ty)
+            self.xs[index], self.ys[index] = tx, ty
+            moves.append({
+                'name': monster_name(dungeon[ty][tx]['monster_data']),
+                'from': (x, y),
+                'to': (tx, ty),
+                'behavior': BEHAVIOR_NAMES[mode[i]]
+            })
+
+        return moves
+
+    @staticmethod
+    def _move(dungeon: List[List[Dict]], x: int, y: int, tx: int, ty: int) -> None:
+        """Swap a monster tile with the floor tile it steps onto; visibility stays with the cell"""
+        monster, floor = dungeon[y][x], dungeon[ty][tx]
+        monster['visible'], floor['visible'] = floor['visible'], monster['visible']
+        dungeon[ty][tx], dungeon[y][x] = monster, floor
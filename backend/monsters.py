@@ -0,0 +1,92 @@
+"""Monster templates and the instance records placed on the map.
+
+Templates come from data/monsters.json, are loaded once per process and
+are read-only. A monster on the map is a small instance dict
+{'template': id, 'hp': current hit points, 'status': behavior name}
+stored as its tile's monster_data; where it stands is the tile it is on.
+"""
+import json
+import logging
+import os
+import random
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+from backend.adnd_rules import ADnDRules
+
+MONSTERS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'monsters.json')
+
+logger = logging.getLogger(__name__)
+
+# Glyph color of monsters whose definition has none
+DEFAULT_COLOR = '#ff0000'
+
+# Status of a freshly placed monster; the others are MonsterAI's behavior names
+INITIAL_STATUS = 'asleep'
+
+def template_id(name: str) -> str:
+    """Stable id of a monster definition, from its name ('Zombie, Juju' -> 'zombie-juju')"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+def load_templates(path: str = MONSTERS_PATH) -> Mapping[str, Mapping]:
+    """Read-only monster templates by id, in file order; empty if the file cannot be read"""
+    return _load_templates(path)
+
+@lru_cache(maxsize=None)
+def _load_templates(path: str) -> Mapping[str, Mapping]:
+    try:
+        with open(path, 'r') as f:
+            monsters = json.load(f)['monsters']
+        logger.info("Loaded %d monsters", len(monsters))
+    except Exception as e:
+        logger.error("Error loading %s: %s", path, e)
+        monsters = []
+
+    templates = {}
+    for monster in monsters:
+        monster = dict(monster, id=template_id(monster['name']))
+        monster.setdefault('display_char', monster['name'][0].upper())
+        monster.setdefault('color', DEFAULT_COLOR)
+        templates[monster['id']] = _freeze(monster)
+    return MappingProxyType(templates)
+
+def templates_json(path: str = MONSTERS_PATH) -> Dict[str, Dict]:
+    """The templates as plain JSON-ready dicts, for clients"""
+    return _templates_json(path)
+
+@lru_cache(maxsize=None)
+def _templates_json(path: str) -> Dict[str, Dict]:
+    return {id: _thaw(template) for id, template in load_templates(path).items()}
+
+def spawn(template: Mapping, rng=random) -> Dict:
+    """A new instance of a template with freshly rolled hit points"""
+    return {
+        'template': template['id'],
+        'hp': max(1, ADnDRules.roll_dice(template['hit_dice'], rng)),
+        'status': INITIAL_STATUS
+    }
+
+def template_of(monster: Mapping) -> Mapping:
+    """The template behind an instance; full definitions (older saves) are their own template"""
+    if 'template' in monster:
+        return load_templates()[monster['template']]
+    return monster
+
+def monster_name(monster: Mapping) -> str:
+    return template_of(monster)['name']
@@ -0,0 +1,120 @@
+import random
+from itertools import accumulate, product
+from typing import Dict, List, Set, Tuple
+
+from backend.adnd_rules import ADnDRules
+from backend.character import ABILITIES, Character
+from name_gen import generate_names
+
+# Number of ways to roll each total on 3d6 (out of 216)
+_3D6_COUNTS: Dict[int, int] = {}
+for _dice in product(range(1, 7), repeat=3):
+    _3D6_COUNTS[sum(_dice)] = _3D6_COUNTS.get(sum(_dice), 0) + 1
+
+
+def _final_score_counts(modifier: int) -> Dict[int, int]:
+    """Distribution of an ability score after a racial modifier is applied to 3d6"""
+    counts: Dict[int, int] = {}
+    for roll, count in _3D6_COUNTS.items():
+        score = max(3, min(18, roll + modifier))
+        counts[score] = counts.get(score, 0) + count
+    return counts
+
+
+def _build_acceptance_tables() -> Tuple[Dict, Dict]:
+    """Precompute, for every class and race, how likely 3d6 meets the class
+    requirements and the score distribution of each ability given that it does.
+
+    Abilities are rolled independently, so conditioning each one on its own
+    minimum samples exactly what the old roll-and-retry loop accepted.
+    """
+    acceptance: Dict[str, List[Tuple[str, float]]] = {}
+    samplers: Dict[Tuple[str, str], Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]]] = {}
+
+    for character_class, requirements in ADnDRules.CLASS_REQUIREMENTS.items():
+        acceptance[character_class] = []
+        for race, modifiers in ADnDRules.RACIAL_MODIFIERS.items():
+            if character_class in ADnDRules.RACIAL_CLASS_RESTRICTIONS.get(race, []):
+                continue
+
+            probability = 1.0
+            ability_samplers = {}
+            for ability in ABILITIES:
+                counts = _final_score_counts(modifiers.get(ability, 0))
+                minimum = requirements.get(ability, 3)
+                scores = tuple(score for score in sorted(counts) if score >= minimum)
+                weights = [counts[score] for score in scores]
+                probability *= sum(weights) / 216
+                ability_samplers[ability] = (scores, tuple(accumulate(weights)))
+
+            if probability > 0:
+                acceptance[character_class].append((race, probability))
+                samplers[(character_class, race)] = ability_samplers
+
+    # Drop classes no race can qualify for
+    acceptance = {cls: races for cls, races in acceptance.items() if races}
+    return acceptance, samplers
+
+
+# Races allowed for each class with their probability of meeting the requirements
+CLASS_RACE_ACCEPTANCE, _ABILITY_SAMPLERS = _build_acceptance_tables()
+
+# Cumulative race weights per class for random.choices
+_RACE_CUM_WEIGHTS = {
+    cls: (tuple(race for race, _ in races), tuple(accumulate(p for _, p in races)))
+    for cls, races in CLASS_RACE_ACCEPTANCE.items()
+}
+
+
+class PartyGenerator:
+    """Generates valid random characters by sampling the acceptance tables
+    directly, so each character costs a fixed number of draws."""
+
+    def __init__(self, rng: random.Random = None):
+        self.rng = rng or random.Random()
+        self.classes = list(CLASS_RACE_ACCEPTANCE)
+
+    def roll_character_stats(self, character_class: str = None) -> Tuple[str, str, Dict[str, int]]:
+        """Pick a (class, race, abilities) combination that meets the class requirements"""
+        if character_class is None:
+            character_class = self.rng.choice(self.classes)
+        if character_class not in _RACE_CUM_WEIGHTS:
+            raise ValueError(f"No race can play class: {character_class}")
+
+        # Races are weighted by how often they qualify, matching the old retry loop
+        races, cum_weights = _RACE_CUM_WEIGHTS[character_class]
+        race = self.rng.choices(races, cum_weights=cum_weights)[0]
+
+        ability_samplers = _ABILITY_SAMPLERS[(character_class, race)]
+        abilities = {}
+        for ability in ABILITIES:
+            scores, cum_weights = ability_samplers[ability]
+            abilities[ability] = self.rng.choices(scores, cum_weights=cum_weights)[0]
+
+        return character_class, race, abilities
+
+    def generate_character(self, name: str = None, character_class: str = None,
+                           with_spells: bool = True, used_names: Set[str] = None) -> Character:
+        """Generate a complete level 1 character, named after its race unless a name is given"""
+        character_class, race, abilities = self.roll_character_stats(character_class)
+        if name is None:
+            name = generate_names(race, 1, used_names=used_names, rng=self.rng)[0]
+
+        return Character.create(name, race, character_class, abilities, with_spells, self.rng)
+
+    def generate_party(self, size: int = 4, with_spells: bool = True,
+                       used_names: Set[str] = None) -> List[Character]:
+        """Generate a party of random characters with unique names.
+
+        Pass a used_names set to keep names unique across several parties.
+        """
+        if used_names is None:
+            used_names = set()
+        return [self.generate_character(with_spells=with_spells, used_names=used_names)
+                for _ in range(size)]
+
+    def generate_parties(self, count: int, size: int = 4, with_spells: bool = False,
+                         unique_names: bool = False) -> List[List[Character]]:
+        """Generate many parties at once for simulations and load tests"""
+        used_names = set() if unique_names else None
+        return [self.generate_party(size, with_spells, used_names) for _ in range(count)]
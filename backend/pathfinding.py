@@ -1,6 +1,13 @@
 from typing import List, Tuple, Dict, Set
 import heapq
 
+import numpy as np
+
+from backend import metrics
+
+# Tiles that block movement
+BLOCKING_CHARS = ('#', '~')
+
 class Node:
     def __init__(self, x: int, y: int, g_cost: float = 0, h_cost: float = 0):
         self.x = x
@@ -20,6 +27,10 @@ def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> float:
     """Calculate the Manhattan distance between two points"""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+def is_walkable(cell: Dict) -> bool:
+    """Whether a path may step onto a tile: passable terrain not held by a monster"""
+    return cell['char'] not in BLOCKING_CHARS and not cell.get('monster_data')
+
 def get_neighbors(pos: Tuple[int, int], dungeon: List[List[Dict]], width: int, height: int) -> List[Tuple[int, int]]:
     """Get valid neighboring positions"""
     x, y = pos
@@ -27,13 +38,24 @@ def get_neighbors(pos: Tuple[int, int], dungeon: List[List[Dict]], width: int, h
     for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
         nx, ny = x + dx, y + dy
         if (0 <= nx < width and 0 <= ny < height and 
-            dungeon[ny][nx]['char'] == '.'):
+            is_walkable(dungeon[ny][nx])):
             neighbors.append((nx, ny))
     return neighbors
 
 def find_path(start: Tuple[int, int], end: Tuple[int, int], 
-              dungeon: List[List[Dict]], width: int, height: int) -> List[Tuple[int, int]]:
-    """Find a path using A* algorithm"""
+              dungeon: List[List[Dict]], width: int, height: int,
+              connectivity: 'ConnectivityIndex' = None) -> List[Tuple[int, int]]:
+    """Find a path using A* algorithm.
+
+    With a connectivity index for this dungeon, goals in another component
+    are rejected without searching.
+    """
+    if start == end:
+        return [start]
+    if connectivity is not None and connectivity.dungeon is dungeon and not connectivity.connected(start, end):
+        _record_search(0)
+        return []
+
     start_node = Node(start[0], start[1])
     end_node = Node(end[0], end[1])
     
@@ -41,6 +63,7 @@ def find_path(start: Tuple[int, int], end: Tuple[int, int],
     closed_set: Set[Tuple[int, int]] = set()
     
     heapq.heappush(open_set, start_node)
+    expanded = 0
     
     while open_set:
         current = heapq.heappop(open_set)
@@ -50,9 +73,11 @@ def find_path(start: Tuple[int, int], end: Tuple[int, int],
             while current:
                 path.append((current.x, current.y))
                 current = current.parent
+            _record_search(expanded)
             return path[::-1]
         
         closed_set.add((current.x, current.y))
+        expanded += 1
         
         for neighbor_pos in get_neighbors((current.x, current.y), dungeon, width, height):
             if neighbor_pos in closed_set:
@@ -70,4 +95,346 @@ def find_path(start: Tuple[int, int], end: Tuple[int, int],
             else:
                 heapq.heappush(open_set, neighbor)
     
-    return []  # No path found 
\ No newline at end of file
+    _record_search(expanded)
+    return []  # No path found
+
+def _record_search(expanded: int) -> None:
+    if metrics.ENABLED:
+        metrics.inc('pathfinding_searches_total')
+        metrics.inc('pathfinding_nodes_expanded_total', expanded) 
+
+# Distance value for cells a distance map did not reach
+UNREACHED = np.iinfo(np.int32).max
+
+def passable_mask(dungeon: List[List[Dict]]) -> np.ndarray:
+    """Boolean (height, width) array of tiles that can be walked through"""
+    return np.array([[cell['char'] not in BLOCKING_CHARS for cell in row] for row in dungeon], dtype=bool)
+
+def distance_map(passable: np.ndarray, sources: List[Tuple[int, int]], max_distance: int = None) -> np.ndarray:
+    """Multi-source breadth-first distance map (4-connected) over a passable mask.
+
+    Grows all sources at once with whole-array shifts, so one map can be
+    shared by every entity that needs distances to the same targets. Cells
+    farther than max_distance, or unreachable, hold UNREACHED.
+    """
+    height, width = passable.shape
+    distances = np.full((height, width), UNREACHED, dtype=np.int32)
+    frontier = np.zeros((height, width), dtype=bool)
+    for x, y in sources:
+        if 0 <= x < width and 0 <= y < height:
+            frontier[y, x] = True
+    distances[frontier] = 0
+    visited = frontier.copy()
+    
+    limit = max_distance if max_distance is not None else height * width
+    for distance in range(1, limit + 1):
+        grown = np.zeros_like(frontier)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & passable & ~visited
+        if not frontier.any():
+            break
+        distances[frontier] = distance
+        visited |= frontier
+    
+    return distances
+
+class ConnectivityIndex:
+    """Connected components of passable terrain, for constant-time reachability checks.
+
+    Components are labelled by union-find over horizontal runs of passable
+    cells, so a rebuild costs one pass per run rather than per cell.
+    Opening a tile merges the labels around it in place; blocking a tile
+    rebuilds the index, since union-find cannot split components. Monsters
+    and the party are not terrain, so moving them never touches the index.
+    """
+
+    def __init__(self, dungeon: List[List[Dict]]):
+        self.rebuild(dungeon)
+
+    def rebuild(self, dungeon: List[List[Dict]], passable: np.ndarray = None) -> None:
+        """Recompute every component of the level (passable may be given to skip recomputing the mask)"""
+        self.dungeon = dungeon
+        if passable is None:
+            passable = passable_mask(dungeon) if dungeon else np.zeros((0, 0), dtype=bool)
+        self.passable = passable.copy()
+        self.height, self.width = passable.shape
+
+        # Number the horizontal runs of passable cells
+        starts = passable.copy()
+        starts[:, 1:] &= ~passable[:, :-1]
+        runs = np.cumsum(starts.ravel()).reshape(passable.shape) - 1
+        parent = list(range(int(starts.sum())))
+
+        def find(run):
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        # Union runs that touch vertically
+        touching = passable[1:, :] & passable[:-1, :]
+        pairs = np.unique(np.stack([runs[1:, :][touching], runs[:-1, :][touching]], axis=1), axis=0)
+        for a, b in pairs.tolist():
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_a] = root_b
+
+        roots = np.array([find(run) for run in range(len(parent))], dtype=np.int32)
+        self.labels = np.where(passable, roots[runs] if len(roots) else -1, -1).astype(np.int32)
+        self._next_label = len(parent)
+
+    def component(self, x: int, y: int) -> int:
+        """Component id of a tile, or -1 for blocked and out-of-bounds tiles"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        return int(self.labels[y, x])
+
+    def connected(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        """Whether a walk from a can reach b; a may itself be blocked (e.g. the party wading)"""
+        target = self.component(*b)
+        if target < 0:
+            return False
+        if self.component(*a) == target:
+            return True
+        x, y = a
+        return any(self.component(x + dx, y + dy) == target for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)))
+
+    def update(self, x: int, y: int) -> None:
+        """Refresh the index after the tile at (x, y) changed"""
+        passable = self.dungeon[y][x]['char'] not in BLOCKING_CHARS
+        if passable == self.passable[y, x]:
+            return
+        if not passable:
+            self.rebuild(self.dungeon)
+            return
+        self.passable[y, x] = True
+        around = {self.component(x + dx, y + dy) for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0))} - {-1}
+        if not around:
+            self.labels[y, x] = self._next_label
+            self._next_label += 1
+            return
+        label = min(around)
+        if len(around) > 1:
+            self.labels[np.isin(self.labels, list(around))] = label
+        self.labels[y, x] = label
+
+# Side length of the square clusters of a PathGraph
+CLUSTER_SIZE = 10
+
+# Border openings at least this long get an entrance at each end instead of one in the middle
+WIDE_ENTRANCE = 6
+
+class PathGraph:
+    """Abstract graph for hierarchical pathfinding (HPA*).
+
+    The level is cut into CLUSTER_SIZE squares. Each open stretch of a
+    border between two clusters becomes an entrance: a pair of facing
+    cells joined by a step. Entrances of one cluster are joined by their
+    walking distance inside it, found lazily the first time a search
+    reaches the cluster. Searches plan over entrances and then refine each
+    hop inside its cluster, so a long query touches a few hundred cells
+    instead of most of the map. Paths follow terrain only; monsters are
+    not terrain, so callers check occupancy as they walk.
+    """
+
+    def __init__(self, dungeon: List[List[Dict]], passable: np.ndarray = None):
+        self.rebuild(dungeon, passable)
+
+    def rebuild(self, dungeon: List[List[Dict]], passable: np.ndarray = None) -> None:
+        self.dungeon = dungeon
+        if passable is None:
+            passable = passable_mask(dungeon) if dungeon else np.zeros((0, 0), dtype=bool)
+        self.passable = passable.copy()
+        self.height, self.width = passable.shape
+        self._open = passable.tolist()
+        self.columns = -(-self.width // CLUSTER_SIZE)
+        self.rows = -(-self.height // CLUSTER_SIZE)
+        # (cluster, neighbor cluster) -> [(cell in cluster, cell in neighbor)], both directions
+        self.entrances: Dict[Tuple, List[Tuple[Tuple[int, int], Tuple[int, int]]]] = {}
+        # Entrance cells in each cluster
+        self.nodes: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        # Cluster -> {entrance cell: {cell: distance to that entrance}}, filled lazily
+        self._distances: Dict[Tuple[int, int], Dict] = {}
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                self.nodes[(cx, cy)] = set()
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                if cx + 1 < self.columns:
+                    self._find_entrances((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.rows:
+                    self._find_entrances((cx, cy), (cx, cy + 1))
+
+    def cluster_of(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // CLUSTER_SIZE, y // CLUSTER_SIZE)
+
+    def _bounds(self, cluster: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        x0, y0 = cluster[0] * CLUSTER_SIZE, cluster[1] * CLUSTER_SIZE
+        return x0, y0, min(self.width, x0 + CLUSTER_SIZE), min(self.height, y0 + CLUSTER_SIZE)
+
+    def _find_entrances(self, a: Tuple[int, int], b: Tuple[int, int]) -> None:
+        """Entrances across the border between a and the cluster b to its right or below"""
+        ax0, ay0, ax1, ay1 = self._bounds(a)
+        if b[0] > a[0]:
+            # Vertical border: column ax1 - 1 faces column ax1
+            open_both = self.passable[ay0:ay1, ax1 - 1] & self.passable[ay0:ay1, ax1]
+            pair = lambda i: ((ax1 - 1, ay0 + i), (ax1, ay0 + i))
+        else:
+            open_both = self.passable[ay1 - 1, ax0:ax1] & self.passable[ay1, ax0:ax1]
+            pair = lambda i: ((ax0 + i, ay1 - 1), (ax0 + i, ay1))
+
+        pairs = []
+        start = None
+        for i, is_open in enumerate(open_both.tolist() + [False]):
+            if is_open and start is None:
+                start = i
+            elif not is_open and start is not None:
+                length = i - start
+                if length >= WIDE_ENTRANCE:
+                    pairs += [pair(start), pair(i - 1)]
+                else:
+                    pairs.append(pair(start + length // 2))
+                start = None
+
+        self.entrances[(a, b)] = pairs
+        self.entrances[(b, a)] = [(cell_b, cell_a) for cell_a, cell_b in pairs]
+        for cell_a, cell_b in pairs:
+            self.nodes[a].add(cell_a)
+            self.nodes[b].add(cell_b)
+
+    def _flood(self, cluster: Tuple[int, int], source: Tuple[int, int]) -> Dict[Tuple[int, int], int]:
+        """Walking distance from source to every cell of the cluster it can reach without leaving it"""
+        x0, y0, x1, y1 = self._bounds(cluster)
+        distances = {source: 0}
+        frontier = [source]
+        distance = 0
+        while frontier:
+            distance += 1
+            grown = []
+            for x, y in frontier:
+                for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if (x0 <= nx < x1 and y0 <= ny < y1 and self._open[ny][nx]
+                            and (nx, ny) not in distances):
+                        distances[(nx, ny)] = distance
+                        grown.append((nx, ny))
+            frontier = grown
+        return distances
+
+    def _cluster_distances(self, cluster: Tuple[int, int]) -> Dict:
+        maps = self._distances.get(cluster)
+        if maps is None:
+            maps = self._distances[cluster] = {node: self._flood(cluster, node) for node in self.nodes[cluster]}
+        return maps
+
+    def _neighbors(self, cell: Tuple[int, int]):
+        """Abstract graph edges of an entrance cell as (cell, cost)"""
+        cluster = self.cluster_of(*cell)
+        maps = self._cluster_distances(cluster)
+        for node, flood in maps.items():
+            if node != cell and cell in flood:
+                yield node, flood[cell]
+        x, y = cell
+        for other in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            neighbor_cluster = self.cluster_of(*other)
+            if neighbor_cluster != cluster and other in self.nodes.get(neighbor_cluster, ()):
+                if (cell, other) in self.entrances.get((cluster, neighbor_cluster), ()):
+                    yield other, 1
+
+    def update(self, x: int, y: int) -> None:
+        """Refresh the entrances and distances around a tile whose passability may have changed"""
+        passable = self.dungeon[y][x]['char'] not in BLOCKING_CHARS
+        if passable == self.passable[y, x]:
+            return
+        self.passable[y, x] = passable
+        self._open[y][x] = passable
+        cluster = self.cluster_of(x, y)
+        cx, cy = cluster
+        touched = [cluster] + [neighbor for neighbor in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1))
+                               if neighbor in self.nodes]
+        for neighbor in touched[1:]:
+            self._find_entrances(min(cluster, neighbor), max(cluster, neighbor))
+        # Entrance cells of the touched clusters, gathered again from all their borders
+        for touched_cluster in touched:
+            tx, ty = touched_cluster
+            self.nodes[touched_cluster] = {cell for other in ((tx + 1, ty), (tx - 1, ty), (tx, ty + 1), (tx, ty - 1))
+                                           for cell, _ in self.entrances.get((touched_cluster, other), ())}
+            self._distances.pop(touched_cluster, None)
+
+def find_path_hierarchical(start: Tuple[int, int], end: Tuple[int, int],
+                           dungeon: List[List[Dict]], width: int, height: int,
+                           graph: PathGraph, connectivity: ConnectivityIndex = None) -> List[Tuple[int, int]]:
+    """Find a long path by planning over a PathGraph and refining each hop inside its cluster.
+
+    Nearby goals, and a graph built for another dungeon, fall back to find_path.
+    """
+    if (graph is None or graph.dungeon is not dungeon or
+            heuristic(start, end) <= 2 * CLUSTER_SIZE or graph.cluster_of(*start) == graph.cluster_of(*end)):
+        return find_path(start, end, dungeon, width, height, connectivity)
+    if connectivity is not None and connectivity.dungeon is dungeon and not connectivity.connected(start, end):
+        _record_search(0)
+        return []
+
+    start_cluster, end_cluster = graph.cluster_of(*start), graph.cluster_of(*end)
+    from_start = graph._flood(start_cluster, start)
+    to_end = graph._flood(end_cluster, end)
+
+    # A* over entrance cells, with start and end wired into their clusters
+    open_set = [(heuristic(start, end), 0, start)]
+    costs = {start: 0}
+    parents = {start: None}
+    expanded = 0
+    found = False
+    while open_set:
+        _, cost, cell = heapq.heappop(open_set)
+        if cell == end:
+            found = True
+            break
+        if cost > costs[cell]:
+            continue
+        expanded += 1
+        if cell == start:
+            edges = [(node, from_start[node]) for node in graph.nodes[start_cluster] if node in from_start]
+            # A start on an entrance also has that entrance's step across the border
+            if start in graph.nodes[start_cluster]:
+                edges.extend(graph._neighbors(start))
+        else:
+            edges = list(graph._neighbors(cell))
+        # Likewise a goal on an entrance is reached by its own step across the border
+        if (graph.cluster_of(*cell) == end_cluster and cell in to_end or
+                end in graph.nodes[end_cluster] and heuristic(cell, end) == 1):
+            edges.append((end, to_end.get(cell, 1)))
+        for neighbor, step in edges:
+            new_cost = cost + step
+            if new_cost < costs.get(neighbor, float('inf')):
+                costs[neighbor] = new_cost
+                parents[neighbor] = cell
+                heapq.heappush(open_set, (new_cost + heuristic(neighbor, end), new_cost, neighbor))
+    _record_search(expanded)
+    if not found:
+        return []
+
+    waypoints = []
+    cell = end
+    while cell is not None:
+        waypoints.append(cell)
+        cell = parents[cell]
+    waypoints.reverse()
+
+    # Refine each hop by walking down the destination's distance field
+    path = [start]
+    for target in waypoints[1:]:
+        current = path[-1]
+        if heuristic(current, target) == 1 and graph.cluster_of(*current) != graph.cluster_of(*target):
+            path.append(target)
+            continue
+        cluster = graph.cluster_of(*target)
+        field = to_end if target == end else graph._cluster_distances(cluster)[target]
+        while current != target:
+            x, y = current
+            current = min(((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)),
+                          key=lambda cell: field.get(cell, UNREACHED))
+            path.append(current)
+    return path
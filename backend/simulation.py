@@ -0,0 +1,127 @@
+"""Headless bot runner for soak tests, balance statistics and profiling.
+
+Plays many GameSessions directly (no Flask, no JSON) across worker
+processes and reports throughput:
+
+    python -m backend.simulation --sessions 1000 --steps 200 --processes 4
+"""
+import argparse
+import multiprocessing
+import random
+import time
+from functools import partial
+from typing import Dict, List
+
+from backend.game_session import DIRECTIONS, GameSession
+
+# Upper bound on party actions in a single fight, so a bot can never hang
+MAX_COMBAT_ACTIONS = 200
+
+# Levels to generate before giving up on placing the party
+MAX_PLACEMENT_ATTEMPTS = 10
+
+STRATEGIES = ('random', 'scripted')
+
+def play_session(seed: int, steps: int = 200, strategy: str = 'random', width: int = 80,
+                 height: int = 48) -> Dict:
+    """Play one session with a bot and return its statistics.
+
+    'random' picks a new direction every step; 'scripted' walks straight
+    until blocked and then turns. Both fight every encounter by attacking.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    stats = {'sessions': 1, 'steps': 0, 'moves': 0, 'blocked': 0, 'fights': 0,
+             'wins': 0, 'wipes': 0, 'combat_actions': 0, 'placement_failures': 0}
+    directions = list(DIRECTIONS)
+    rng = random.Random(seed)
+
+    session = GameSession(width, height, seed=seed)
+    for _ in range(MAX_PLACEMENT_ATTEMPTS):
+        session.new_game()
+        try:
+            session.generate_party(with_spells=False)
+            break
+        except ValueError:
+            stats['placement_failures'] += 1
+    else:
+        return stats
+
+    direction = rng.choice(directions)
+    for _ in range(steps):
+        stats['steps'] += 1
+        if strategy == 'random':
+            direction = rng.choice(directions)
+        result = session.move(direction)
+        if not result['success']:
+            stats['blocked'] += 1
+            direction = rng.choice(directions)
+            continue
+        stats['moves'] += 1
+
+        if result['encounter']:
+            try:
+                result = session.start_combat()
+            except ValueError:
+                continue
+            stats['fights'] += 1
+            for _ in range(MAX_COMBAT_ACTIONS):
+                if result['combatEnded']:
+                    break
+                result = session.combat_action('attack')
+                stats['combat_actions'] += 1
+            else:
+                # Give up on a fight that would not end
+                session.game_state.combat = None
+                session.game_state.in_combat = False
+
+            if not any(c.hit_points > 0 for c in session.game_state.party):
+                stats['wipes'] += 1
+                break
+            if result['combatEnded']:
+                stats['wins'] += 1
+
+    return stats
+
+def run_bots(sessions: int, steps: int = 200, processes: int = 1, strategy: str = 'random',
+             seed: int = 0, width: int = 80, height: int = 48) -> Dict:
+    """Play many sessions, in parallel when processes > 1, and aggregate the results"""
+    seeds: List[int] = [seed + i for i in range(sessions)]
+    play = partial(play_session, steps=steps, strategy=strategy, width=width, height=height)
+
+    start = time.perf_counter()
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            results = list(pool.imap_unordered(play, seeds, chunksize=max(1, sessions // (processes * 4))))
+    else:
+        results = [play(s) for s in seeds]
+    elapsed = time.perf_counter() - start
+
+    totals: Dict = {}
+    for result in results:
+        for key, value in result.items():
+            totals[key] = totals.get(key, 0) + value
+    totals['elapsed'] = elapsed
+    totals['steps_per_second'] = totals.get('steps', 0) / elapsed if elapsed else 0.0
+    return totals
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run headless bot sessions')
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--strategy', choices=STRATEGIES, default='random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=80)
+    parser.add_argument('--height', type=int, default=48)
+    args = parser.parse_args()
+
+    totals = run_bots(args.sessions, args.steps, args.processes, args.strategy,
+                      args.seed, args.width, args.height)
+    print(f"Played {totals['sessions']} sessions, {totals['steps']} steps in {totals['elapsed']:.2f}s")
+    print(f"Steps per second: {totals['steps_per_second']:.0f}")
+    print(f"Fights: {totals['fights']}  Wins: {totals['wins']}  Wipes: {totals['wipes']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""Searchable index of the spell lists in data/*_spells.json.
+
+Spells are indexed by class, level and component, by name prefix (a trie
+over the words of the names) and by word (an inverted index over names
+and descriptions). Only the short fields stay in memory: a description is
+kept as the byte span of its JSON string in the data file and read back
+on request.
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# Spell list files by class, in the order their spells are numbered
+SPELL_FILES = {
+    'cleric': 'cleric_spells.json',
+    'druid': 'druid_spells.json',
+    'illusionist': 'illusionist_spells.json',
+    'magic_user': 'magic_user_spells.json'
+}
+
+# Level keys used in the spell files; LEVEL_KEYS[0] is level 1
+LEVEL_KEYS = ('first_level', 'second_level', 'third_level', 'fourth_level', 'fifth_level',
+              'sixth_level', 'seventh_level', 'eighth_level', 'ninth_level')
+
+# Spells returned by a search unless asked for fewer
+DEFAULT_LIMIT = 50
+
+_WORD = re.compile(r'[a-z0-9]+')
+_DESCRIPTION = re.compile(rb'"description"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+def level_key(level: int) -> str:
+    """Key of a spell level in the spell files (2 -> 'second_level')"""
+    if not 1 <= level <= len(LEVEL_KEYS):
+        raise ValueError(f'Spell level must be between 1 and {len(LEVEL_KEYS)}')
+    return LEVEL_KEYS[level - 1]
+
+def class_key(name: str) -> str:
+    """Spell class key of a class name ('Magic-User' -> 'magic_user')"""
+    return re.sub(r'[^a-z]+', '_', name.lower()).strip('_')
+
+def words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+class Spell:
+    """A spell's short fields; the description is read from its file when asked for"""
+    __slots__ = ('id', 'name', 'spell_class', 'level', 'components', 'range', 'duration',
+                 'area_of_effect', 'casting_time', 'saving_throw', 'path', 'span', '_description')
+
+    def __init__(self, id: int, spell_class: str, level: int, entry: Dict, path: str):
+        self.id = id
+        self.name = entry['name']
+        self.spell_class = spell_class
+        self.level = level
+        self.components = tuple(part.strip() for part in entry.get('components', '').split(',') if part.strip())
+        self.range = entry.get('range')
+        self.duration = entry.get('duration')
+        self.area_of_effect = entry.get('area_of_effect')
+        self.casting_time = entry.get('casting_time')
+        self.saving_throw = entry.get('saving_throw')
+        self.path = path
+        self.span: Optional[Tuple[int, int]] = None
+        self._description: Optional[str] = entry.get('description', '')
+
+    @property
+    def description(self) -> str:
+        if self.span is None:
+            return self._description
+        start, end = self.span
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    def to_json(self, description: bool = True) -> Dict:
+        """The spell as in its data file, plus its class and level"""
+        spell = {
+            'name': self.name,
+            'class': self.spell_class,
+            'level': self.level,
+            'range': self.range,
+            'duration': self.duration,
+            'area_of_effect': self.area_of_effect,
+            'components': ','.join(self.components),
+            'casting_time': self.casting_time,
+            'saving_throw': self.saving_throw
+        }
+        if description:
+            spell['description'] = self.description
+        return spell
+
+class SpellIndex:
+    """Spells from a set of spell files with lookup tables for search"""
+
+    def __init__(self, files: Dict[str, str] = SPELL_FILES, data_dir: str = DATA_DIR):
+        self.spells: List[Spell] = []
+        self.by_class: Dict[str, List[int]] = {}
+        self.by_level: Dict[int, List[int]] = {}
+        self.by_component: Dict[str, List[int]] = {}
+        self.tokens: Dict[str, Tuple[int, ...]] = {}
+        self.trie: Dict = {}
+
+        postings: Dict[str, Set[int]] = {}
+        for spell_class, filename in files.items():
+            path = os.path.join(data_dir, filename)
+            for spell, description in self._load(spell_class, path):
+                self.by_class.setdefault(spell_class, []).append(spell.id)
+                self.by_level.setdefault(spell.level, []).append(spell.id)
+                for component in spell.components:
+                    self.by_component.setdefault(component, []).append(spell.id)
+                name_words = words(spell.name)
+                for token in name_words + words(description):
+                    postings.setdefault(token, set()).add(spell.id)
+                for word in set(name_words):
+                    self._insert(word, spell.id)
+        self.tokens = {token: tuple(sorted(ids)) for token, ids in postings.items()}
+
+    def _load(self, spell_class: str, path: str) -> Iterable[Tuple[Spell, str]]:
+        """The file's spells in order with their descriptions, which are then dropped from memory
+        when each is found at its byte span in the file"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        spans = [match.span(1) for match in _DESCRIPTION.finditer(raw)]
+        entries = []
+        for levels in json.loads(raw).values():
+            for key, spells in levels.items():
+                if key in LEVEL_KEYS:
+                    entries.extend((LEVEL_KEYS.index(key) + 1, entry) for entry in spells)
+        if len(spans) != len(entries):
+            spans = [None] * len(entries)
+
+        for (level, entry), span in zip(entries, spans):
+            spell = Spell(len(self.spells), spell_class, level, entry, path)
+            description = spell._description
+            if span is not None and json.loads(raw[span[0]:span[1]]) == description:
+                spell.span = span
+                spell._description = None
+            self.spells.append(spell)
+            yield spell, description
+
+    def _insert(self, key: str, spell_id: int) -> None:
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault('', []).append(spell_id)
+
+    def _starting_with(self, prefix: str) -> Set[int]:
+        """Ids of spells with a name word starting with prefix"""
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        found: Set[int] = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char:
+                    stack.append(child)
+                else:
+                    found.update(child)
+        return found
+
+    def with_prefix(self, prefix: str) -> Set[int]:
+        """Ids of spells with a run of name words starting with prefix ('magic mi' finds Magic Missile)"""
+        prefix_words = words(prefix)
+        if not prefix_words:
+            return set(range(len(self.spells)))
+        found = self._starting_with(prefix_words[-1])
+        if len(prefix_words) > 1:
+            phrase = ' ' + ' '.join(prefix_words)
+            found = {i for i in found if phrase in ' ' + ' '.join(words(self.spells[i].name))}
+        return found
+
+    def matching(self, text: str) -> Set[int]:
+        """Ids of spells whose name or description holds every word of text"""
+        result: Optional[Set[int]] = None
+        for token in words(text):
+            ids = self.tokens.get(token, ())
+            result = set(ids) if result is None else result.intersection(ids)
+            if not result:
+                return set()
+        return result if result is not None else set(range(len(self.spells)))
+
+    def search(self, text: Optional[str] = None, prefix: Optional[str] = None,
+               spell_class: Optional[str] = None, level: Optional[int] = None,
+               components: Sequence[str] = ()) -> List[Spell]:
+        """Spells meeting every given filter, by class, level and name.
+
+        components lists components every result must need, e.g. ['V', 'S'].
+        """
+        candidates: List[Set[int]] = []
+        if spell_class is not None:
+            candidates.append(set(self.by_class.get(class_key(spell_class), ())))
+        if level is not None:
+            candidates.append(set(self.by_level.get(level, ())))
+        for component in components:
+            candidates.append(set(self.by_component.get(component.strip().upper(), ())))
+        if prefix:
+            candidates.append(self.with_prefix(prefix))
+        if text:
+            candidates.append(self.matching(text))
+        if not candidates:
+            return list(self.spells)
+        candidates.sort(key=len)
+        ids = candidates[0].intersection(*candidates[1:])
+        return [self.spells[i] for i in sorted(ids)]
+
+    def spells_of(self, spell_class: str, level: int) -> List[Spell]:
+        """A class's spells of one level, in file order"""
+        return self.search(spell_class=spell_class, level=level)
+
+@lru_cache(maxsize=None)
+def spell_index() -> SpellIndex:
+    """The index of the game's spell files, built on first use"""
+    return SpellIndex()
@@ -3,6 +3,8 @@ import random
 import os
 from typing import Dict, List
 
+from backend.spell_index import spell_index
+
 def load_spells(spell_file: str) -> Dict:
     """Load spells from a JSON file."""
     # Get the absolute path to the data directory
@@ -12,45 +14,29 @@ def load_spells(spell_file: str) -> Dict:
     with open(spell_path, 'r') as f:
         return json.load(f)
 
-def get_random_spells(spell_file: str, level: int, count: int, spell_type: str = None) -> List[Dict]:
+def get_random_spells(spell_file: str, level: int, count: int, spell_type: str = None, rng=random) -> List[Dict]:
     """Get a random selection of spells of a specific level.
     
     Args:
-        spell_file: Path to the spell JSON file
+        spell_file: Spell JSON file; names the spell list when spell_type is not given
         level: Spell level (1-9)
         count: Number of spells to return
         spell_type: Type of spells to get (e.g., 'magic_user', 'cleric', 'druid', 'illusionist')
+        rng: Random source to pick the spells with
     """
-    spells_data = load_spells(spell_file)
-    
-    # Get the appropriate level key
-    level_key = f"{level}_level" if level > 1 else "first_level"
-    
-    # Get the list of spells for the specified level and type
-    if spell_type:
-        available_spells = spells_data.get(f"{spell_type}_spells", {}).get(level_key, [])
-    else:
-        # For backward compatibility, try illusionist spells first
-        available_spells = spells_data.get("illusionist_spells", {}).get(level_key, [])
-    
-    # If there aren't enough spells available, return all of them
-    if len(available_spells) <= count:
-        return available_spells
-    
-    # Otherwise, randomly select the requested number of spells
-    selected_spells = random.sample(available_spells, count)
+    spell_type = spell_type or os.path.basename(spell_file).replace('_spells.json', '')
+    available_spells = spell_index().spells_of(spell_type, level)
     
-    # Add memorized and cast properties to each spell
-    for spell in selected_spells:
-        spell['memorized'] = True  # All starting spells are memorized
-        spell['cast'] = False  # No spells have been cast yet
+    # If there aren't enough spells available, all of them are selected
+    selected_spells = rng.sample(available_spells, min(count, len(available_spells)))
     
-    return selected_spells
+    # Copy each spell with memorized and cast properties
+    return [dict(spell.to_json(), memorized=True, cast=False) for spell in selected_spells]
 
-def generate_magic_user_spells() -> Dict[str, List[Dict]]:
+def generate_magic_user_spells(rng=random) -> Dict[str, List[Dict]]:
     """Generate starting spells for a magic user character."""
     # Get 4 random first level spells
-    first_level_spells = get_random_spells("magic_user_spells.json", 1, 4, "magic_user")
+    first_level_spells = get_random_spells("magic_user_spells.json", 1, 4, "magic_user", rng)
     
     # Add Read Magic to the spells
     read_magic = {
@@ -66,10 +52,10 @@ def generate_magic_user_spells() -> Dict[str, List[Dict]]:
         "1": first_level_spells
     }
 
-def generate_illusionist_spells() -> Dict[str, List[Dict]]:
+def generate_illusionist_spells(rng=random) -> Dict[str, List[Dict]]:
     """Generate starting spells for an illusionist character."""
     # Get 4 random first level spells
-    first_level_spells = get_random_spells("illusionist_spells.json", 1, 4, "illusionist")
+    first_level_spells = get_random_spells("illusionist_spells.json", 1, 4, "illusionist", rng)
     
     # Return the spells organized by level
     return {
@@ -0,0 +1,198 @@
+"""Treasure hoards rolled by treasure type.
+
+Treasure types (data/treasure_types.json) follow the lettered types of
+the Monster Manual; a treasure tile is a cache rather than a full lair, so
+coin amounts are in tens (coin_multiplier) instead of thousands. Each type
+is compiled once into integer percent chances, dice and cumulative weight
+tables for gems, jewelry and items (data/items.json, rarer the costlier),
+and hoards are rolled with numpy in batches: one hoard, a whole level or
+thousands for economy simulations cost about the same number of calls.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+TREASURE_TYPES_PATH = os.path.join(_DATA_DIR, 'treasure_types.json')
+ITEMS_PATH = os.path.join(_DATA_DIR, 'items.json')
+
+COINS = ('cp', 'sp', 'ep', 'gp', 'pp')
+
+# An item's weight in its table is this divided by its cost (at least 1)
+ITEM_RARITY_SCALE = 1000
+
+def parse_dice(expression: str) -> Tuple[int, int, int]:
+    """(count, sides, bonus) of a dice expression such as '2d6', '10d4+1' or a plain number"""
+    expression = str(expression).replace(' ', '')
+    if 'd' not in expression:
+        return 0, 1, int(expression)
+    bonus = 0
+    for sign in ('+', '-'):
+        if sign in expression:
+            expression, modifier = expression.split(sign, 1)
+            bonus = int(modifier) if sign == '+' else -int(modifier)
+            break
+    count, sides = expression.split('d')
+    return int(count or 1), int(sides), bonus
+
+def _roll_dice(dice: Tuple[int, int, int], size: int, np_rng) -> np.ndarray:
+    count, sides, bonus = dice
+    if not count:
+        return np.full(size, bonus, dtype=np.int64)
+    return np_rng.randint(1, sides + 1, size=(size, count)).sum(axis=1) + bonus
+
+def _cumulative(weights: Sequence[int]) -> np.ndarray:
+    return np.cumsum(np.asarray(weights, dtype=np.int64))
+
+def _pick(cumulative: np.ndarray, size: int, np_rng) -> np.ndarray:
+    """Indices drawn from an integer cumulative weight table"""
+    return np.searchsorted(cumulative, np_rng.randint(0, cumulative[-1], size=size), side='right')
+
+class _CompiledType:
+    __slots__ = ('coins', 'gems', 'jewelry', 'item_chance', 'picks')
+
+    def __init__(self, coins, gems, jewelry, item_chance, picks):
+        self.coins = coins            # [(coin, chance, dice)]
+        self.gems = gems              # (chance, dice) or None
+        self.jewelry = jewelry        # (chance, dice) or None
+        self.item_chance = item_chance
+        self.picks = picks            # [(dice, item indices, cumulative weights)]
+
+class TreasureEngine:
+    """Compiled treasure tables with batch hoard rolls"""
+
+    def __init__(self, definitions: Dict, items: Dict[str, List[Dict]]):
+        self.coin_multiplier = definitions.get('coin_multiplier', 1)
+        self.coin_values = np.array([definitions['coin_values'][coin] for coin in COINS])
+        self.gem_values = np.array([entry['value'] for entry in definitions['gem_values']])
+        self.gem_table = _cumulative([entry['weight'] for entry in definitions['gem_values']])
+        self.jewelry_values = np.array([entry['value'] for entry in definitions['jewelry_values']])
+        self.jewelry_table = _cumulative([entry['weight'] for entry in definitions['jewelry_values']])
+
+        # Every item in one list; kinds maps a category to its indices there
+        self.items: List[Dict] = []
+        kinds: Dict[str, List[int]] = {}
+        for kind, entries in items.items():
+            kinds[kind] = list(range(len(self.items), len(self.items) + len(entries)))
+            self.items.extend(entries)
+        self.item_costs = np.array([item.get('cost', 0) for item in self.items], dtype=np.float64)
+
+        self.types: Dict[str, _CompiledType] = {}
+        for name, definition in definitions['types'].items():
+            coins = [(COINS.index(coin), definition[coin]['chance'], parse_dice(definition[coin]['amount']))
+                     for coin in COINS if coin in definition]
+            gems = definition.get('gems')
+            jewelry = definition.get('jewelry')
+            item_def = definition.get('items') or {'chance': 0, 'picks': []}
+            picks = []
+            for pick in item_def['picks']:
+                indices = np.array([i for kind in pick['kinds'] for i in kinds.get(kind, ())], dtype=np.intp)
+                if len(indices):
+                    weights = [max(1, round(ITEM_RARITY_SCALE / max(1, self.items[i].get('cost', 1))))
+                               for i in indices]
+                    picks.append((parse_dice(pick['amount']), indices, _cumulative(weights)))
+            self.types[name] = _CompiledType(
+                coins,
+                (gems['chance'], parse_dice(gems['amount'])) if gems else None,
+                (jewelry['chance'], parse_dice(jewelry['amount'])) if jewelry else None,
+                item_def['chance'], picks
+            )
+
+    def _roll(self, treasure_type: str, count: int, np_rng):
+        """Columns of count hoards, plus (owner, item index) arrays for the items rolled"""
+        compiled = self.types.get(treasure_type)
+        columns = {coin: np.zeros(count, dtype=np.int64) for coin in COINS}
+        for name in ('gems', 'gem_value', 'jewelry', 'jewelry_value', 'items'):
+            columns[name] = np.zeros(count, dtype=np.int64)
+        owners = np.zeros(0, dtype=np.intp)
+        indices = np.zeros(0, dtype=np.intp)
+        if compiled is None or count <= 0:
+            return columns, owners, indices
+
+        for coin, chance, dice in compiled.coins:
+            present = np_rng.randint(0, 100, size=count) < chance
+            columns[COINS[coin]] = np.where(present, _roll_dice(dice, count, np_rng), 0) * self.coin_multiplier
+
+        for name, value_name, table, values, spec in (
+                ('gems', 'gem_value', self.gem_table, self.gem_values, compiled.gems),
+                ('jewelry', 'jewelry_value', self.jewelry_table, self.jewelry_values, compiled.jewelry)):
+            if spec is None:
+                continue
+            chance, dice = spec
+            amounts = np.where(np_rng.randint(0, 100, size=count) < chance, _roll_dice(dice, count, np_rng), 0)
+            columns[name] = amounts
+            drawn = values[_pick(table, int(amounts.sum()), np_rng)]
+            columns[value_name] = np.bincount(np.repeat(np.arange(count), amounts), weights=drawn,
+                                              minlength=count).astype(np.int64)
+
+        if compiled.picks:
+            found = np_rng.randint(0, 100, size=count) < compiled.item_chance
+            owner_parts, index_parts = [], []
+            for dice, pick_indices, table in compiled.picks:
+                amounts = np.where(found, _roll_dice(dice, count, np_rng), 0)
+                owner_parts.append(np.repeat(np.arange(count), amounts))
+                index_parts.append(pick_indices[_pick(table, int(amounts.sum()), np_rng)])
+                columns['items'] += amounts
+            owners, indices = np.concatenate(owner_parts), np.concatenate(index_parts)
+        return columns, owners, indices
+
+    def roll_many(self, treasure_type: str, count: int, np_rng=np.random) -> Dict[str, np.ndarray]:
+        """Roll count hoards at once as arrays: coins, gem and jewelry counts and values,
+        item counts and 'value', the hoard's total worth in gold pieces"""
+        columns, owners, indices = self._roll(treasure_type, count, np_rng)
+        coins = np.stack([columns[coin] for coin in COINS], axis=1)
+        item_value = np.bincount(owners, weights=self.item_costs[indices], minlength=count)
+        columns['value'] = (coins @ self.coin_values + columns['gem_value'] + columns['jewelry_value'] +
+                            item_value).round().astype(np.int64)
+        return columns
+
+    def roll_hoards(self, treasure_types: Sequence[str], np_rng=np.random) -> List[Dict]:
+        """One hoard per entry, rolled in a batch per treasure type, e.g. for every treasure on a level"""
+        hoards: List[Optional[Dict]] = [None] * len(treasure_types)
+        for treasure_type in set(treasure_types):
+            slots = [i for i, name in enumerate(treasure_types) if name == treasure_type]
+            columns, owners, indices = self._roll(treasure_type, len(slots), np_rng)
+            items: List[List[str]] = [[] for _ in slots]
+            for owner, index in zip(owners.tolist(), indices.tolist()):
+                items[owner].append(self.items[index]['name'])
+            for row, slot in enumerate(slots):
+                hoards[slot] = {
+                    'coins': {coin: int(columns[coin][row]) for coin in COINS if columns[coin][row]},
+                    'gems': {'count': int(columns['gems'][row]), 'value': int(columns['gem_value'][row])},
+                    'jewelry': {'count': int(columns['jewelry'][row]), 'value': int(columns['jewelry_value'][row])},
+                    'items': items[row]
+                }
+        return hoards
+
+    def roll(self, treasure_type: str, np_rng=np.random) -> Dict:
+        """A single hoard"""
+        return self.roll_hoards([treasure_type], np_rng)[0]
+
+    def item(self, name: str) -> Optional[Dict]:
+        """The items.json entry with this name"""
+        return next((item for item in self.items if item['name'] == name), None)
+
+def is_empty(hoard: Dict) -> bool:
+    return not (hoard['coins'] or hoard['gems']['count'] or hoard['jewelry']['count'] or hoard['items'])
+
+def describe(hoard: Dict) -> str:
+    """Short text listing of a hoard's contents"""
+    parts = [f"{amount} {coin}" for coin, amount in hoard['coins'].items()]
+    for name in ('gems', 'jewelry'):
+        if hoard[name]['count']:
+            label = name if name == 'jewelry' or hoard[name]['count'] > 1 else 'gem'
+            parts.append(f"{hoard[name]['count']} {label} ({hoard[name]['value']} gp)")
+    parts.extend(hoard['items'])
+    return ', '.join(parts) if parts else 'nothing'
+
+@lru_cache(maxsize=None)
+def treasure_engine(types_path: str = TREASURE_TYPES_PATH, items_path: str = ITEMS_PATH) -> TreasureEngine:
+    """The engine for the game's data files, compiled on first use"""
+    with open(types_path, 'r') as f:
+        definitions = json.load(f)
+    with open(items_path, 'r') as f:
+        items = json.load(f)
+    return TreasureEngine(definitions, items)
@@ -1,57 +1,218 @@
 import random
 
-def generate_half_orc_name(gender):
+# Name tables are compiled once at module load; the generators below only pick from them.
+
+HALF_ORC_MALE_NAMES = ('Ghazat', 'Abghat', 'Adgulg', 'Aghed', 'Agugh', 'Aguk', 'Almthu', 'Alog', 'Ambilge', 'Apaugh', 'Argha', 'Argigoth', 'Argug', 'Arpigig', 'Auhgan', 'Azhug', 'Bagdud', 'Baghig', 'Bahgigoth', 'Bandagh', 'Barfu', 'Bargulg', 'Baugh', 'Bidgug', 'Bildud', 'Bilge', 'Bog', 'Boghat', 'Bogugh', 'Borgan', 'Borug', 'Braugh', 'Brougha', 'Brugagh', 'Bruigig', 'Buadagh', 'Buggug', 'Builge', 'Buimghig', 'Bulgan', 'Bumhug', 'Buomaugh', 'Buordud', 'Burghed', 'Buugug', 'Cabugbu', 'Cagan', 'Carguk', 'Carthurg', 'Clog', 'Corgak', 'Crothu', 'Cubub', 'Cukgilug', 'Curbag', 'Dabub', 'Dakgorim', 'Dakgu', 'Dalthu', 'Darfu', 'Deakgu', 'Dergu', 'Derthag', 'Digdug', 'Diggu', 'Dilug', 'Ditgurat', 'Dorgarag', 'Dregu', 'Dretkag', 'Drigka', 'Drikdarok', 'Drutha', 'Dudagog', 'Dugarod', 'Dugorim', 'Duiltag', 'Durbag', 'Eagungad', 'Eggha', 'Eggugat', 'Egharod', 'Eghuglat', 'Eichelberbog', 'Ekganit', 'Epkagut', 'Ergoth', 'Ertguth', 'Ewkbanok', 'Fagdud', 'Faghig', 'Fandagh', 'Farfu', 'Farghed', 'Fargigoth', 'Farod', 'Faugh', 'Feldgulg', 'Fidgug', 'Filge', 'Fodagog', 'Fogugh', 'Fozhug', 'Frikug', 'Frug', 'Frukag', 'Fubdagog', 'Fudhagh', 'Fupgugh', 'Furbog', 'Futgarek', 'Gaakt', 'Garekk', 'Gelub', 'Gholug', 'Gilaktug', 'Ginug', 'Gnabadug', 'Gnadug', 'Gnalurg', 'Gnarg', 'Gnarlug', 'Gnorl', 'Gnorth', 'Gnoth', 'Gnurl', 'Golag', 'Golub', 'Gomatug', 'Gomoku', 'Gorgu', 'Gorlag', 'Grikug', 'Grug', 'Grukag', 'Grukk', 'Grung', 'Gruul', 'Guag', 'Gubdagog', 'Gudhagh', 'Gug', 'Gujarek', 'Gujek', 'Gujjab', 'Gulm', 'Gulrn', 'Gunaakt', 'Gunag', 'Gunug', 'Gurukk', 'Guthakug', 'Guthug', 'Gutjja', 'Hagob', 'Hagu', 'Hagub', 'Haguk', 'Hebub', 'Hegug', 'Hibub', 'Hig', 'Hogug', 'Hoknath', 'Hoknuk', 'Hokulk', 'Holkurg', 'Horknuth', 'Hrolkug', 'Hugagug', 'Hugmug', 'Hugolm', 'Ig', 'Igmut', 'Ignatz', 'Ignorg', 'Igubat', 'Igug', 'Igurg', 'Ikgnath', 'Ikkath', 'Inkathu', 'Inkathurg', 'Isagubat', 'Jogug', 'Jokgagu', 'Jolagh', 'Jorgagu', 'Jregh', 'Jreghug', 'Jugag', 'Jughog', 'Jughragh', 'Jukha', 'Jukkhag', 'Julakgh', 'Kabugbu', 'Kagan', 'Kaghed', 'Kahigig', 'Karfu', 'Karguk', 'Karrghed', 'Karrhig', 'Karthurg', 'Kebub', 'Kegigoth', 'Kegth', 'Kerghug', 'Kertug', 'Kilug', 'Klapdud', 'Klog', 'Klughig', 'Knagh', 'Knaraugh', 'Knodagh', 'Knorgh', 'Knuguk', 'Knurigig', 'Kodagog', 'Kog', 'Kogan', 'Komarod', 'Korgak', 'Korgulg', 'Koughat', 'Kraugug', 'Krilge', 'Krothu', 'Krouthu', 'Krugbu', 'Krugorim', 'Kubub', 'Kugbu', 'Kukgilug', 'Kulgha', 'Kupgugh', 'Kurbag', 'Kurmbag', 'Laghed', 'Lamgugh', 'Mabub', 'Magdud', 'Malthu', 'Marfu', 'Margulg', 'Mazhug', 'Meakgu', 'Mergigoth', 'Milug', 'Mudagog', 'Mugarod', 'Mughragh', 'Mugorim', 'Murbag', 'Naghat', 'Naghig', 'Naguk', 'Nahgigoth', 'Nakgu', 'Narfu', 'Nargulg', 'Narhbub', 'Narod', 'Neghed', 'Nehrakgu', 'Nildud', 'Nodagog', 'Nofhug', 'Nogugh', 'Nomgulg', 'Noogugh', 'Nugbu', 'Nughilug', 'Nulgha', 'Numhug', 'Nurbag', 'Nurghed', 'Oagungad', 'Oakgu', 'Obghat', 'Oggha', 'Oggugat', 'Ogharod', 'Oghuglat', 'Oguk', 'Ohomdud', 'Ohulhug', 'Oilug', 'Okganit', 'Olaghig', 'Olaugh', 'Olmthu', 'Olodagh', 'Olog', 'Omaghed', 'Ombilge', 'Omegugh', 'Omogulg', 'Omugug', 'Onog', 'Onubub', 'Onugug', 'Oodagh', 'Oogorim', 'Oogugbu', 'Oomigig', 'Opathu', 'Opaugh', 'Opeghat', 'Opilge', 'Opkagut', 'Opoguk', 'Oquagan', 'Orgha', 'Orgoth', 'Orgug', 'Orpigig', 'Ortguth', 'Otugbu', 'Ougha', 'Ougigoth', 'Ouhgan', 'Owkbanok', 'Paghorim', 'Pahgigoth', 'Pahgorim', 'Pakgu', 'Parfu', 'Pargu', 'Parhbub', 'Parod', 'Peghed', 'Pehrakgu', 'Pergu', 'Perthag', 'Pigdug', 'Piggu', 'Pitgurat', 'Podagog', 'Pofhug', 'Pomgulg', 'Poogugh', 'Porgarag', 'Pregu', 'Pretkag', 'Prigka', 'Prikdarok', 'Prutha', 'Pughilug', 'Puiltag', 'Purbag', 'Qog', 'Quadagh', 'Quilge', 'Quimghig', 'Quomaugh', 'Quordud', 'Quugug', 'Raghat', 'Raguk', 'Rakgu', 'Rarfu', 'Rebub', 'Rilug', 'Rodagog', 'Rogan', 'Romarod', 'Routhu', 'Rugbu', 'Rugorim', 'Rurbag', 'Rurigig', 'Sabub', 'Saghig', 'Sahgigoth', 'Sahgorim', 'Sakgu', 'Salthu', 'Saraugug', 'Sarfu', 'Sargulg', 'Sarhbub', 'Sarod', 'Sbghat', 'Seakgu', 'Sguk', 'Shomdud', 'Shulhug', 'Sildud', 'Silge', 'Silug', 'Sinsbog', 'Slaghig', 'Slapdud', 'Slaugh', 'Slodagh', 'Slog', 'Slughig', 'Smaghed', 'Smegugh', 'Smogulg', 'Snog', 'Snubub', 'Snugug', 'Sodagh', 'Sog', 'Sogorim', 'Sogugbu', 'Sogugh', 'Sombilge', 'Somigig', 'Sonagh', 'Sorgulg', 'Sornaraugh', 'Soughat', 'Spathu', 'Speghat', 'Spilge', 'Spoguk', 'Squagan', 'Stugbu', 'Sudagog', 'Sugarod', 'Sugbu', 'Sugha', 'Sugigoth', 'Sugorim', 'Suhgan', 'Sulgha', 'Sulmthu', 'Sumhug', 'Sunodagh', 'Sunuguk', 'Supaugh', 'Supgugh', 'Surbag', 'Surgha', 'Surghed', 'Surgug', 'Surpigig', 'Tagdud', 'Taghig', 'Tandagh', 'Tarfu', 'Targhed', 'Targigoth', 'Tarod', 'Taugh', 'Teldgulg', 'Tidgug', 'Tilge', 'Todagog', 'Tog', 'Toghat', 'Togugh', 'Torgan', 'Torug', 'Tozhug', 'Traugh', 'Trilug', 'Trougha', 'Trugagh', 'Truigig', 'Tuggug', 'Tulgan', 'Turbag', 'Turge', 'Ug', 'Ugghra', 'Uggug', 'Ughat', 'Ulgan', 'Ulmragha', 'Ulmrougha', 'Umhra', 'Umragig', 'Umruigig', 'Ungagh', 'Unrugagh', 'Urag', 'Uraugh', 'Urg', 'Urgan', 'Urghat', 'Urgran', 'Urlgan', 'Urmug', 'Urug', 'Urulg', 'Vabugbu', 'Vagan', 'Vagrungad', 'Vagungad', 'Vakgar', 'Vakgu', 'Vakmu', 'Valthurg', 'Vambag', 'Vamugbu', 'Varbu', 'Varbuk', 'Varfu', 'Vargan', 'Varguk', 'Varkgorim', 'Varthurg', 'Vegum', 'Vergu', 'Verlgu', 'Verthag', 'Verthurg', 'Vetorkag', 'Vidarok', 'Vigdolg', 'Vigdug', 'Viggu', 'Viggulm', 'Viguka', 'Vitgurat', 'Vitgut', 'Vlog', 'Vlorg', 'Vorgak', 'Vorgarag', 'Vothug', 'Vregu', 'Vretkag', 'Vrigka', 'Vrikdarok', 'Vrogak', 'Vrograg', 'Vrothu', 'Vruhag', 'Vrutha', 'Vubub', 'Vugub', 'Vuiltag', 'Vukgilug', 'Vultog', 'Vulug', 'Vurbag', 'Wakgut', 'Wanug', 'Wapkagut', 'Waruk', 'Wauktug', 'Wegub', 'Welub', 'Wholug', 'Wilaktug', 'Wingloug', 'Winug', 'Woabadug', 'Woggha', 'Woggugat', 'Wogharod', 'Woghuglat', 'Woglug', 'Wokganit', 'Womkug', 'Womrikug', 'Wonabadug', 'Worthag', 'Wraog', 'Wrug', 'Wrukag', 'Wrukaog', 'Wubdagog', 'Wudgh', 'Wudhagh', 'Wudugog', 'Wuglat', 'Wumanok', 'Wumkbanok', 'Wurgoth', 'Wurmha', 'Wurtguth', 'Wurthu', 'Wutgarek', 'Xaakt', 'Xago', 'Xagok', 'Xagu', 'Xaguk', 'Xarlug', 'Xarpug', 'Xegug', 'Xepug', 'Xig', 'Xnath', 'Xnaurl', 'Xnurl', 'Xoknath', 'Xokuk', 'Xolag', 'Xolkug', 'Xomath', 'Xomkug', 'Xomoku', 'Xonoth', 'Xorag', 'Xorakk', 'Xoroku', 'Xoruk', 'Xothkug', 'Xruul', 'Xuag', 'Xug', 'Xugaa', 'Xugag', 'Xugagug', 'Xugar', 'Xugarf', 'Xugha', 'Xugor', 'Xugug', 'Xujarek', 'Xuk', 'Xulgag', 'Xunaakt', 'Xunag', 'Xunug', 'Xurek', 'Xurl', 'Xurug', 'Xurukk', 'Xutag', 'Xuthakug', 'Xutjja', 'Yaghed', 'Yagnar', 'Yagnatz', 'Yahg', 'Yahigig', 'Yakgnath', 'Yakha', 'Yalakgh', 'Yargug', 'Yegigoth', 'Yegoth', 'Yerghug', 'Yerug', 'Ymafubag', 'Yokgagu', 'Yokgu', 'Yolmar', 'Yonkathu', 'Yregh', 'Yroh', 'Ysagubar', 'Yughragh', 'Yugug', 'Yukgnath', 'Yukha', 'Yulakgh', 'Yunkathu', 'Zabghat', 'Zabub', 'Zaghig', 'Zahgigoth', 'Zahgorim', 'Zalthu', 'Zaraugug', 'Zarfu', 'Zargulg', 'Zarhbub', 'Zarod', 'Zeakgu', 'Zguk', 'Zildud', 'Zilge', 'Zilug', 'Zinsbog', 'Zlapdud', 'Zlog', 'Zlughig', 'Zodagh', 'Zog', 'Zogugbu', 'Zogugh', 'Zombilge', 'Zonagh', 'Zorfu', 'Zorgulg', 'Zorhgigoth', 'Zornaraugh', 'Zoughat', 'Zudagog', 'Zugarod', 'Zugbu', 'Zugorim', 'Zuhgan', 'Zulgha', 'Zulmthu', 'Zumhug', 'Zunodagh', 'Zunuguk', 'Zupaugh', 'Zupgugh', 'Zurbag', 'Zurgha', 'Zurghed', 'Zurgug', 'Zurpigig', 'Atulg', 'Azuk', 'Bagamul', 'Bakh', 'Baronk', 'Bashag', 'Bazgulub', 'Bogakh', 'Borug', 'Both', 'Bugdul', 'Bugharz', 'Bugrash', 'Bugrol', 'Bumbub', 'Burul', 'Dul', 'Dular', 'Duluk', 'Duma', 'Dumbuk', 'Dumburz', 'Dur', 'Durbul', 'Durgash', 'Durz', 'Durzol', 'Durzub', 'Durzum', 'Garothmuk', 'Garzonk', 'Gashna', 'Ghamborz', 'Ghamonk', 'Ghoragdush', 'Ghorlorz', 'Glush', 'Grat', 'Guarg', 'Gurak', 'Khadba', 'Khagra', 'Khargol', 'Koffutto', 'Largakh', 'Lorbumol', 'Lorzub', 'Lugdum', 'Lugrub', 'Lurog', 'Mash', 'Matuk', 'Mauhul', 'Mazorn', 'Mol', 'Morbash', 'Mug', 'Mugdul', 'Muk', 'Murag', 'Murkub', 'Murzol', 'Muzgonk', 'Nag', 'Nar', 'Nash', 'Ogrul', 'Ogrumbu', 'Olfin', 'Olumba', 'Orakh', 'Rogdul', 'Shakh', 'Shamar', 'Shamob', 'Shargam', 'Sharkub', 'Shat', 'Shulong', 'Shura', 'Shurkul', 'Shuzug', 'Snaglak', 'Snakha', 'Snat', 'Ugdumph', 'Ughash', 'Ulam', 'Umug', 'Uram', 'Urim', 'Urul', 'Urzog', 'Ushamph', 'Yadba', 'Yagak', 'Yak', 'Yam', 'Yambagorn', 'Yambul', 'Yargol', 'Yashnarz', 'Yatur', 'Agronak', 'Bat', 'Bazur', 'Brugo', 'Bogrum', 'Brag', 'Brokil', 'Bugak', 'Buramog', 'Burz', 'Dubok', 'Dul', 'Dulfish', 'Dumag', 'Dulphumph', 'Gaturn', 'Gogron', 'Gorgo', 'Graklak', 'Graman', 'Grommok', 'Gul', 'Hanz', 'Krognak', 'Kurdan', 'Kurz', 'Rugdumph', 'Lum', 'Lumdum', 'Luronk', 'Magra', 'Magub', 'Maknok', 'Mug', 'Orok', 'Shagol', 'Shagrol', 'Shobob', 'Shum', 'Ulmug', 'Urbul', 'Urul', 'Ushnar', 'Uzul', 'Arob', 'Balogog', 'Borkul', 'Burguk', 'Dushnamub', 'Gat', 'Ghamorz', 'Ghorbash', 'Gradba', 'Grogmar', 'Grushnag', 'Gularzob', 'Kharag', 'Larek', 'Lob', 'Lurbuk', 'Mahk', 'Makhel', 'Abbas', 'Mauhulakh', 'Moth', 'Mul', 'Mulush', 'Nagrub', 'Oglub', 'Ogol', 'Olur', 'Ulag', 'Umurn', 'Urag', 'Yamarz', 'Yar')
+
+HALF_ORC_FEMALE_NAMES = ('Agrob', 'Badbog', 'Bashuk', 'Bogdub', 'Bugdurash', 'Bula', 'Bulak', 'Bulfim', 'Bum', 'Burzob', 'Burub', 'Dura', 'Durgat', 'Durz', 'Gashnakh', 'Ghob', 'Glasha', 'Glob', 'Gluronk', 'Gonk', 'Grat', 'Grazob', 'Gulfim', 'Kharzug', 'Lagakh', 'Lambug', 'Lazgar', 'Mogak', 'Morn', 'Murob', 'Murzush', 'Nargol', 'Rolfish', 'Orbul', 'Ragash', 'Rulfim', 'Shadbak', 'Shagar', 'Shagdub', 'Sharn', 'Sharog', 'Shazgob', 'Shelur', 'Uloth', 'Ulumpha', 'Urzoth', 'Urzul', 'Ushat', 'Ushug', 'Yazgash', 'Batul', 'Borba', 'Bumph', 'Homraz', 'Rogbut', 'Mazoga', 'Mog', 'Mor', 'Oghash', 'Rogmesh', 'Snak', 'Ugak', 'Umog', 'Arob', 'Atub', 'Bagrak', 'Bolar', 'Bor', 'Borgakh', 'Dulug', 'Garakh', 'Ghak', 'Gharol', 'Ghorza', 'Gul', 'Lash', 'Murbol', 'Sharamph', 'Shel', 'Shufharz', 'Ugor', 'Urog', 'Yotul')
+
+# Goblin name components
+GOBLIN_NM1 = ("", "", "", "", "", "", "", "b", "c", "d", "f", "g", "h", "j", "k", "l", "p", "r", "t", "v", "w", "x", "z", "br", "bl", "cr", "cl", "ch", "dr", "fr", "gr", "gl", "gn", "kr", "kl", "pr", "pl", "str", "st", "sr", "sl", "tr", "vr", "wr", "zr")
+GOBLIN_NM2 = ("a", "e", "i", "o", "u", "a", "e", "i", "o", "u", "a", "e", "i", "o", "u", "y", "ia", "io", "ee", "aa", "ui", "ie", "ea", "oi")
+GOBLIN_NM3 = ("b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "bb", "bd", "bh", "bl", "bk", "bn", "br", "bs", "bt", "bz", "db", "dd", "df", "dh", "dl", "dn", "dr", "ds", "dv", "dz", "", "gg", "gb", "gd", "gh", "gk", "gl", "gm", "gn", "gr", "gs", "gt", "gz", "hd", "hb", "hk", "hn", "hz", "kl", "kn", "kz", "kv", "kk", "lb", "ld", "lg", "lk", "ll", "lr", "ls", "lt", "lv", "lz", "mr", "mv", "mz", "mt", "nr", "nv", "nz", "nt", "rb", "rd", "rg", "rk", "rl", "rm", "rn", "rr", "rs", "rt", "rv", "rz", "sb", "sd", "sh", "sk", "sm", "sn", "sr", "str", "st", "sv", "sz", "ss", "tb", "tl", "tm", "tn", "tr", "tv", "tz", "tt", "vl", "vn", "vr", "vz", "zb", "zd", "zg", "zl", "zm", "zn", "zt")
+GOBLIN_NM4 = ("c", "g", "k", "l", "q", "r", "t", "x", "z", "nk", "ld", "rd", "s", "sz", "zz", "ng", "kz", "lb", "rm", "sb", "bs", "ts", "cs", "ct", "gs", "gz", "kt", "kx", "lk", "lx", "rk", "rt", "rd", "rx")
+GOBLIN_NM5 = ("", "", "", "", "", "", "", "b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "q", "r", "s", "t", "v", "w", "bh", "br", "bl", "cr", "cl", "ch", "fr", "fl", "gr", "gl", "gn", "kh", "kl", "ph", "pr", "sh", "st", "sr", "sl", "sw", "th", "thr", "tr", "vr", "wr")
+GOBLIN_NM6 = ("b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "bb", "bd", "bh", "bl", "bk", "bn", "br", "bs", "bt", "bz", "fb", "fl", "fm", "fn", "fs", "ft", "gg", "gb", "gd", "gh", "gk", "gl", "gm", "gn", "gr", "gs", "gt", "gz", "hd", "hb", "hk", "hn", "hz", "kl", "kn", "kz", "kv", "kk", "lb", "ld", "lg", "lk", "ll", "lr", "ls", "lt", "lv", "lz", "mr", "mv", "mz", "mt", "nr", "nv", "nz", "nt", "ph", "pf", "pl", "pn", "pm", "pr", "ps", "pt", "pv", "rb", "rd", "rg", "rk", "rl", "rm", "rn", "rr", "rs", "rt", "rv", "rz", "sb", "sd", "sh", "sk", "sm", "sn", "sr", "str", "st", "sv", "sz", "ss", "tb", "tl", "tm", "tn", "tr", "tv", "tz", "tt", "vl", "vn", "vr", "vz")
+GOBLIN_NM7 = ("h", "f", "g", "l", "n", "q", "s", "x", "z", "ls", "nk", "zz", "ld", "sh", "sz", "ss", "gs", "sx", "lx", "hx", "th", "rx", "rt", "ft", "fs", "fz", "lm", "lk", "lt", "ng", "nx", "ns", "nq")
+GOBLIN_NM8 = ("e", "i", "ee", "ia", "ea", "a", "ai", "", "", "", "", "", "", "", "", "", "", "", "", "")
+
+# Syllable tables for the remaining races: (prefixes, middles, suffixes) by gender
+SYLLABLE_TABLES = {
+    'Human': {
+        'male': (
+            ("Al", "Bran", "Cor", "Ed", "Gar", "Hal", "Jor", "Ken", "Mar", "Os", "Ric", "Ro", "Ste", "Tho", "Wil", "Ald", "Bar", "Der", "Gil", "Ul"),
+            ("", "", "", "a", "e", "i", "o", "an", "er", "in"),
+            ("ric", "win", "mund", "bert", "ald", "ard", "fred", "mar", "wick", "ton", "den", "son", "ram", "rin", "ias")
+        ),
+        'female': (
+            ("Ad", "Bri", "Cel", "Eli", "Gwen", "Hel", "Isa", "Jes", "Mar", "Ro", "Syl", "Tam", "Vi", "Wyn", "El", "Ann", "Lin", "Mir"),
+            ("", "", "", "a", "e", "i", "an", "el", "or"),
+            ("a", "ia", "wen", "eth", "ine", "ra", "da", "lyn", "issa", "elle", "ora", "beth", "ith")
+        )
+    },
+    'Elf': {
+        'male': (
+            ("Ae", "Cel", "El", "Fae", "Gal", "Il", "Lae", "Mel", "Nai", "Quel", "Ri", "Sae", "Tha", "Va", "Ys", "Ara", "Eru", "Lue"),
+            ("", "a", "e", "i", "ia", "la", "ri", "the", "va", "lan", "dri"),
+            ("dor", "ion", "las", "lor", "mir", "nor", "rion", "ril", "thas", "vyr", "wyn", "ndil", "ndor", "rath")
+        ),
+        'female': (
+            ("Ae", "Ari", "Cai", "Ela", "Fi", "Ila", "Lia", "Mae", "Nae", "Sha", "Syl", "Tia", "Va", "Xi", "Yl", "Ilu", "Ana", "Eth"),
+            ("", "a", "e", "i", "ia", "la", "li", "na", "ra", "the", "va"),
+            ("na", "ra", "wen", "riel", "lia", "sys", "thiel", "lyn", "ndra", "shar", "vaia", "nae", "elle", "iel")
+        )
+    },
+    'Dwarf': {
+        'male': (
+            ("Bal", "Bof", "Bru", "Dar", "Dol", "Dur", "Gim", "Har", "Kil", "Mor", "Nor", "Orn", "Rur", "Thor", "Tor", "Ul", "Vond", "Gar"),
+            ("", "", "", "a", "i", "o", "u", "ra", "ga"),
+            ("in", "li", "din", "grim", "gar", "rak", "dek", "bek", "dal", "dun", "rim", "ik", "nar", "or", "ur")
+        ),
+        'female': (
+            ("Am", "Bar", "Dag", "Del", "Eld", "Gun", "Hel", "Kat", "Lif", "Mar", "Rii", "Sann", "Tor", "Vis", "Ilde", "Bryn"),
+            ("", "", "a", "e", "i", "ra", "un"),
+            ("ber", "dis", "dra", "ja", "la", "ra", "rin", "wyn", "hild", "run", "trud", "hilde", "ja", "na")
+        )
+    },
+    'Halfling': {
+        'male': (
+            ("Al", "Bil", "Cor", "Dro", "El", "Fin", "Gar", "Lin", "Mer", "Mil", "Os", "Per", "Ros", "Wel", "Bun", "Fre", "Ham", "Sam"),
+            ("", "", "", "a", "i", "o", "do", "ri", "ry"),
+            ("bo", "co", "do", "go", "ton", "ric", "lo", "by", "fast", "wise", "nard", "wald", "mac", "pin")
+        ),
+        'female': (
+            ("An", "Bree", "Cal", "Cor", "Eu", "Jil", "Kith", "La", "Mer", "Pae", "Sera", "Ver", "Wil", "Ros", "Lob", "Pri", "Dai"),
+            ("", "", "", "a", "e", "i", "li", "ri"),
+            ("lie", "a", "ey", "ie", "la", "ly", "na", "ry", "sie", "wen", "bell", "lia", "my", "trice", "sy")
+        )
+    },
+    'Gnome': {
+        'male': (
+            ("Al", "Bod", "Bro", "Bur", "Dim", "Eld", "Fon", "Frug", "Gim", "Glim", "Jeb", "Kel", "Nam", "Orr", "Rose", "Sin", "War", "Zook"),
+            ("", "", "a", "i", "o", "ble", "fi", "ni", "bi"),
+            ("ble", "dle", "don", "dook", "fiz", "kin", "mer", "nock", "nook", "pip", "wick", "zook", "bo", "tock")
+        ),
+        'female': (
+            ("Bim", "Bree", "Caram", "Ella", "Lil", "Lor", "Mar", "Nis", "Nyx", "Oda", "Orla", "Roy", "Shamil", "Tana", "Wald", "Zan"),
+            ("", "", "a", "i", "li", "pi", "ni"),
+            ("bi", "dee", "dra", "la", "lin", "nia", "pi", "wyn", "ella", "yn", "ra", "ly", "sa", "bell")
+        )
+    },
+    'Lizardfolk': {
+        'male': (
+            ("Ach", "Ash", "Gar", "Hiss", "Ixi", "Kas", "Ksh", "Ras", "Sak", "Sli", "Sor", "Tass", "Thra", "Vak", "Xar", "Zas", "Zik"),
+            ("", "", "a", "i", "ss", "sh", "ka", "ra", "ith"),
+            ("ak", "ash", "esh", "ik", "iss", "ith", "ix", "ok", "sk", "ssa", "th", "ux", "yr", "zz")
+        ),
+        'female': (
+            ("Ash", "Ess", "Hisa", "Ish", "Kessa", "Lisk", "Saa", "Ssi", "Sura", "Thess", "Vess", "Xisa", "Yssa", "Zhi"),
+            ("", "", "a", "i", "ss", "sh", "li", "ra"),
+            ("a", "ka", "la", "ra", "sha", "ssa", "ith", "ix", "eth", "ess", "isa", "ya")
+        )
+    }
+}
+
+# Tabaxi names are short descriptive phrases
+TABAXI_FIRST = ("Ash", "Bright", "Cloud", "Copper", "Dusk", "Ember", "Feather", "Five", "Gold", "Jade", "Moon", "Quiet", "Rain", "River", "Sand", "Seven", "Smoke", "Storm", "Thunder", "Wind")
+TABAXI_SECOND = ("Bell", "Branch", "Claw", "Drum", "Eyes", "Flame", "Leaf", "Mask", "Paw", "Shadow", "Song", "Step", "Stone", "Tail", "Thorn", "Timber", "Tooth", "Whisker", "Wing", "Zephyr")
+
+ROMAN_NUMERALS = ("II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X")
+
+def generate_half_orc_name(gender, rng=random):
     """
     Generate a Half-orc name based on gender.
     gender: 1 for female, any other value for male
     """
-    male_names = ['Ghazat', 'Abghat', 'Adgulg', 'Aghed', 'Agugh', 'Aguk', 'Almthu', 'Alog', 'Ambilge', 'Apaugh', 'Argha', 'Argigoth', 'Argug', 'Arpigig', 'Auhgan', 'Azhug', 'Bagdud', 'Baghig', 'Bahgigoth', 'Bandagh', 'Barfu', 'Bargulg', 'Baugh', 'Bidgug', 'Bildud', 'Bilge', 'Bog', 'Boghat', 'Bogugh', 'Borgan', 'Borug', 'Braugh', 'Brougha', 'Brugagh', 'Bruigig', 'Buadagh', 'Buggug', 'Builge', 'Buimghig', 'Bulgan', 'Bumhug', 'Buomaugh', 'Buordud', 'Burghed', 'Buugug', 'Cabugbu', 'Cagan', 'Carguk', 'Carthurg', 'Clog', 'Corgak', 'Crothu', 'Cubub', 'Cukgilug', 'Curbag', 'Dabub', 'Dakgorim', 'Dakgu', 'Dalthu', 'Darfu', 'Deakgu', 'Dergu', 'Derthag', 'Digdug', 'Diggu', 'Dilug', 'Ditgurat', 'Dorgarag', 'Dregu', 'Dretkag', 'Drigka', 'Drikdarok', 'Drutha', 'Dudagog', 'Dugarod', 'Dugorim', 'Duiltag', 'Durbag', 'Eagungad', 'Eggha', 'Eggugat', 'Egharod', 'Eghuglat', 'Eichelberbog', 'Ekganit', 'Epkagut', 'Ergoth', 'Ertguth', 'Ewkbanok', 'Fagdud', 'Faghig', 'Fandagh', 'Farfu', 'Farghed', 'Fargigoth', 'Farod', 'Faugh', 'Feldgulg', 'Fidgug', 'Filge', 'Fodagog', 'Fogugh', 'Fozhug', 'Frikug', 'Frug', 'Frukag', 'Fubdagog', 'Fudhagh', 'Fupgugh', 'Furbog', 'Futgarek', 'Gaakt', 'Garekk', 'Gelub', 'Gholug', 'Gilaktug', 'Ginug', 'Gnabadug', 'Gnadug', 'Gnalurg', 'Gnarg', 'Gnarlug', 'Gnorl', 'Gnorth', 'Gnoth', 'Gnurl', 'Golag', 'Golub', 'Gomatug', 'Gomoku', 'Gorgu', 'Gorlag', 'Grikug', 'Grug', 'Grukag', 'Grukk', 'Grung', 'Gruul', 'Guag', 'Gubdagog', 'Gudhagh', 'Gug', 'Gujarek', 'Gujek', 'Gujjab', 'Gulm', 'Gulrn', 'Gunaakt', 'Gunag', 'Gunug', 'Gurukk', 'Guthakug', 'Guthug', 'Gutjja', 'Hagob', 'Hagu', 'Hagub', 'Haguk', 'Hebub', 'Hegug', 'Hibub', 'Hig', 'Hogug', 'Hoknath', 'Hoknuk', 'Hokulk', 'Holkurg', 'Horknuth', 'Hrolkug', 'Hugagug', 'Hugmug', 'Hugolm', 'Ig', 'Igmut', 'Ignatz', 'Ignorg', 'Igubat', 'Igug', 'Igurg', 'Ikgnath', 'Ikkath', 'Inkathu', 'Inkathurg', 'Isagubat', 'Jogug', 'Jokgagu', 'Jolagh', 'Jorgagu', 'Jregh', 'Jreghug', 'Jugag', 'Jughog', 'Jughragh', 'Jukha', 'Jukkhag', 'Julakgh', 'Kabugbu', 'Kagan', 'Kaghed', 'Kahigig', 'Karfu', 'Karguk', 'Karrghed', 'Karrhig', 'Karthurg', 'Kebub', 'Kegigoth', 'Kegth', 'Kerghug', 'Kertug', 'Kilug', 'Klapdud', 'Klog', 'Klughig', 'Knagh', 'Knaraugh', 'Knodagh', 'Knorgh', 'Knuguk', 'Knurigig', 'Kodagog', 'Kog', 'Kogan', 'Komarod', 'Korgak', 'Korgulg', 'Koughat', 'Kraugug', 'Krilge', 'Krothu', 'Krouthu', 'Krugbu', 'Krugorim', 'Kubub', 'Kugbu', 'Kukgilug', 'Kulgha', 'Kupgugh', 'Kurbag', 'Kurmbag', 'Laghed', 'Lamgugh', 'Mabub', 'Magdud', 'Malthu', 'Marfu', 'Margulg', 'Mazhug', 'Meakgu', 'Mergigoth', 'Milug', 'Mudagog', 'Mugarod', 'Mughragh', 'Mugorim', 'Murbag', 'Naghat', 'Naghig', 'Naguk', 'Nahgigoth', 'Nakgu', 'Narfu', 'Nargulg', 'Narhbub', 'Narod', 'Neghed', 'Nehrakgu', 'Nildud', 'Nodagog', 'Nofhug', 'Nogugh', 'Nomgulg', 'Noogugh', 'Nugbu', 'Nughilug', 'Nulgha', 'Numhug', 'Nurbag', 'Nurghed', 'Oagungad', 'Oakgu', 'Obghat', 'Oggha', 'Oggugat', 'Ogharod', 'Oghuglat', 'Oguk', 'Ohomdud', 'Ohulhug', 'Oilug', 'Okganit', 'Olaghig', 'Olaugh', 'Olmthu', 'Olodagh', 'Olog', 'Omaghed', 'Ombilge', 'Omegugh', 'Omogulg', 'Omugug', 'Onog', 'Onubub', 'Onugug', 'Oodagh', 'Oogorim', 'Oogugbu', 'Oomigig', 'Opathu', 'Opaugh', 'Opeghat', 'Opilge', 'Opkagut', 'Opoguk', 'Oquagan', 'Orgha', 'Orgoth', 'Orgug', 'Orpigig', 'Ortguth', 'Otugbu', 'Ougha', 'Ougigoth', 'Ouhgan', 'Owkbanok', 'Paghorim', 'Pahgigoth', 'Pahgorim', 'Pakgu', 'Parfu', 'Pargu', 'Parhbub', 'Parod', 'Peghed', 'Pehrakgu', 'Pergu', 'Perthag', 'Pigdug', 'Piggu', 'Pitgurat', 'Podagog', 'Pofhug', 'Pomgulg', 'Poogugh', 'Porgarag', 'Pregu', 'Pretkag', 'Prigka', 'Prikdarok', 'Prutha', 'Pughilug', 'Puiltag', 'Purbag', 'Qog', 'Quadagh', 'Quilge', 'Quimghig', 'Quomaugh', 'Quordud', 'Quugug', 'Raghat', 'Raguk', 'Rakgu', 'Rarfu', 'Rebub', 'Rilug', 'Rodagog', 'Rogan', 'Romarod', 'Routhu', 'Rugbu', 'Rugorim', 'Rurbag', 'Rurigig', 'Sabub', 'Saghig', 'Sahgigoth', 'Sahgorim', 'Sakgu', 'Salthu', 'Saraugug', 'Sarfu', 'Sargulg', 'Sarhbub', 'Sarod', 'Sbghat', 'Seakgu', 'Sguk', 'Shomdud', 'Shulhug', 'Sildud', 'Silge', 'Silug', 'Sinsbog', 'Slaghig', 'Slapdud', 'Slaugh', 'Slodagh', 'Slog', 'Slughig', 'Smaghed', 'Smegugh', 'Smogulg', 'Snog', 'Snubub', 'Snugug', 'Sodagh', 'Sog', 'Sogorim', 'Sogugbu', 'Sogugh', 'Sombilge', 'Somigig', 'Sonagh', 'Sorgulg', 'Sornaraugh', 'Soughat', 'Spathu', 'Speghat', 'Spilge', 'Spoguk', 'Squagan', 'Stugbu', 'Sudagog', 'Sugarod', 'Sugbu', 'Sugha', 'Sugigoth', 'Sugorim', 'Suhgan', 'Sulgha', 'Sulmthu', 'Sumhug', 'Sunodagh', 'Sunuguk', 'Supaugh', 'Supgugh', 'Surbag', 'Surgha', 'Surghed', 'Surgug', 'Surpigig', 'Tagdud', 'Taghig', 'Tandagh', 'Tarfu', 'Targhed', 'Targigoth', 'Tarod', 'Taugh', 'Teldgulg', 'Tidgug', 'Tilge', 'Todagog', 'Tog', 'Toghat', 'Togugh', 'Torgan', 'Torug', 'Tozhug', 'Traugh', 'Trilug', 'Trougha', 'Trugagh', 'Truigig', 'Tuggug', 'Tulgan', 'Turbag', 'Turge', 'Ug', 'Ugghra', 'Uggug', 'Ughat', 'Ulgan', 'Ulmragha', 'Ulmrougha', 'Umhra', 'Umragig', 'Umruigig', 'Ungagh', 'Unrugagh', 'Urag', 'Uraugh', 'Urg', 'Urgan', 'Urghat', 'Urgran', 'Urlgan', 'Urmug', 'Urug', 'Urulg', 'Vabugbu', 'Vagan', 'Vagrungad', 'Vagungad', 'Vakgar', 'Vakgu', 'Vakmu', 'Valthurg', 'Vambag', 'Vamugbu', 'Varbu', 'Varbuk', 'Varfu', 'Vargan', 'Varguk', 'Varkgorim', 'Varthurg', 'Vegum', 'Vergu', 'Verlgu', 'Verthag', 'Verthurg', 'Vetorkag', 'Vidarok', 'Vigdolg', 'Vigdug', 'Viggu', 'Viggulm', 'Viguka', 'Vitgurat', 'Vitgut', 'Vlog', 'Vlorg', 'Vorgak', 'Vorgarag', 'Vothug', 'Vregu', 'Vretkag', 'Vrigka', 'Vrikdarok', 'Vrogak', 'Vrograg', 'Vrothu', 'Vruhag', 'Vrutha', 'Vubub', 'Vugub', 'Vuiltag', 'Vukgilug', 'Vultog', 'Vulug', 'Vurbag', 'Wakgut', 'Wanug', 'Wapkagut', 'Waruk', 'Wauktug', 'Wegub', 'Welub', 'Wholug', 'Wilaktug', 'Wingloug', 'Winug', 'Woabadug', 'Woggha', 'Woggugat', 'Wogharod', 'Woghuglat', 'Woglug', 'Wokganit', 'Womkug', 'Womrikug', 'Wonabadug', 'Worthag', 'Wraog', 'Wrug', 'Wrukag', 'Wrukaog', 'Wubdagog', 'Wudgh', 'Wudhagh', 'Wudugog', 'Wuglat', 'Wumanok', 'Wumkbanok', 'Wurgoth', 'Wurmha', 'Wurtguth', 'Wurthu', 'Wutgarek', 'Xaakt', 'Xago', 'Xagok', 'Xagu', 'Xaguk', 'Xarlug', 'Xarpug', 'Xegug', 'Xepug', 'Xig', 'Xnath', 'Xnaurl', 'Xnurl', 'Xoknath', 'Xokuk', 'Xolag', 'Xolkug', 'Xomath', 'Xomkug', 'Xomoku', 'Xonoth', 'Xorag', 'Xorakk', 'Xoroku', 'Xoruk', 'Xothkug', 'Xruul', 'Xuag', 'Xug', 'Xugaa', 'Xugag', 'Xugagug', 'Xugar', 'Xugarf', 'Xugha', 'Xugor', 'Xugug', 'Xujarek', 'Xuk', 'Xulgag', 'Xunaakt', 'Xunag', 'Xunug', 'Xurek', 'Xurl', 'Xurug', 'Xurukk', 'Xutag', 'Xuthakug', 'Xutjja', 'Yaghed', 'Yagnar', 'Yagnatz', 'Yahg', 'Yahigig', 'Yakgnath', 'Yakha', 'Yalakgh', 'Yargug', 'Yegigoth', 'Yegoth', 'Yerghug', 'Yerug', 'Ymafubag', 'Yokgagu', 'Yokgu', 'Yolmar', 'Yonkathu', 'Yregh', 'Yroh', 'Ysagubar', 'Yughragh', 'Yugug', 'Yukgnath', 'Yukha', 'Yulakgh', 'Yunkathu', 'Zabghat', 'Zabub', 'Zaghig', 'Zahgigoth', 'Zahgorim', 'Zalthu', 'Zaraugug', 'Zarfu', 'Zargulg', 'Zarhbub', 'Zarod', 'Zeakgu', 'Zguk', 'Zildud', 'Zilge', 'Zilug', 'Zinsbog', 'Zlapdud', 'Zlog', 'Zlughig', 'Zodagh', 'Zog', 'Zogugbu', 'Zogugh', 'Zombilge', 'Zonagh', 'Zorfu', 'Zorgulg', 'Zorhgigoth', 'Zornaraugh', 'Zoughat', 'Zudagog', 'Zugarod', 'Zugbu', 'Zugorim', 'Zuhgan', 'Zulgha', 'Zulmthu', 'Zumhug', 'Zunodagh', 'Zunuguk', 'Zupaugh', 'Zupgugh', 'Zurbag', 'Zurgha', 'Zurghed', 'Zurgug', 'Zurpigig', 'Atulg', 'Azuk', 'Bagamul', 'Bakh', 'Baronk', 'Bashag', 'Bazgulub', 'Bogakh', 'Borug', 'Both', 'Bugdul', 'Bugharz', 'Bugrash', 'Bugrol', 'Bumbub', 'Burul', 'Dul', 'Dular', 'Duluk', 'Duma', 'Dumbuk', 'Dumburz', 'Dur', 'Durbul', 'Durgash', 'Durz', 'Durzol', 'Durzub', 'Durzum', 'Garothmuk', 'Garzonk', 'Gashna', 'Ghamborz', 'Ghamonk', 'Ghoragdush', 'Ghorlorz', 'Glush', 'Grat', 'Guarg', 'Gurak', 'Khadba', 'Khagra', 'Khargol', 'Koffutto', 'Largakh', 'Lorbumol', 'Lorzub', 'Lugdum', 'Lugrub', 'Lurog', 'Mash', 'Matuk', 'Mauhul', 'Mazorn', 'Mol', 'Morbash', 'Mug', 'Mugdul', 'Muk', 'Murag', 'Murkub', 'Murzol', 'Muzgonk', 'Nag', 'Nar', 'Nash', 'Ogrul', 'Ogrumbu', 'Olfin', 'Olumba', 'Orakh', 'Rogdul', 'Shakh', 'Shamar', 'Shamob', 'Shargam', 'Sharkub', 'Shat', 'Shulong', 'Shura', 'Shurkul', 'Shuzug', 'Snaglak', 'Snakha', 'Snat', 'Ugdumph', 'Ughash', 'Ulam', 'Umug', 'Uram', 'Urim', 'Urul', 'Urzog', 'Ushamph', 'Yadba', 'Yagak', 'Yak', 'Yam', 'Yambagorn', 'Yambul', 'Yargol', 'Yashnarz', 'Yatur', 'Agronak', 'Bat', 'Bazur', 'Brugo', 'Bogrum', 'Brag', 'Brokil', 'Bugak', 'Buramog', 'Burz', 'Dubok', 'Dul', 'Dulfish', 'Dumag', 'Dulphumph', 'Gaturn', 'Gogron', 'Gorgo', 'Graklak', 'Graman', 'Grommok', 'Gul', 'Hanz', 'Krognak', 'Kurdan', 'Kurz', 'Rugdumph', 'Lum', 'Lumdum', 'Luronk', 'Magra', 'Magub', 'Maknok', 'Mug', 'Orok', 'Shagol', 'Shagrol', 'Shobob', 'Shum', 'Ulmug', 'Urbul', 'Urul', 'Ushnar', 'Uzul', 'Arob', 'Balogog', 'Borkul', 'Burguk', 'Dushnamub', 'Gat', 'Ghamorz', 'Ghorbash', 'Gradba', 'Grogmar', 'Grushnag', 'Gularzob', 'Kharag', 'Larek', 'Lob', 'Lurbuk', 'Mahk', 'Makhel', 'Abbas', 'Mauhulakh', 'Moth', 'Mul', 'Mulush', 'Nagrub', 'Oglub', 'Ogol', 'Olur', 'Ulag', 'Umurn', 'Urag', 'Yamarz', 'Yar']
-
-    female_names = ['Agrob', 'Badbog', 'Bashuk', 'Bogdub', 'Bugdurash', 'Bula', 'Bulak', 'Bulfim', 'Bum', 'Burzob', 'Burub', 'Dura', 'Durgat', 'Durz', 'Gashnakh', 'Ghob', 'Glasha', 'Glob', 'Gluronk', 'Gonk', 'Grat', 'Grazob', 'Gulfim', 'Kharzug', 'Lagakh', 'Lambug', 'Lazgar', 'Mogak', 'Morn', 'Murob', 'Murzush', 'Nargol', 'Rolfish', 'Orbul', 'Ragash', 'Rulfim', 'Shadbak', 'Shagar', 'Shagdub', 'Sharn', 'Sharog', 'Shazgob', 'Shelur', 'Uloth', 'Ulumpha', 'Urzoth', 'Urzul', 'Ushat', 'Ushug', 'Yazgash', 'Batul', 'Borba', 'Bumph', 'Homraz', 'Rogbut', 'Mazoga', 'Mog', 'Mor', 'Oghash', 'Rogmesh', 'Snak', 'Ugak', 'Umog', 'Arob', 'Atub', 'Bagrak', 'Bolar', 'Bor', 'Borgakh', 'Dulug', 'Garakh', 'Ghak', 'Gharol', 'Ghorza', 'Gul', 'Lash', 'Murbol', 'Sharamph', 'Shel', 'Shufharz', 'Ugor', 'Urog', 'Yotul']
-
     if gender == 1:  # Female
-        return random.choice(female_names)
+        return rng.choice(HALF_ORC_FEMALE_NAMES)
     else:  # Male
-        return random.choice(male_names)
+        return rng.choice(HALF_ORC_MALE_NAMES)
 
-def generate_goblin_name(gender):
+def generate_goblin_name(gender, rng=random):
     """
     Generate a goblin name based on gender.
     gender: 1 for female, any other value for male
     """
-    # Name components
-    nm1 = ["", "", "", "", "", "", "", "b", "c", "d", "f", "g", "h", "j", "k", "l", "p", "r", "t", "v", "w", "x", "z", "br", "bl", "cr", "cl", "ch", "dr", "fr", "gr", "gl", "gn", "kr", "kl", "pr", "pl", "str", "st", "sr", "sl", "tr", "vr", "wr", "zr"]
-    nm2 = ["a", "e", "i", "o", "u", "a", "e", "i", "o", "u", "a", "e", "i", "o", "u", "y", "ia", "io", "ee", "aa", "ui", "ie", "ea", "oi"]
-    nm3 = ["b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "b", "d", "g", "h", "k", "l", "m", "n", "r", "s", "t", "v", "z", "bb", "bd", "bh", "bl", "bk", "bn", "br", "bs", "bt", "bz", "db", "dd", "df", "dh", "dl", "dn", "dr", "ds", "dv", "dz", "", "gg", "gb", "gd", "gh", "gk", "gl", "gm", "gn", "gr", "gs", "gt", "gz", "hd", "hb", "hk", "hn", "hz", "kl", "kn", "kz", "kv", "kk", "lb", "ld", "lg", "lk", "ll", "lr", "ls", "lt", "lv", "lz", "mr", "mv", "mz", "mt", "nr", "nv", "nz", "nt", "rb", "rd", "rg", "rk", "rl", "rm", "rn", "rr", "rs", "rt", "rv", "rz", "sb", "sd", "sh", "sk", "sm", "sn", "sr", "str", "st", "sv", "sz", "ss", "tb", "tl", "tm", "tn", "tr", "tv", "tz", "tt", "vl", "vn", "vr", "vz", "zb", "zd", "zg", "zl", "zm", "zn", "zt"]
-    nm4 = ["c", "g", "k", "l", "q", "r", "t", "x", "z", "nk", "ld", "rd", "s", "sz", "zz", "ng", "kz", "lb", "rm", "sb", "bs", "ts", "cs", "ct", "gs", "gz", "kt", "kx", "lk", "lx", "rk", "rt", "rd", "rx"]
-    nm5 = ["", "", "", "", "", "", "", "b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "q", "r", "s", "t", "v", "w", "bh", "br", "bl", "cr", "cl", "ch", "fr", "fl", "gr", "gl", "gn", "kh", "kl", "ph", "pr", "sh", "st", "sr", "sl", "sw", "th", "thr", "tr", "vr", "wr"]
-    nm6 = ["b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "b", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "bb", "bd", "bh", "bl", "bk", "bn", "br", "bs", "bt", "bz", "fb", "fl", "fm", "fn", "fs", "ft", "gg", "gb", "gd", "gh", "gk", "gl", "gm", "gn", "gr", "gs", "gt", "gz", "hd", "hb", "hk", "hn", "hz", "kl", "kn", "kz", "kv", "kk", "lb", "ld", "lg", "lk", "ll", "lr", "ls", "lt", "lv", "lz", "mr", "mv", "mz", "mt", "nr", "nv", "nz", "nt", "ph", "pf", "pl", "pn", "pm", "pr", "ps", "pt", "pv", "rb", "rd", "rg", "rk", "rl", "rm", "rn", "rr", "rs", "rt", "rv", "rz", "sb", "sd", "sh", "sk", "sm", "sn", "sr", "str", "st", "sv", "sz", "ss", "tb", "tl", "tm", "tn", "tr", "tv", "tz", "tt", "vl", "vn", "vr", "vz"]
-    nm7 = ["h", "f", "g", "l", "n", "q", "s", "x", "z", "ls", "nk", "zz", "ld", "sh", "sz", "ss", "gs", "sx", "lx", "hx", "th", "rx", "rt", "ft", "fs", "fz", "lm", "lk", "lt", "ng", "nx", "ns", "nq"]
-    nm8 = ["e", "i", "ee", "ia", "ea", "a", "ai", "", "", "", "", "", "", "", "", "", "", "", "", ""]
-
     # Random number to determine name length
-    i = random.randint(0, 9)
+    i = rng.randint(0, 9)
     
     # Get random vowels
-    rnd2 = random.choice(nm2)
-    rnd2b = random.choice(nm2)
+    rnd2 = rng.choice(GOBLIN_NM2)
+    rnd2b = rng.choice(GOBLIN_NM2)
 
     if gender == 1:  # Female
-        rnd5 = random.choice(nm5)
-        rnd7 = random.choice(nm7)
-        rnd8 = random.choice(nm8)
+        rnd5 = rng.choice(GOBLIN_NM5)
+        rnd7 = rng.choice(GOBLIN_NM7)
+        rnd8 = rng.choice(GOBLIN_NM8)
         
         if i < 5:
             return rnd5 + rnd2 + rnd7 + rnd8
         else:
-            rnd6 = random.choice(nm6)
+            rnd6 = rng.choice(GOBLIN_NM6)
             return rnd5 + rnd2 + rnd6 + rnd2b + rnd7 + rnd8
     else:  # Male
-        rnd5 = random.choice(nm1)
-        rnd7 = random.choice(nm4)
+        rnd5 = rng.choice(GOBLIN_NM1)
+        rnd7 = rng.choice(GOBLIN_NM4)
         
         if i < 5:
             return rnd5 + rnd2 + rnd7
         else:
-            rnd3 = random.choice(nm3)
-            return rnd5 + rnd2 + rnd3 + rnd2b + rnd7
\ No newline at end of file
+            rnd3 = rng.choice(GOBLIN_NM3)
+            return rnd5 + rnd2 + rnd3 + rnd2b + rnd7
+
+def generate_syllable_name(race, gender, rng=random):
+    """
+    Generate a name from the syllable tables of a race.
+    gender: 1 for female, any other value for male
+    """
+    prefixes, middles, suffixes = SYLLABLE_TABLES[race]['female' if gender == 1 else 'male']
+    return rng.choice(prefixes) + rng.choice(middles) + rng.choice(suffixes)
+
+def generate_half_elf_name(gender, rng=random):
+    """
+    Generate a Half-elf name by mixing human and elven syllables.
+    gender: 1 for female, any other value for male
+    """
+    key = 'female' if gender == 1 else 'male'
+    first, second = rng.sample(('Human', 'Elf'), 2)
+    return rng.choice(SYLLABLE_TABLES[first][key][0]) + rng.choice(SYLLABLE_TABLES[second][key][2])
+
+def generate_tabaxi_name(gender, rng=random):
+    """
+    Generate a Tabaxi name. Tabaxi names are not gendered.
+    """
+    return rng.choice(TABAXI_FIRST) + ' ' + rng.choice(TABAXI_SECOND)
+
+# Name generator for every playable race
+NAME_GENERATORS = {
+    'Human': lambda gender, rng: generate_syllable_name('Human', gender, rng),
+    'Elf': lambda gender, rng: generate_syllable_name('Elf', gender, rng),
+    'Dwarf': lambda gender, rng: generate_syllable_name('Dwarf', gender, rng),
+    'Halfling': lambda gender, rng: generate_syllable_name('Halfling', gender, rng),
+    'Gnome': lambda gender, rng: generate_syllable_name('Gnome', gender, rng),
+    'Half-Orc': generate_half_orc_name,
+    'Half-Elf': generate_half_elf_name,
+    'Lizardfolk': lambda gender, rng: generate_syllable_name('Lizardfolk', gender, rng),
+    'Tabaxi': generate_tabaxi_name,
+    'Goblin': lambda gender, rng: generate_goblin_name(gender, rng).capitalize()
+}
+
+def generate_name(race, gender=None, rng=random):
+    """
+    Generate a name for a character of the given race.
+    gender: 1 for female, 0 for male, None to pick at random
+    rng: random source to draw from
+    """
+    if race not in NAME_GENERATORS:
+        raise ValueError(f"No name generator for race: {race}")
+    if gender is None:
+        gender = rng.randint(0, 1)
+    return NAME_GENERATORS[race](gender, rng)
+
+def generate_names(race, count, gender=None, used_names=None, max_attempts=20, rng=random):
+    """
+    Generate several names for a race.
+    used_names: optional set of names already taken this session. When given,
+    every returned name is unique within it and is added to it. A name that
+    keeps colliding gets a numeral suffix, so this always terminates.
+    rng: random source to draw from
+    """
+    names = []
+    for _ in range(count):
+        name = generate_name(race, gender, rng)
+        if used_names is not None:
+            attempts = 1
+            while name in used_names and attempts < max_attempts:
+                name = generate_name(race, gender, rng)
+                attempts += 1
+            if name in used_names:
+                base = name
+                for numeral in ROMAN_NUMERALS:
+                    name = f"{base} {numeral}"
+                    if name not in used_names:
+                        break
+                else:
+                    name = f"{base} {len(used_names) + 1}"
+            used_names.add(name)
+        names.append(name)
+    return names
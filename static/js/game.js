@@ -40,12 +40,19 @@ document.getElementById('char-class').addEventListener('change', updateAvailable
 function init() {
     // Add keyboard controls
     document.addEventListener('keydown', handleKeyPress);
+    asciiMap.addEventListener('click', handleMapClick);
+    loadMonsterTemplates();
     
     // Initialize character sheets
     updateCharacterSheets();
     
     // Initialize tab switching
     initializeTabs();
+    
+    // Wire combat buttons to the combat endpoint
+    document.querySelectorAll('.combat-action').forEach(button => {
+        button.addEventListener('click', () => handleCombatAction(button.textContent));
+    });
 }
 
 // Initialize tab switching
@@ -379,6 +386,7 @@ function updateCharacterSheets() {
     console.log("Updating character sheets...");  // Debug log
     console.log("Current game state:", gameState);  // Debug log
     
+    const statsDivs = [];
     characterSheets.forEach((sheet, index) => {
         const character = gameState.party[index];
         console.log(`Character ${index}:`, character);  // Debug log
@@ -482,26 +490,40 @@ function updateCharacterSheets() {
                 </div>
             `;
 
-            // Fetch XP needed for next level
-            fetchXPRequirement(character, statsDiv);
+            statsDivs.push([character, statsDiv]);
         } else {
             sheet.querySelector('.char-stats').innerHTML = '<p>No character</p>';
             sheet.querySelector('.char-inventory').innerHTML = '';
             sheet.querySelector('.char-skills').innerHTML = '';
         }
     });
+
+    // Fetch XP needed for next level for the whole party in one request
+    if (statsDivs.length > 0) {
+        fetchXPRequirements(statsDivs);
+    }
 }
 
-async function fetchXPRequirement(character, statsDiv) {
+async function fetchXPRequirements(statsDivs) {
+    const setNextLevel = (statsDiv, text) => {
+        const nextLevelElement = statsDiv.querySelector('.basic-info p:nth-child(6)');
+        if (nextLevelElement) {
+            nextLevelElement.textContent = text;
+        }
+    };
+
     try {
-        const response = await fetch(`${API_BASE_URL}/api/rules/xp-for-level`, {
+        const response = await fetch(`${API_BASE_URL}/api/rules/batch`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-                characterClass: character.characterClass,
-                level: character.level
+                queries: statsDivs.map(([character]) => ({
+                    type: 'xp-for-level',
+                    characterClass: character.characterClass,
+                    level: character.level
+                }))
             })
         });
 
@@ -510,72 +532,171 @@ async function fetchXPRequirement(character, statsDiv) {
         }
 
         const data = await response.json();
-        const nextLevelElement = statsDiv.querySelector('.basic-info p:nth-child(6)');
-        if (nextLevelElement) {
-            nextLevelElement.textContent = `Next Level: ${data.xp}`;
-        }
+        statsDivs.forEach(([character, statsDiv], index) => {
+            const result = data.results[index];
+            setNextLevel(statsDiv, result && result.xp !== undefined
+                ? `Next Level: ${result.xp}`
+                : 'Next Level: Error loading');
+        });
     } catch (error) {
-        console.error('Error fetching XP requirement:', error);
-        const nextLevelElement = statsDiv.querySelector('.basic-info p:nth-child(6)');
-        if (nextLevelElement) {
-            nextLevelElement.textContent = 'Next Level: Error loading';
-        }
+        console.error('Error fetching XP requirements:', error);
+        statsDivs.forEach(([character, statsDiv]) => setNextLevel(statsDiv, 'Next Level: Error loading'));
     }
 }
 
 // Dungeon generation and movement
 async function startDungeon() {
+    await syncState();
+}
+
+// ETag of the last full state fetched; the server answers 304 while it still matches
+let stateTag = null;
+
+// Fetch the full state unless the server says our copy is current
+async function syncState() {
     try {
-        const response = await fetch(`${API_BASE_URL}/api/game/state`);
+        const headers = stateTag ? { 'If-None-Match': stateTag } : {};
+        const response = await fetch(`${API_BASE_URL}/api/game/state`, { headers });
         if (response.ok) {
+            stateTag = response.headers.get('ETag');
             gameState = await response.json();
             renderDungeon();
+            updateCharacterSheets();
         }
     } catch (error) {
         addMessage('Error: ' + error.message);
     }
 }
 
+// Map cells: one span per tile, built once per level and repainted in place
+let mapCells = [];
+// Cell index (y * width + x) -> party member standing there
+let partyByCell = new Map();
+
+function cellIndex(x, y) {
+    return y * gameState.dungeon[0].length + x;
+}
+
+function indexParty() {
+    partyByCell = new Map();
+    gameState.party.forEach(char => {
+        partyByCell.set(cellIndex(char.position.x, char.position.y), char);
+    });
+}
+
 function renderDungeon() {
     if (!gameState.dungeon) return;
     
-    let mapString = '';
+    asciiMap.innerHTML = '';
+    mapCells = [];
+    indexParty();
+    
+    const fragment = document.createDocumentFragment();
     for (let y = 0; y < gameState.dungeon.length; y++) {
+        const row = [];
         for (let x = 0; x < gameState.dungeon[y].length; x++) {
-            const tile = gameState.dungeon[y][x];
             const span = document.createElement('span');
-            
-            // Check if this position has a party member
-            const partyMember = gameState.party.find(char => 
-                char.position.x === x && char.position.y === y
-            );
-            
-            if (partyMember) {
-                span.textContent = '@';
-                span.style.color = getClassColor(partyMember.characterClass);
-                span.title = partyMember.name;
-                span.style.cursor = 'help';
-            } else if (!tile.visible) {
-                span.textContent = ' ';
-                span.style.color = '#000000';
-                span.style.backgroundColor = '#000000';
-            } else {
-                span.textContent = tile.char;
-                span.style.color = tile.color;
-                
-                // Add tooltip for monsters
-                if (tile.monster_data) {
-                    span.title = tile.monster_data.name;
-                    span.style.cursor = 'help';
-                }
-            }
-            
-            asciiMap.appendChild(span);
+            span.dataset.x = x;
+            span.dataset.y = y;
+            row.push(span);
+            fragment.appendChild(span);
+        }
+        mapCells.push(row);
+        fragment.appendChild(document.createElement('br'));
+    }
+    
+    for (let y = 0; y < mapCells.length; y++) {
+        for (let x = 0; x < mapCells[y].length; x++) {
+            paintCell(x, y);
+        }
+    }
+    asciiMap.appendChild(fragment);
+}
+
+function paintCell(x, y) {
+    const span = mapCells[y][x];
+    const tile = gameState.dungeon[y][x];
+    const partyMember = partyByCell.get(cellIndex(x, y));
+    
+    span.title = '';
+    span.style.cursor = '';
+    span.style.backgroundColor = '';
+    
+    if (partyMember) {
+        span.textContent = '@';
+        span.style.color = getClassColor(partyMember.characterClass);
+        span.title = partyMember.name;
+        span.style.cursor = 'help';
+    } else if (!tile.visible) {
+        span.textContent = ' ';
+        span.style.color = '#000000';
+        span.style.backgroundColor = '#000000';
+    } else {
+        span.textContent = tile.char;
+        span.style.color = tile.color;
+        
+        // Add tooltip for monsters
+        if (tile.monster_data) {
+            span.title = monsterName(tile.monster_data);
+            span.style.cursor = 'help';
+        }
+    }
+}
+
+// Apply a delta response, or refetch the full state if it was made against a version we never saw
+function applyDelta(result) {
+    if (gameState.version !== undefined && result.baseVersion !== gameState.version) {
+        syncState();
+        return;
+    }
+    applyMapChanges(result.tiles, result.party);
+    gameState.version = result.version;
+}
+
+// Apply the tiles and party the server reported as changed, repainting only those cells
+function applyMapChanges(tiles, party) {
+    if (party) {
+        gameState.party = party;
+    }
+    if (!gameState.dungeon) return;
+    if (mapCells.length !== gameState.dungeon.length) {
+        (tiles || []).forEach(tile => { gameState.dungeon[tile.y][tile.x] = tile; });
+        renderDungeon();
+        return;
+    }
+    
+    // Cells the party stood on before and after, plus every changed tile
+    const dirty = new Set(partyByCell.keys());
+    indexParty();
+    partyByCell.forEach((char, index) => dirty.add(index));
+    (tiles || []).forEach(tile => {
+        gameState.dungeon[tile.y][tile.x] = tile;
+        dirty.add(cellIndex(tile.x, tile.y));
+    });
+    
+    const width = gameState.dungeon[0].length;
+    dirty.forEach(index => paintCell(index % width, Math.floor(index / width)));
+}
+
+// Monster templates by id, fetched once; map tiles only carry instance fields
+let monsterTemplates = {};
+
+async function loadMonsterTemplates() {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/monsters`);
+        if (response.ok) {
+            monsterTemplates = await response.json();
         }
-        asciiMap.appendChild(document.createElement('br'));
+    } catch (error) {
+        console.error('Error fetching monster templates:', error);
     }
 }
 
+function monsterName(monster) {
+    const template = monsterTemplates[monster.template];
+    return template ? template.name : (monster.name || 'Monster');
+}
+
 // Helper function to get class color
 function getClassColor(characterClass) {
     const classColors = {
@@ -593,14 +714,7 @@ function getClassColor(characterClass) {
 }
 
 function updateMap() {
-    // Clear the map
-    asciiMap.innerHTML = '';
-    
-    // Get party position (assuming first character's position)
-    const partyX = gameState.party[0].position.x;
-    const partyY = gameState.party[0].position.y;
-    
-    // Render the updated map
+    // A whole new state (e.g. a loaded game): rebuild the grid
     renderDungeon();
 }
 
@@ -626,6 +740,13 @@ function handleKeyPress(event) {
         case 'd':
             direction = 'east';
             break;
+        case '<':
+        case '>':
+            useStairs();
+            return;
+        case 'x':
+            walkParty('explore', {});
+            return;
         default:
             return;
     }
@@ -633,43 +754,123 @@ function handleKeyPress(event) {
     moveParty(direction);
 }
 
-async function moveParty(direction) {
+// Moves pressed while a move request is in flight; sent together as the next batch
+let queuedMoves = [];
+let moveInFlight = false;
+const MAX_MOVE_BATCH = 32;
+
+function moveParty(direction) {
+    if (queuedMoves.length < MAX_MOVE_BATCH) {
+        queuedMoves.push(direction);
+    }
+    if (!moveInFlight) {
+        sendQueuedMoves();
+    }
+}
+
+async function sendQueuedMoves() {
+    moveInFlight = true;
     try {
-        const response = await fetch(`${API_BASE_URL}/api/game/move`, {
+        while (queuedMoves.length && !gameState.inCombat) {
+            const directions = queuedMoves;
+            queuedMoves = [];
+            const response = await fetch(`${API_BASE_URL}/api/game/move`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ directions, delta: true })
+            });
+            
+            if (!response.ok) break;
+            const result = await response.json();
+            if (result.success) {
+                applyDelta(result);
+                updateCharacterSheets();
+            }
+            result.steps.forEach(step => {
+                if (step.message) {
+                    addMessage(step.message);
+                }
+            });
+            if (result.encounter) {
+                queuedMoves = [];
+                startCombat();
+            }
+        }
+    } catch (error) {
+        addMessage('Error: ' + error.message);
+    } finally {
+        queuedMoves = [];
+        moveInFlight = false;
+    }
+}
+
+// Travel to a map cell, or auto-explore, in one request; the server walks step by step
+async function walkParty(command, body) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/game/${command}`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ direction })
+            body: JSON.stringify({ ...body, delta: true })
         });
         
-        if (response.ok) {
-            const result = await response.json();
-            if (result.success) {
-                gameState = result.gameState;
-                updateMap();
-                updateCharacterSheets();
-            }
-            if (result.message) {
-                addMessage(result.message);
+        const result = await response.json();
+        if (!response.ok) {
+            addMessage(result.error || 'Cannot go there');
+            return;
+        }
+        if (result.success) {
+            applyDelta(result);
+            updateCharacterSheets();
+        }
+        if (result.message) {
+            addMessage(result.message);
+        }
+        if (result.encounter) {
+            startCombat();
+        }
+    } catch (error) {
+        addMessage('Error: ' + error.message);
+    }
+}
+
+function handleMapClick(event) {
+    const span = event.target;
+    if (gameState.inCombat || span.dataset.x === undefined) return;
+    walkParty('travel', { x: Number(span.dataset.x), y: Number(span.dataset.y) });
+}
+
+async function useStairs() {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/game/stairs`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
             }
+        });
+        
+        const result = await response.json();
+        if (!response.ok) {
+            addMessage(result.error || 'Cannot use stairs');
+            return;
         }
+        gameState = result.gameState;
+        updateMap();
+        updateCharacterSheets();
+        addMessage(result.message);
     } catch (error) {
         addMessage('Error: ' + error.message);
     }
 }
 
 // Combat handling
-function startCombat(monsters) {
+function startCombat() {
     gameState.inCombat = true;
-    gameState.combat = {
-        monsters,
-        currentTurn: 0,
-        initiative: []
-    };
-    
     combatInterface.classList.remove('hidden');
-    rollInitiative();
+    handleCombatAction('start');
 }
 
 async function handleCombatAction(action) {
@@ -682,14 +883,20 @@ async function handleCombatAction(action) {
             body: JSON.stringify({ action })
         });
         
-        if (response.ok) {
-            const result = await response.json();
-            if (result.message) {
-                addMessage(result.message);
-            }
-            if (result.combatEnded) {
+        const result = await response.json();
+        if (!response.ok) {
+            addMessage(result.error || 'Combat action failed');
+            if (!gameState.combat) {
                 endCombat();
             }
+            return;
+        }
+        
+        (result.messages || [result.message]).forEach(addMessage);
+        gameState.combat = result.combat;
+        applyDelta(result);
+        if (result.combatEnded) {
+            endCombat();
         }
     } catch (error) {
         addMessage('Error: ' + error.message);
@@ -1,7 +1,29 @@
+import json
+import random
 import unittest
+import numpy as np
+import name_gen
 from backend.adnd_rules import ADnDRules
 from backend.game_state import GameState
-from backend.dungeon_generator import DungeonGenerator
+from backend.dungeon_generator import DungeonGenerator, Room
+from backend.party_generator import PartyGenerator
+from backend.character import Character, SAVE_VERSION
+from backend.game_engine import Combat, Combatant, TurnScheduler
+from backend.monster_ai import MonsterAI, CHASE, FLEE
+from backend.pathfinding import (ConnectivityIndex, PathGraph, distance_map, find_path, find_path_hierarchical,
+                                 passable_mask, UNREACHED)
+from backend.game_session import GameSession
+from backend.floor_index import FloorIndex
+from backend.monsters import load_templates, spawn
+from backend.encounters import AliasTable, encounter_table, hit_dice_count
+from backend.treasure import describe, treasure_engine
+from backend.spell_index import level_key, spell_index
+from backend.spell_utils import get_random_spells, load_spells
+from backend.level_store import LevelStore, pack_level, unpack_level
+from backend.simulation import play_session, run_bots
+from backend.benchmark import compare_to_baseline, measure
+from backend import metrics
+from backend.app import app, dungeon_generator, game_state
 
 class TestADnDRules(unittest.TestCase):
     def test_ability_scores(self):
@@ -20,6 +42,104 @@ class TestADnDRules(unittest.TestCase):
         hp = ADnDRules.calculate_hit_points('Fighter', 1, 0)
         self.assertTrue(1 <= hp <= 10)
 
+    def test_rule_tables(self):
+        self.assertEqual(ADnDRules.calculate_thac0('Fighter', 7), 18)
+        self.assertEqual(ADnDRules.calculate_xp_for_level('Thief', 3), 5000)
+        saves = ADnDRules.calculate_saving_throws('Cleric', 4)
+        self.assertEqual(saves['Death'], 10)
+        # Callers must not be able to corrupt the shared tables
+        saves['Death'] = 99
+        self.assertEqual(ADnDRules.calculate_saving_throws('Cleric', 4)['Death'], 10)
+        # Levels beyond the tables fall back to the formulas
+        self.assertEqual(ADnDRules.calculate_thac0('Fighter', 40), 7)
+
+    def test_rule_table_arrays(self):
+        fighter = ADnDRules.get_class_id('Fighter')
+        thief = ADnDRules.get_class_id('Thief')
+        self.assertEqual(list(ADnDRules.thac0_array([fighter, thief], [1, 10])), [20, 17])
+        saves = ADnDRules.saving_throws_array([thief], [1])
+        self.assertEqual(list(saves[0]), [13, 14, 12, 16, 15])
+        self.assertEqual(list(ADnDRules.xp_for_level_array([fighter], [2])), [4000])
+        with self.assertRaises(ValueError):
+            ADnDRules.thac0_array([fighter], [ADnDRules.MAX_LEVEL + 1])
+
+class TestPartyGenerator(unittest.TestCase):
+    def setUp(self):
+        self.generator = PartyGenerator()
+
+    def test_sampled_characters_meet_requirements(self):
+        for character_class in ('Paladin', 'Illusionist', 'Ranger', 'Bard'):
+            for _ in range(50):
+                cls, race, abilities = self.generator.roll_character_stats(character_class)
+                self.assertTrue(ADnDRules.check_class_requirements(abilities, cls, race))
+
+    def test_generate_parties(self):
+        parties = self.generator.generate_parties(5, size=3, unique_names=True)
+        self.assertEqual(len(parties), 5)
+        self.assertTrue(all(len(party) == 3 for party in parties))
+        names = [character.name for party in parties for character in party]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_character_encoding(self):
+        character = self.generator.generate_character(character_class='Magic-User')
+        character.position['x'] = 7
+        character.hit_points -= 1
+        data = character.to_json()
+        self.assertEqual(data['abilities']['STR'], character.ability_scores()['STR'])
+        self.assertEqual(set(data['savingThrows']), set(ADnDRules.SAVE_CATEGORIES))
+        self.assertEqual(data['spellSlots'], {'1': 1})
+
+        saved = json.loads(json.dumps(character.to_save()))
+        self.assertEqual(saved[0], SAVE_VERSION)
+        self.assertEqual(Character.from_save(saved).to_json(), data)
+        self.assertEqual(Character.from_save(data).to_json(), data)
+        with self.assertRaises(ValueError):
+            Character.from_save([SAVE_VERSION + 1])
+
+class TestSpellIndex(unittest.TestCase):
+    def test_search(self):
+        index = spell_index()
+        names = lambda spells: [spell.name for spell in spells]
+        self.assertEqual(names(index.search(prefix='magic mi')), ['Magic Missile'])
+        self.assertIn('Protection from Normal Missiles', names(index.search(prefix='miss')))
+        found = index.search(text='flame damage', spell_class='Magic-User')
+        self.assertIn('Fireball', names(found))
+        self.assertTrue(all(spell.spell_class == 'magic_user' for spell in found))
+        self.assertTrue(all(spell.level == 3 and 'M' in spell.components
+                            for spell in index.search(spell_class='cleric', level=3, components=['m'])))
+        self.assertEqual(index.search(text='zzzz'), [])
+
+    def test_descriptions_load_lazily(self):
+        spells = load_spells('druid_spells.json')['druid_spells'][level_key(2)]
+        indexed = spell_index().spells_of('druid', 2)
+        self.assertEqual(len(indexed), len(spells))
+        self.assertTrue(all(spell.span is not None for spell in indexed))
+        self.assertEqual([spell.description for spell in indexed], [spell['description'] for spell in spells])
+
+    def test_random_spells_of_higher_levels(self):
+        spells = get_random_spells('magic_user_spells.json', 2, 3)
+        self.assertEqual(len(spells), 3)
+        self.assertTrue(all(spell['level'] == 2 and spell['memorized'] for spell in spells))
+
+    def test_search_endpoint(self):
+        client = app.test_client()
+        response = client.get('/api/spells/search?prefix=fireb&descriptions=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['total'], 2)
+        self.assertIn('description', response.json['spells'][0])
+        self.assertEqual(client.get('/api/spells/search?level=high').status_code, 400)
+
+class TestNameGen(unittest.TestCase):
+    def test_every_race_has_names(self):
+        for race in ADnDRules.RACIAL_MODIFIERS:
+            self.assertTrue(name_gen.generate_name(race))
+
+    def test_unique_names(self):
+        used = set()
+        names = name_gen.generate_names('Tabaxi', 500, used_names=used)
+        self.assertEqual(len(set(names)), 500)
+        self.assertEqual(used, set(names))
+
 class TestGameState(unittest.TestCase):
     def setUp(self):
         self.game_state = GameState()
@@ -47,20 +167,548 @@ class TestGameState(unittest.TestCase):
             else:
                 self.assertFalse(self.game_state.add_character(character))
 
+    def test_state_etag(self):
+        client = app.test_client()
+        game_state.combat = None
+        game_state.dungeon = dungeon_generator.dungeon = _open_floor(80, 48)
+        game_state.party = [_hero(2, 5)]
+        response = client.get('/api/game/state')
+        etag = response.headers['ETag']
+        self.assertEqual(response.get_json()['version'], game_state.version)
+        self.assertEqual(client.get('/api/game/state', headers={'If-None-Match': etag}).status_code, 304)
+
+        version = game_state.version
+        result = client.post('/api/game/move', json={'direction': 'east', 'delta': True}).get_json()
+        self.assertEqual(result['baseVersion'], version)
+        self.assertGreater(result['version'], version)
+        response = client.get('/api/game/state', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
 class TestDungeonGenerator(unittest.TestCase):
     def setUp(self):
         self.generator = DungeonGenerator()
 
     def test_dungeon_generation(self):
         dungeon = self.generator.generate()
-        self.assertEqual(len(dungeon), 24)  # Height
+        self.assertEqual(len(dungeon), 48)  # Height
         self.assertEqual(len(dungeon[0]), 80)  # Width
 
     def test_room_generation(self):
         dungeon = self.generator.generate()
         # Check if there are any rooms (floor tiles)
-        has_rooms = any('.' in row for row in dungeon)
+        has_rooms = any(cell['char'] == '.' for row in dungeon for cell in row)
         self.assertTrue(has_rooms)
 
+    def test_layouts(self):
+        generator = DungeonGenerator(60, 40)
+        for layout in ('rooms', 'bsp', 'caves', 'drunkard'):
+            dungeon = generator.generate(layout=layout, seed=11)
+            self.assertIn(layout if layout != 'rooms' else 'corridors', generator.stage_timings)
+            stairs = {cell['char']: (x, y) for y, row in enumerate(dungeon)
+                      for x, cell in enumerate(row) if cell['char'] in '<>'}
+            self.assertTrue(generator.connectivity.connected(stairs['<'], stairs['>']), layout)
+            self.assertEqual(generator.generate(layout=layout, seed=11), dungeon)
+        self.assertEqual(generator.generate(depth=1, seed=1) and generator.layout, 'rooms')
+
+    def test_doors_go_in_room_walls(self):
+        generator = DungeonGenerator(20, 10)
+        generator.generate(1, 1)
+        generator.terrain[:] = 0
+        generator.rooms = [Room(2, 2, 5, 5), Room(12, 2, 5, 5)]
+        for room in generator.rooms:
+            generator._carve_room(room)
+        generator._carve_corridor(generator.rooms[0].center(), generator.rooms[1].center())
+        ys, xs = generator._door_candidates().nonzero()
+        self.assertEqual(sorted(zip(xs.tolist(), ys.tolist())), [(7, 4), (11, 4)])
+
+    def test_floor_index(self):
+        free = np.zeros((5, 10), dtype=bool)
+        free[2, 2:8] = True
+        index = FloorIndex.from_mask(free, [Room(1, 1, 4, 3)])
+        self.assertEqual(len(index), 6)
+        index.remove(3, 2)
+        index.remove(3, 2)
+        self.assertNotIn((3, 2), index)
+        rng = random.Random(1)
+        samples = {index.sample(rng) for _ in range(200)}
+        self.assertEqual(samples, {(2, 2), (4, 2), (5, 2), (6, 2), (7, 2)})
+        self.assertEqual({index.sample_room(0, rng) for _ in range(50)}, {(2, 2)})
+        index.remove(2, 2)
+        self.assertIsNone(index.sample_room(0, rng))
+        self.assertIsNone(index.sample_room(1, rng))
+
+        walls = [[{'char': '#', 'color': '#666666', 'walkable': False, 'visible': True}] * 4] * 3
+        self.generator.generate(seed=2)
+        self.assertTrue(self.generator.rooms)
+        self.generator.set_dungeon(walls)
+        self.assertEqual(self.generator.rooms, [])
+        with self.assertRaises(ValueError):
+            self.generator.get_empty_position()
+
+    def test_connectivity_index(self):
+        dungeon = _open_floor(10, 5)
+        for y in range(5):
+            dungeon[y][5] = {'char': '#', 'color': '#666666', 'walkable': False, 'visible': True}
+        index = ConnectivityIndex(dungeon)
+        self.assertTrue(index.connected((0, 0), (4, 4)))
+        self.assertFalse(index.connected((0, 0), (9, 0)))
+        self.assertEqual(find_path((0, 0), (9, 0), dungeon, 10, 5, index), [])
+
+        dungeon[2][5] = {'char': '+', 'color': '#8B4513', 'walkable': True, 'visible': True}
+        index.update(5, 2)
+        self.assertTrue(index.connected((0, 0), (9, 0)))
+        self.assertEqual(find_path((0, 0), (9, 0), dungeon, 10, 5, index)[-1], (9, 0))
+
+        dungeon[2][5] = {'char': '~', 'color': '#0000ff', 'walkable': False, 'visible': True}
+        index.update(5, 2)
+        self.assertFalse(index.connected((0, 0), (9, 0)))
+
+    def test_hierarchical_path(self):
+        dungeon = _open_floor(60, 30)
+        for y in range(29):
+            dungeon[y][30] = {'char': '#', 'color': '#666666', 'walkable': False, 'visible': True}
+        graph = PathGraph(dungeon)
+        path = find_path_hierarchical((0, 0), (59, 0), dungeon, 60, 30, graph)
+        self.assertEqual((path[0], path[-1]), ((0, 0), (59, 0)))
+        self.assertIn((30, 29), path)
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+            self.assertNotEqual(dungeon[y2][x2]['char'], '#')
+
+        dungeon[0][30] = {'char': '.', 'color': '#ffffff', 'walkable': True, 'visible': True}
+        graph.update(30, 0)
+        path = find_path_hierarchical((0, 0), (59, 0), dungeon, 60, 30, graph)
+        self.assertEqual(len(path), 60)
+
+    def test_hierarchical_path_from_entrance(self):
+        dungeon = [[{'char': '#', 'color': '#666666', 'walkable': False, 'visible': True} for _ in range(40)]
+                   for _ in range(10)]
+        for x in range(40):
+            dungeon[5][x] = {'char': '.', 'color': '#cccccc', 'walkable': True, 'visible': True}
+        graph = PathGraph(dungeon)
+        # (9, 5) and (10, 5) face each other across a cluster border
+        self.assertEqual(len(find_path_hierarchical((9, 5), (39, 5), dungeon, 40, 10, graph)), 31)
+        self.assertEqual(len(find_path_hierarchical((39, 5), (10, 5), dungeon, 40, 10, graph)), 30)
+
+    def test_monsters_are_instances(self):
+        templates = load_templates()
+        goblin = templates['goblin']
+        with self.assertRaises(TypeError):
+            goblin['color'] = '#000000'
+        self.generator.generate()
+        monsters = [cell['monster_data'] for row in self.generator.dungeon for cell in row if cell.get('monster_data')]
+        self.assertTrue(monsters)
+        for monster in monsters:
+            self.assertEqual(set(monster), {'template', 'hp', 'status'})
+            self.assertIn(monster['template'], templates)
+        self.assertEqual(Combatant.from_monster(0, (0, 0), spawn(goblin)).name, 'Goblin')
+
+    def test_encounter_tables(self):
+        alias = AliasTable([1, 0, 3])
+        counts = np.bincount(alias.draw_many(20000, np.random.RandomState(1)), minlength=3)
+        self.assertEqual(counts[1], 0)
+        self.assertAlmostEqual(counts[2] / counts.sum(), 0.75, delta=0.02)
+
+        self.assertIs(encounter_table(3), encounter_table(3))
+        rng = np.random.RandomState(2)
+        mean_dice = [np.mean([hit_dice_count(m['hit_dice']) for m in encounter_table(depth).draw_many(2000, rng)])
+                     for depth in (1, 4, 8)]
+        self.assertEqual(mean_dice, sorted(mean_dice))
+        self.assertEqual({m['type'] for m in encounter_table(5, ['Undead']).draw_many(100, rng)}, {'Undead'})
+
+    def test_treasure_engine(self):
+        engine = treasure_engine()
+        self.assertEqual(engine.roll('H', np.random.RandomState(4)), engine.roll('H', np.random.RandomState(4)))
+        rolls = engine.roll_many('H', 2000, np.random.RandomState(5))
+        self.assertEqual(len(rolls['value']), 2000)
+        self.assertTrue((rolls['value'] >= rolls['gp']).all())
+        self.assertGreater(rolls['value'].mean(), engine.roll_many('C', 2000, np.random.RandomState(5))['value'].mean())
+        self.assertEqual(engine.roll('unknown')['coins'], {})
+
+        self.generator.generate()
+        hoards = [cell['treasure'] for row in self.generator.dungeon for cell in row if cell['char'] == '$']
+        self.assertTrue(hoards)
+        self.assertTrue(all('coins' in hoard for hoard in hoards))
+
+    def test_party_can_reach_stairs(self):
+        party = [_hero(0, 0, str(i)) for i in range(4)]
+        for _ in range(5):
+            dungeon = self.generator.generate()
+            self.assertTrue(self.generator.place_party(party))
+            leader = (party[0].position['x'], party[0].position['y'])
+            stairs = next((x, y) for y, row in enumerate(dungeon) for x, cell in enumerate(row) if cell['char'] == '>')
+            self.assertTrue(self.generator.connectivity.connected(leader, stairs))
+            self.assertEqual(len({(c.position['x'], c.position['y']) for c in party}), 4)
+
+class TestCombat(unittest.TestCase):
+    def test_turn_scheduler_order(self):
+        scheduler = TurnScheduler()
+        scheduler.schedule(1, 5)
+        scheduler.schedule(2, 3)
+        scheduler.schedule(3, 4)
+        scheduler.schedule(2, 6)  # Rescheduling replaces the old entry
+        scheduler.remove(3)
+        self.assertEqual(scheduler.pop(), (5, 1))
+        self.assertEqual(scheduler.pop(), (6, 2))
+        self.assertIsNone(scheduler.pop())
+
+    def test_combat_runs_to_completion(self):
+        combat = Combat()
+        combat.add_combatant(Combatant(0, 'Hero', 'party', 50, 50, 2, 10, '1d8', ref=0))
+        for i in range(1, 25):
+            combat.add_combatant(Combatant(i, f'Goblin {i}', 'monster', 1, 1, 10, 20, '1d2', ref=(i, 0)))
+        combat.roll_initiative()
+        for _ in range(500):
+            combat.run_monsters()
+            if combat.is_over():
+                break
+            combat.attack()
+        self.assertTrue(combat.is_over())
+        restored = Combat.from_dict(combat.to_dict())
+        self.assertEqual(restored.to_dict(), combat.to_dict())
+
+    def test_weapon_speed(self):
+        combat = Combat()
+        combat.add_combatant(Combatant(0, 'Hero', 'party', 50, 50, 2, 10, '1d4', ref=0, speed=2))
+        combat.add_combatant(Combatant(1, 'Ogre', 'monster', 500, 500, 5, 20, '1d2', ref=(1, 0), speed=9))
+        combat.scheduler.schedule(0, 0)
+        combat.scheduler.schedule(1, 0)
+        combat.advance()
+        combat.attack()
+        combat.attack()
+        # The dagger comes around after 7 segments, the ogre's club after 14
+        self.assertEqual((combat.current, combat.time), (0, 7))
+        self.assertEqual(combat.scheduler.items(), [[14, 1]])
+        restored = Combat.from_dict(combat.to_dict())
+        self.assertEqual(restored.combatants[0].speed, 2)
+
+    def test_invalid_combat_action_changes_nothing(self):
+        session = GameSession(seed=1)
+        combat = session.game_state.combat = Combat()
+        combat.add_combatant(Combatant(0, 'Hero', 'party', 50, 50, 2, 10, '1d4', ref=0))
+        combat.add_combatant(Combatant(1, 'Goblin', 'monster', 5, 5, 6, 20, '1d6', ref=(1, 0)))
+        combat.scheduler.schedule(1, 0)
+        combat.scheduler.schedule(0, 1)
+        combat.advance()
+        before = combat.to_dict()
+        for action, segments in (('cast spell', 5), ('delay', 'x'), ('delay', 0), ('delay', 1000)):
+            with self.assertRaises(ValueError):
+                session.combat_action(action, segments=segments)
+            self.assertEqual(combat.to_dict(), before)
+
+    def test_combat_endpoint(self):
+        client = app.test_client()
+        game_state.combat = None
+        game_state.dungeon = [[{'char': '.', 'color': '#cccccc', 'walkable': True, 'visible': True}
+                               for _ in range(80)] for _ in range(48)]
+        game_state.dungeon[5][6] = {'char': 'g', 'color': '#4CAF50', 'walkable': False, 'visible': True,
+                                    'monster_data': {'name': 'Goblin', 'hit_dice': '1d8', 'armor_class': 6,
+                                                     'attacks': [{'name': 'Claw', 'damage': '1d2'}],
+                                                     'morale': 7, 'xp': 15}}
+        hero = _hero(5, 5, abilities={'STR': 18}, hit_points=500)
+        hero.thac0 = 1
+        game_state.party = [hero]
+        self.assertEqual(client.post('/api/game/combat', json={'action': 'attack'}).status_code, 400)
+        result = client.post('/api/game/combat', json={'action': 'start'}).get_json()
+        response = client.post('/api/game/combat', json={'action': 'delay', 'segments': 'x'})
+        self.assertEqual(response.status_code, 400)
+        for _ in range(50):
+            if result['combatEnded']:
+                break
+            result = client.post('/api/game/combat', json={'action': 'Attack'}).get_json()
+        self.assertTrue(result['combatEnded'])
+        self.assertIsNone(game_state.combat)
+        self.assertNotIn('monster_data', game_state.dungeon[5][6])
+
+def _open_floor(width, height):
+    return [[{'char': '.', 'color': '#cccccc', 'walkable': True, 'visible': True}
+             for _ in range(width)] for _ in range(height)]
+
+def _hero(x, y, name='Hero', abilities=None, hit_points=10):
+    hero = Character(name, 'Human', 'Fighter', abilities or {}, hit_points)
+    hero.position = {'x': x, 'y': y}
+    return hero
+
+class TestMonsterAI(unittest.TestCase):
+    def setUp(self):
+        self.dungeon = _open_floor(20, 1)
+        self.dungeon[0][10] = {'char': 'g', 'color': '#4CAF50', 'walkable': False, 'visible': True,
+                               'monster_data': {'name': 'Goblin', 'morale': 7}}
+        self.ai = MonsterAI()
+
+    def test_distance_map(self):
+        dungeon = _open_floor(20, 5)
+        dungeon[0][1]['char'] = '#'
+        distances = distance_map(passable_mask(dungeon), [(0, 0)], max_distance=5)
+        self.assertEqual(distances[0, 0], 0)
+        self.assertEqual(distances[1, 1], 2)
+        self.assertEqual(distances[0, 1], UNREACHED)
+        self.assertEqual(distances[0, 10], UNREACHED)
+
+    def test_chase_and_flee(self):
+        # Too far away to wake the monster
+        self.assertEqual(self.ai.tick(self.dungeon, [(0, 0)]), [])
+        self.ai.behavior[:] = CHASE
+        moves = self.ai.tick(self.dungeon, [(0, 0)])
+        self.assertEqual(moves[0]['to'], (9, 0))
+        self.assertIn('monster_data', self.dungeon[0][9])
+        self.assertNotIn('monster_data', self.dungeon[0][10])
+
+        self.ai.behavior[:] = FLEE
+        moves = self.ai.tick(self.dungeon, [(0, 0)])
+        self.assertEqual(moves[0]['to'], (10, 0))
+
+class TestLevelStore(unittest.TestCase):
+    def test_pack_round_trip(self):
+        dungeon = DungeonGenerator(40, 30).generate(4, 6)
+        dungeon[3][4]['visible'] = True
+        self.assertEqual(unpack_level(pack_level(dungeon)), dungeon)
+
+    def test_compaction_and_budget(self):
+        store = LevelStore(live_levels=1, memory_budget=10 ** 6)
+        levels = {depth: _open_floor(20, 10) for depth in (1, 2, 3)}
+        for depth, dungeon in levels.items():
+            store.store(depth, dungeon)
+        self.assertEqual(list(store.live), [3])
+        self.assertEqual(list(store.packed), [1, 2])
+        self.assertIs(store.fetch(3), levels[3])
+        self.assertEqual(store.fetch(1), levels[1])
+        self.assertNotIn(1, store)
+
+        store.memory_budget = 0
+        store.store(4, _open_floor(20, 10))
+        self.assertNotIn(2, store)
+
+    def test_stairs_restore_level(self):
+        session = GameSession(40, 30, seed=5)
+        session.new_game()
+        first = session.game_state.dungeon
+        down = session._find_tile('>')
+        session.game_state.party = [_hero(0, 0), _hero(1, 1, 'Sidekick')]
+        with self.assertRaises(ValueError):
+            session.use_stairs()
+        session.game_state.party[0].position = {'x': down[0], 'y': down[1]}
+
+        result = session.use_stairs()
+        self.assertEqual((result['level'], result['restored']), (2, False))
+        leader, follower = session.party_positions()
+        self.assertEqual(session.game_state.dungeon[leader[1]][leader[0]]['char'], '<')
+        self.assertNotEqual(leader, follower)
+
+        result = session.use_stairs()
+        self.assertEqual((result['level'], result['restored']), (1, True))
+        self.assertIs(session.game_state.dungeon, first)
+        self.assertEqual(session.party_positions()[0], down)
+
+class TestHeadlessSession(unittest.TestCase):
+    def test_session_without_flask(self):
+        session = GameSession(seed=3)
+        session.new_game()
+        with self.assertRaises(ValueError):
+            session.move('north')
+        self.assertEqual(session.game_state.dungeon, session.dungeon_generator.dungeon)
+
+    def test_seed_is_private_to_the_session(self):
+        state, np_state = random.getstate(), np.random.get_state()
+        dungeons = []
+        for _ in range(2):
+            session = GameSession(30, 20, seed=5)
+            session.new_game()
+            dungeons.append(session.game_state.dungeon)
+        self.assertEqual(dungeons[0], dungeons[1])
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual(np.random.get_state()[1].tolist(), np_state[1].tolist())
+
+    def test_move_reports_changed_tiles(self):
+        session = GameSession(20, 10, seed=1)
+        dungeon = _open_floor(20, 10)
+        for row in dungeon:
+            for cell in row:
+                cell['visible'] = False
+        session.game_state.dungeon = session.dungeon_generator.dungeon = dungeon
+        session.game_state.party = [_hero(2, 5)]
+        self.assertTrue(session.move('east')['success'])
+        changes = session.take_tile_changes()
+        self.assertIn((3, 5), [(tile['x'], tile['y']) for tile in changes])
+        self.assertTrue(all(tile['visible'] for tile in changes))
+        self.assertEqual(session.take_tile_changes(), [])
+
+    def test_move_batch(self):
+        session = GameSession(20, 10, seed=1)
+        dungeon = _open_floor(20, 10)
+        dungeon[5][5] = {'char': '#', 'color': '#666666', 'walkable': False, 'visible': True}
+        session.game_state.dungeon = session.dungeon_generator.dungeon = dungeon
+        session.game_state.party = [_hero(2, 5)]
+        result = session.move_batch(['east', 'east', 'east', 'north'])
+        self.assertTrue(result['success'])
+        self.assertEqual([step['success'] for step in result['steps']], [True, True, False])
+        dungeon[4][4] = {'char': '~', 'color': '#0000ff', 'walkable': False, 'visible': True}
+        self.assertFalse(session.move('north')['success'])
+        self.assertEqual(session.game_state.party[0].position, {'x': 4, 'y': 5})
+        with self.assertRaises(ValueError):
+            session.move_batch(['up'])
+        version = session.game_state.version
+        with self.assertRaises(ValueError):
+            session.move('up')
+        self.assertEqual(session.game_state.version, version)
+
+    def test_no_moving_during_combat(self):
+        session = GameSession(20, 10, seed=1)
+        dungeon = _open_floor(20, 10)
+        dungeon[5][3] = {'char': 'g', 'color': '#4CAF50', 'walkable': False, 'visible': True,
+                         'monster_data': {'name': 'Goblin', 'hit_dice': '1d8', 'armor_class': 6,
+                                          'attacks': [{'name': 'Claw', 'damage': '1d2'}], 'morale': 7}}
+        session.game_state.dungeon = session.dungeon_generator.dungeon = dungeon
+        hero = _hero(2, 5)
+        session.game_state.party = [hero]
+        session.start_combat()
+        version = session.game_state.version
+        with self.assertRaises(ValueError):
+            session.move('west')
+        with self.assertRaises(ValueError):
+            session.move_batch(['west'])
+        self.assertEqual(hero.position, {'x': 2, 'y': 5})
+        self.assertIn('monster_data', dungeon[5][3])
+        self.assertEqual(session.game_state.version, version)
+
+    def test_treasure_pickup(self):
+        session = GameSession(20, 10, seed=1)
+        dungeon = _open_floor(20, 10)
+        hoard = {'coins': {'cp': 10, 'ep': 3, 'pp': 2}, 'gems': {'count': 2, 'value': 60},
+                 'jewelry': {'count': 0, 'value': 0}, 'items': ['Dagger']}
+        dungeon[5][3] = {'char': '$', 'color': '#ffd700', 'walkable': True, 'visible': True, 'treasure': hoard}
+        session.game_state.dungeon = session.dungeon_generator.dungeon = dungeon
+        hero = _hero(2, 5)
+        session.game_state.party = [hero]
+        result = session.move('east')
+        self.assertEqual(result['treasure'], hoard)
+        self.assertIn(describe(hoard), result['message'])
+        self.assertEqual((hero.copper, hero.silver, hero.gold), (10, 10, 11))
+        self.assertEqual([item['name'] for item in hero.inventory], ['Gems', 'Dagger'])
+        self.assertEqual(dungeon[5][3]['char'], '.')
+
+    def test_travel_and_explore(self):
+        session = GameSession(40, 10, seed=1)
+        dungeon = _open_floor(40, 10)
+        for row in dungeon:
+            for cell in row:
+                cell['visible'] = False
+        dungeon[5][30] = {'char': '^', 'color': '#ff0000', 'walkable': True, 'visible': False}
+        session.game_state.dungeon = session.dungeon_generator.dungeon = dungeon
+        session.game_state.party = [_hero(2, 5)]
+        leader = session.game_state.party[0].position
+
+        result = session.travel(20, 5)
+        self.assertEqual((result['steps'], result['stopped']), (18, 'arrived'))
+        self.assertEqual((leader['x'], leader['y']), (20, 5))
+        result = session.travel(35, 5)
+        self.assertEqual((result['stopped'], leader['x']), ('interrupted', 30))
+
+        result = session.explore()
+        self.assertEqual(result['stopped'], 'explored')
+        self.assertTrue(all(cell['visible'] for row in dungeon for cell in row))
+        self.assertEqual(session.explore()['steps'], 0)
+
+    def test_map_view(self):
+        session = GameSession(20, 10, seed=1)
+        dungeon = _open_floor(20, 10)
+        dungeon[5][0]['visible'] = False
+        session.game_state.dungeon = session.dungeon_generator.dungeon = dungeon
+        session.game_state.party = [_hero(2, 5)]
+        view = session.view()
+        self.assertEqual(view['rows'][5], ' .@' + '.' * 17)
+        self.assertEqual(view['colors'][5], [['#000000', 1], ['#cccccc', 1], ['#ff0000', 1], ['#cccccc', 17]])
+
+        session.move('east')
+        self.assertEqual(session.view()['rows'][5][0], '.')
+        view = session.view(x=1, y=4, width=4, height=2)
+        self.assertEqual((view['width'], view['height']), (4, 2))
+        self.assertEqual(view['rows'], ['....', '..@.'])
+        self.assertEqual(view['colors'][1], [['#cccccc', 2], ['#ff0000', 1], ['#cccccc', 1]])
+
+    def test_bot_runner(self):
+        totals = run_bots(3, steps=20)
+        self.assertEqual(totals['sessions'], 3)
+        self.assertIn('steps_per_second', totals)
+        self.assertEqual(play_session(7, steps=15), play_session(7, steps=15))
+
+class TestBenchmark(unittest.TestCase):
+    def test_measure(self):
+        result = measure(lambda: sum(range(100)), 10)
+        self.assertEqual(result['iterations'], 10)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+    def test_compare_to_baseline(self):
+        baseline = {'fast': {'p50_ms': 1.0}, 'slow': {'p50_ms': 1.0}}
+        results = {'fast': {'p50_ms': 1.1}, 'slow': {'p50_ms': 2.0}, 'new': {'p50_ms': 5.0}}
+        regressions = compare_to_baseline(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('slow'))
+
+class TestMetrics(unittest.TestCase):
+    def tearDown(self):
+        metrics.set_enabled(True)
+
+    def test_metrics_endpoint(self):
+        client = app.test_client()
+        client.post('/api/rules/ability-modifier', json={'score': 12})
+        DungeonGenerator(40, 30).generate(4, 6)
+        text = client.get('/api/debug/metrics').get_data(as_text=True)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn('endpoint="get_ability_modifier"', text)
+        self.assertIn('dungeon_generation_phase_seconds_count{phase="rooms"}', text)
+
+    def test_disabled_metrics_record_nothing(self):
+        metrics.reset()
+        metrics.set_enabled(False)
+        with metrics.timer('disabled_seconds'):
+            pass
+        metrics.inc('disabled_total')
+        metrics.set_enabled(True)
+        self.assertNotIn('disabled', metrics.render_prometheus())
+
+class TestRulesAPI(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_rules_batch(self):
+        response = self.client.post('/api/rules/batch', json={'queries': [
+            {'type': 'ability-modifier', 'score': 16},
+            {'type': 'xp-for-level', 'characterClass': 'Fighter', 'level': 2},
+            {'type': 'saving-throws', 'characterClass': 'Thief', 'level': 1},
+            {'type': 'xp-for-level'},
+            {'type': 'bogus'}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual(results[0], {'modifier': 3})
+        self.assertEqual(results[1], {'xp': 4000})
+        self.assertEqual(results[2]['Paralysis'], 12)
+        self.assertIn('error', results[3])
+        self.assertIn('error', results[4])
+
+    def test_rules_batch_rejects_bad_values(self):
+        response = self.client.post('/api/rules/batch', json={'queries': [
+            {'type': 'xp-for-level', 'characterClass': 'Fighter', 'level': 1e308},
+            {'type': 'xp-for-level', 'characterClass': 'Fighter', 'level': 3000000},
+            {'type': 'xp-for-level', 'characterClass': 'Fighter', 'level': 2.5},
+            {'type': 'saving-throws', 'characterClass': 'Baker', 'level': 1},
+            {'type': 'thac0', 'characterClass': 'Fighter', 'level': True},
+            {'type': 'ability-modifier', 'score': 'high'},
+            {'type': 'thac0', 'characterClass': 'Fighter', 'level': ADnDRules.MAX_LEVEL}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        for result in results[:-1]:
+            self.assertIn('error', result)
+        self.assertIn('thac0', results[-1])
+        response = self.client.post('/api/rules/xp-for-level', json={'characterClass': 'Fighter', 'level': 2.5})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rules_batch_requires_list(self):
+        response = self.client.post('/api/rules/batch', json={'queries': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file